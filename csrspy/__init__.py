@@ -2,9 +2,53 @@
 
 It provides a unified interface for creating coordinate reference systems (CRS)
 and transformations.
+
+The transformer classes are imported on first access, so that `import csrspy` does
+not load pyproj until a transformer is constructed.
 """
 
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
 from csrspy import enums
-from csrspy.main import CSRSTransformer
 
-__all__ = ["CSRSTransformer", "enums"]
+if TYPE_CHECKING:
+    from csrspy.main import (
+        CSRSTransformer,
+        clear_transformer_cache,
+        get_transformer,
+        transformer_cache_info,
+    )
+
+# The module that defines each lazily imported attribute
+_LAZY_ATTRIBUTES = {
+    "CSRSTransformer": "csrspy.main",
+    "clear_transformer_cache": "csrspy.main",
+    "get_transformer": "csrspy.main",
+    "transformer_cache_info": "csrspy.main",
+}
+
+__all__ = [
+    "CSRSTransformer",
+    "clear_transformer_cache",
+    "enums",
+    "get_transformer",
+    "transformer_cache_info",
+]
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    """Import the transformer classes and functions on first access."""
+    if name not in _LAZY_ATTRIBUTES:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    value = getattr(import_module(_LAZY_ATTRIBUTES[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """List the module attributes, including those that are not yet imported."""
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,7 @@
+"""Run the csrspy command line interface with `python -m csrspy`."""
+
+import sys
+
+from csrspy.cli import main
+
+sys.exit(main())
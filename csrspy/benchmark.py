@@ -0,0 +1,466 @@
+"""Benchmarks of CSRSTransformer construction, latency and throughput.
+
+The benchmarks cover each routing branch of `CSRSTransformer` (ITRF to NAD83(CSRS),
+NAD83(CSRS) to ITRF, ITRF to ITRF and NAD83(CSRS) to NAD83(CSRS)) with each vertical
+datum, and write their results as JSON so that runs can be compared to find
+regressions. The time to import csrspy in a fresh interpreter is also measured and
+checked against a fixed budget.
+
+Usage:
+    python -m csrspy.benchmark -o results.json
+    python -m csrspy.benchmark --sizes 1 1000 --baseline results.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from importlib import metadata
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
+
+import numpy as np
+import pyproj
+
+from csrspy.enums import CoordType, GridEngine, Reference, VerticalDatum
+from csrspy.factories import transformer_from_pipeline
+from csrspy.main import CSRSTransformer
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+DEFAULT_SIZES = (1, 1_000, 100_000, 10_000_000)
+
+# The number of calls timed together when measuring single point latency
+POINT_CALLS = 100
+
+# The budget in seconds for `import csrspy` in a fresh interpreter
+IMPORT_BUDGET = 0.05
+
+# Modules that `import csrspy` should not load, because they are slow to import
+LAZY_MODULES = ("numpy", "pyproj")
+
+_IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps([seconds, [m for m in {lazy!r} if m in sys.modules]]))
+"""
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    """A transformer configuration to benchmark.
+
+    Attributes:
+        name (str): A unique name for the case.
+        branch (str): The routing branch of `CSRSTransformer` the case covers.
+        config (dict): The `CSRSTransformer` constructor arguments.
+
+    """
+
+    name: str
+    branch: str
+    config: dict[str, Any]
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    """The timings of one benchmark.
+
+    Attributes:
+        case (str): The name of the benchmarked case.
+        benchmark (str): One of "import", "construct", "point" or "throughput".
+        n_points (int): The number of points transformed per call.
+        repeats (int): The number of timed calls.
+        best (float): The fastest call in seconds.
+        median (float): The median call in seconds.
+        points_per_second (float): The number of points transformed per second in
+            the fastest call, or 0 for imports and construction.
+
+    """
+
+    case: str
+    benchmark: str
+    n_points: int
+    repeats: int
+    best: float
+    median: float
+    points_per_second: float
+
+
+def _case(
+    branch: str,
+    s_ref_frame: Reference,
+    s_vd: VerticalDatum,
+    t_ref_frame: Reference,
+    t_vd: VerticalDatum,
+) -> BenchmarkCase:
+    vd = s_vd if s_vd is not VerticalDatum.GRS80 else t_vd
+    return BenchmarkCase(
+        name=f"{branch}-{vd.value}",
+        branch=branch,
+        config={
+            "s_ref_frame": s_ref_frame,
+            "s_coords": CoordType.GEOG,
+            "s_epoch": 2023.5,
+            "s_vd": s_vd,
+            "t_ref_frame": t_ref_frame,
+            "t_coords": CoordType.GEOG,
+            "t_epoch": 2010.0,
+            "t_vd": t_vd,
+        },
+    )
+
+
+def default_cases() -> list[BenchmarkCase]:
+    """Get the cases covering each routing branch with each vertical datum.
+
+    Vertical datums that are invalid for a branch are skipped. WGS84 heights are
+    covered by using the WGS84 reference frame on the ITRF side of the branch.
+
+    Returns:
+        list[BenchmarkCase]: The benchmark cases.
+
+    """
+    itrf, nad83, wgs84 = Reference.ITRF14, Reference.NAD83CSRS, Reference.WGS84
+    grs80 = VerticalDatum.GRS80
+    cases = []
+    for vd in VerticalDatum:
+        if vd is VerticalDatum.WGS84:
+            cases += [
+                _case("itrf_to_nad83", wgs84, vd, nad83, grs80),
+                _case("nad83_to_itrf", nad83, grs80, wgs84, vd),
+                _case("itrf_to_itrf", itrf, grs80, wgs84, vd),
+            ]
+            continue
+        cases += [
+            _case("itrf_to_nad83", itrf, grs80, nad83, vd),
+            _case("nad83_to_itrf", nad83, vd, itrf, grs80),
+            _case("nad83_to_nad83", nad83, grs80, nad83, vd),
+        ]
+        if vd is grs80:
+            cases.append(_case("itrf_to_itrf", itrf, grs80, Reference.ITRF08, grs80))
+    return cases
+
+
+def _timings(func: Callable[[], object], repeats: int, number: int = 1) -> list[float]:
+    """Time repeated calls of a function, in seconds per call."""
+    func()
+    timer = timeit.Timer(func)
+    return [t / number for t in timer.repeat(repeat=repeats, number=number)]
+
+
+def _result(
+    case: BenchmarkCase, benchmark: str, n_points: int, timings: list[float]
+) -> BenchmarkResult:
+    best = min(timings)
+    return BenchmarkResult(
+        case=case.name,
+        benchmark=benchmark,
+        n_points=n_points,
+        repeats=len(timings),
+        best=best,
+        median=statistics.median(timings),
+        points_per_second=n_points / best if n_points and best > 0 else 0.0,
+    )
+
+
+def _points(n: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Generate random geographic coordinates covered by the Canadian grids."""
+    rng = np.random.default_rng(seed)
+    return (
+        rng.uniform(-130, -60, n),
+        rng.uniform(42, 70, n),
+        rng.uniform(0, 500, n),
+    )
+
+
+def run_benchmarks(
+    cases: Iterable[BenchmarkCase] | None = None,
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    repeats: int = 5,
+    grid_engine: GridEngine | str = GridEngine.PROJ,
+) -> list[BenchmarkResult]:
+    """Benchmark construction, single point latency and array throughput.
+
+    Construction is timed with the process-wide cache of PROJ transformers cleared,
+    so each timing includes the initialization of the PROJ pipelines.
+
+    Args:
+        cases: The cases to benchmark. Defaults to `default_cases()`.
+        sizes: The numbers of points to transform with
+            `CSRSTransformer.transform_arrays`.
+        repeats: The number of times each benchmark is timed.
+        grid_engine: The grid engine used by the transformers.
+
+    Returns:
+        list[BenchmarkResult]: The results, in the order they were run.
+
+    """
+    results = []
+    for case in default_cases() if cases is None else cases:
+        config = {**case.config, "grid_engine": grid_engine}
+
+        def construct(config: dict[str, Any] = config) -> CSRSTransformer:
+            transformer_from_pipeline.cache_clear()
+            return CSRSTransformer(**config)
+
+        results.append(_result(case, "construct", 0, _timings(construct, repeats)))
+
+        transformer = CSRSTransformer(**config)
+        point = [tuple(c[0] for c in _points(1))]
+        timings = _timings(
+            lambda t=transformer, p=point: list(t(p)), repeats, POINT_CALLS
+        )
+        results.append(_result(case, "point", 1, timings))
+
+        for n in sizes:
+            x, y, z = _points(n)
+            timings = _timings(
+                lambda t=transformer, x=x, y=y, z=z: t.transform_arrays(x, y, z),
+                repeats,
+            )
+            results.append(_result(case, "throughput", n, timings))
+    return results
+
+
+def import_time(
+    module: str = "csrspy", repeats: int = 5
+) -> tuple[list[float], list[str]]:
+    """Time the import of a module, each time in a fresh interpreter.
+
+    Args:
+        module: The module to import.
+        repeats: The number of times the import is timed.
+
+    Returns:
+        tuple: The import time of each run in seconds, and the modules of
+            `LAZY_MODULES` that the import loaded.
+
+    """
+    script = _IMPORT_SCRIPT.format(module=module, lazy=LAZY_MODULES)
+    timings, loaded = [], set()
+    for _ in range(repeats):
+        output = subprocess.run(  # noqa: S603
+            [sys.executable, "-c", script], capture_output=True, check=True, text=True
+        ).stdout
+        seconds, modules = json.loads(output)
+        timings.append(seconds)
+        loaded.update(modules)
+    return timings, sorted(loaded)
+
+
+def check_import_budget(
+    module: str = "csrspy", repeats: int = 5, budget: float = IMPORT_BUDGET
+) -> tuple[BenchmarkResult, list[str]]:
+    """Benchmark the import of a module and check it against a budget.
+
+    Args:
+        module: The module to import.
+        repeats: The number of times the import is timed.
+        budget: The largest acceptable import time in seconds, of the fastest run.
+
+    Returns:
+        tuple: The benchmark result, and a description of each violation of the
+            budget or of the lazy loading of `LAZY_MODULES`.
+
+    """
+    timings, loaded = import_time(module, repeats)
+    case = BenchmarkCase(name=f"import-{module}", branch="import", config={})
+    result = _result(case, "import", 0, timings)
+    violations = [f"import {module} loaded {name}" for name in loaded]
+    if result.best > budget:
+        violations.append(
+            f"import {module}: {result.best:.6g} s, budget {budget:.6g} s"
+        )
+    return result, violations
+
+
+def _version(package: str) -> str:
+    try:
+        return metadata.version(package)
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def environment() -> dict[str, str]:
+    """Describe the environment that benchmarks are run in.
+
+    Returns:
+        dict[str, str]: The versions of csrspy and its dependencies, and the
+            platform.
+
+    """
+    return {
+        "csrspy": _version("csrspy"),
+        "pyproj": pyproj.__version__,
+        "proj": pyproj.proj_version_str,
+        "numpy": np.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def to_json(results: Iterable[BenchmarkResult], **extra: Any) -> dict[str, Any]:  # noqa: ANN401
+    """Convert benchmark results to a JSON serializable document.
+
+    Args:
+        results: The benchmark results.
+        **extra: Additional metadata, such as the grid engine.
+
+    Returns:
+        dict: A document with the environment and results.
+
+    """
+    return {
+        "metadata": {**environment(), **extra},
+        "results": [asdict(r) for r in results],
+    }
+
+
+def compare(
+    baseline: dict[str, Any], current: dict[str, Any], threshold: float = 0.25
+) -> list[str]:
+    """Find benchmarks that are slower than in a baseline run.
+
+    Args:
+        baseline: A document written by a previous run, as returned by `to_json`.
+        current: A document of the current run.
+        threshold: The relative slowdown of the best timing that is reported.
+
+    Returns:
+        list[str]: A description of each regression. Benchmarks missing from the
+            baseline are ignored.
+
+    """
+    before = {
+        (r["case"], r["benchmark"], r["n_points"]): r["best"]
+        for r in baseline["results"]
+    }
+    regressions = []
+    for r in current["results"]:
+        key = (r["case"], r["benchmark"], r["n_points"])
+        if key in before and r["best"] > before[key] * (1 + threshold):
+            regressions.append(
+                f"{r['case']} {r['benchmark']} n={r['n_points']}: "
+                f"{r['best']:.6g} s, baseline {before[key]:.6g} s "
+                f"({r['best'] / before[key] - 1:+.0%})"
+            )
+    return regressions
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the benchmark command.
+
+    Returns:
+        argparse.ArgumentParser: The argument parser.
+
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m csrspy.benchmark",
+        description="Benchmark csrspy transformations and write the results as JSON.",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="-",
+        help="Output JSON file. Defaults to stdout.",
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_SIZES),
+        metavar="N",
+        help="Numbers of points to transform. Defaults to 1 1000 100000 10000000.",
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=5,
+        help="Number of times each benchmark is timed. Defaults to 5.",
+    )
+    parser.add_argument(
+        "--cases",
+        nargs="+",
+        metavar="NAME",
+        help="Names or branches of the cases to run, or import to benchmark the "
+        "import of csrspy. Defaults to all cases.",
+    )
+    parser.add_argument("--grid-engine", type=GridEngine, default=GridEngine.PROJ)
+    parser.add_argument(
+        "--baseline",
+        help="JSON results of a previous run. Exits with status 1 if any benchmark "
+        "is slower than in the baseline by more than the threshold.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Relative slowdown reported as a regression. Defaults to 0.25.",
+    )
+    parser.add_argument(
+        "--import-budget",
+        type=float,
+        default=IMPORT_BUDGET,
+        help="Import time of csrspy in seconds above which the command exits with "
+        f"status 1. Defaults to {IMPORT_BUDGET}.",
+    )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the benchmarks from the command line.
+
+    Args:
+        argv: The command line arguments. Defaults to `sys.argv[1:]`.
+
+    Returns:
+        int: The exit status.
+
+    """
+    args = build_parser().parse_args(argv)
+    cases = default_cases()
+    if args.cases is not None:
+        cases = [c for c in cases if c.name in args.cases or c.branch in args.cases]
+
+    results, failures = [], []
+    if args.cases is None or "import" in args.cases:
+        result, failures = check_import_budget(
+            repeats=args.repeats, budget=args.import_budget
+        )
+        results.append(result)
+    results += run_benchmarks(
+        cases, sizes=args.sizes, repeats=args.repeats, grid_engine=args.grid_engine
+    )
+    document = to_json(results, grid_engine=args.grid_engine.value)
+    text = json.dumps(document, indent=2) + "\n"
+    if args.output == "-":
+        sys.stdout.write(text)
+    else:
+        Path(args.output).write_text(text)
+
+    for failure in failures:
+        sys.stderr.write(f"Import budget exceeded: {failure}\n")
+    if args.baseline is not None:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare(baseline, document, args.threshold)
+        for regression in regressions:
+            sys.stderr.write(f"Regression: {regression}\n")
+        failures += regressions
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
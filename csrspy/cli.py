@@ -0,0 +1,332 @@
+"""Command line interface for transforming delimited text files of coordinates.
+
+Coordinates are read from CSV, TSV or whitespace delimited files (optionally gzip or
+zstd compressed) or stdin in large chunks, transformed one chunk at a time with a
+single vectorized call, and written out while the next chunk is being read. Columns
+other than the coordinates are copied to the output unchanged.
+
+Usage:
+    csrspy --s-ref-frame itrf14 --t-ref-frame nad83csrs --s-coords geog \
+        --t-coords utm10 --s-epoch 2023.58 --t-epoch 2002 in.csv -o out.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import io
+import sys
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack
+from itertools import islice
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO
+
+import numpy as np
+
+from csrspy.enums import CoordType, GridEngine, Reference, VerticalDatum
+from csrspy.main import CSRSTransformer
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+    from types import ModuleType
+
+    from numpy.typing import NDArray
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def _zstd() -> ModuleType:
+    """Import a zstd implementation, preferring the standard library."""
+    try:
+        from compression import zstd  # noqa: PLC0415
+    except ImportError:
+        try:
+            import zstandard as zstd  # noqa: PLC0415
+        except ImportError:
+            msg = "Reading or writing zstd files requires the zstandard package."
+            raise ImportError(msg) from None
+    return zstd
+
+
+def _open_input(path: str, stack: ExitStack) -> BinaryIO:
+    """Open an input file or stdin, decompressing it if needed."""
+    if path == "-":
+        stream = sys.stdin.buffer
+    else:
+        stream = stack.enter_context(Path(path).open("rb"))  # noqa: SIM115
+    if not isinstance(stream, io.BufferedReader):
+        stream = io.BufferedReader(stream)
+
+    magic = stream.peek(4)[:4]
+    if magic.startswith(GZIP_MAGIC):
+        return stack.enter_context(gzip.GzipFile(fileobj=stream, mode="rb"))
+    if magic == ZSTD_MAGIC:
+        zstd = _zstd()
+        if hasattr(zstd, "ZstdDecompressor"):
+            reader = zstd.ZstdDecompressor().stream_reader(stream)
+            return stack.enter_context(io.BufferedReader(reader))
+        return stack.enter_context(zstd.ZstdFile(stream, mode="rb"))
+    return stream
+
+
+def _open_output(path: str, stack: ExitStack) -> BinaryIO:
+    """Open an output file or stdout, compressing it based on its suffix."""
+    if path == "-":
+        return sys.stdout.buffer
+    stream = stack.enter_context(Path(path).open("wb"))  # noqa: SIM115
+    if path.endswith(".gz"):
+        return stack.enter_context(gzip.GzipFile(fileobj=stream, mode="wb"))
+    if path.endswith(".zst"):
+        zstd = _zstd()
+        if hasattr(zstd, "ZstdCompressor"):
+            writer = zstd.ZstdCompressor().stream_writer(stream, closefd=False)
+            return stack.enter_context(writer)
+        return stack.enter_context(zstd.ZstdFile(stream, mode="wb"))
+    return stream
+
+
+def _infer_delimiter(path: str) -> str | None:
+    """Infer the column delimiter from a file name, ignoring compression suffixes."""
+    suffixes = [s for s in Path(path).suffixes if s not in {".gz", ".zst"}]
+    suffix = suffixes[-1].lower() if suffixes else ""
+    if suffix == ".csv":
+        return ","
+    if suffix == ".tsv":
+        return "\t"
+    return None
+
+
+def _positive_int(value: str) -> int:
+    """Parse a positive integer command line argument."""
+    number = int(value)
+    if number < 1:
+        msg = f"must be a positive integer: {value}"
+        raise argparse.ArgumentTypeError(msg)
+    return number
+
+
+def _read_chunks(
+    lines: Iterator[str],
+    chunk_size: int,
+    delimiter: str | None,
+    columns: Sequence[int],
+) -> Iterator[tuple[list[str], NDArray[np.float64]]]:
+    """Parse the x, y, z columns of a stream of text lines in chunks of rows.
+
+    Blank and comment lines are skipped. Each chunk is yielded as its rows with
+    their (N, 3) array of coordinates.
+    """
+    rows = (
+        line for line in lines if line.strip() and not line.lstrip().startswith("#")
+    )
+    while chunk := list(islice(rows, chunk_size)):
+        yield (
+            chunk,
+            np.loadtxt(
+                chunk,
+                delimiter=delimiter,
+                usecols=columns,
+                ndmin=2,
+                dtype=np.float64,
+                comments=None,
+            ),
+        )
+
+
+def _write_chunk(
+    out: BinaryIO,
+    rows: Sequence[str],
+    coords: NDArray[np.float64],
+    columns: Sequence[int],
+    fmt: str,
+    delimiter: str | None,
+) -> None:
+    """Write rows with their x, y, z columns replaced by transformed coordinates.
+
+    The other columns are copied unchanged. Whitespace delimited rows are written
+    with their columns separated by single spaces.
+    """
+    separator = delimiter or " "
+    lines = []
+    for row, values in zip(rows, coords.tolist()):
+        fields = row.rstrip("\r\n").split(delimiter)
+        for column, value in zip(columns, values):
+            fields[column] = fmt % value
+        lines.append(separator.join(fields) + "\n")
+    out.write("".join(lines).encode())
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the csrspy command.
+
+    Returns:
+        argparse.ArgumentParser: The argument parser.
+
+    """
+    parser = argparse.ArgumentParser(
+        prog="csrspy",
+        description="Transform coordinates in delimited text files between ITRF "
+        "realizations and NAD83(CSRS), epochs and vertical datums.",
+    )
+    parser.add_argument(
+        "input",
+        nargs="?",
+        default="-",
+        help="Input CSV, TSV or whitespace delimited file. Gzip and zstd compressed "
+        "files are detected automatically. Defaults to stdin.",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="-",
+        help="Output file, compressed if it ends in .gz or .zst. Defaults to stdout.",
+    )
+
+    group = parser.add_argument_group("transformation")
+    group.add_argument("--s-ref-frame", type=Reference, required=True)
+    group.add_argument("--s-coords", type=CoordType, required=True)
+    group.add_argument("--s-epoch", type=float, required=True)
+    group.add_argument("--s-vd", type=VerticalDatum, default=VerticalDatum.GRS80)
+    group.add_argument("--t-ref-frame", type=Reference, required=True)
+    group.add_argument("--t-coords", type=CoordType)
+    group.add_argument("--t-epoch", type=float)
+    group.add_argument("--t-vd", type=VerticalDatum, default=VerticalDatum.GRS80)
+    group.add_argument("--epoch-shift-grid", default="ca_nrc_NAD83v70VG.tif")
+
+    group = parser.add_argument_group("input and output format")
+    group.add_argument(
+        "-d",
+        "--delimiter",
+        help="Column delimiter. Inferred from the input file extension, otherwise "
+        "columns are separated by whitespace.",
+    )
+    group.add_argument(
+        "--columns",
+        type=int,
+        nargs=3,
+        default=(0, 1, 2),
+        metavar=("X", "Y", "Z"),
+        help="Zero-based indices of the x, y and z columns. Other columns are copied "
+        "unchanged. Defaults to 0 1 2.",
+    )
+    group.add_argument(
+        "--skip-header",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Number of header lines copied to the output unchanged.",
+    )
+    group.add_argument(
+        "--fmt",
+        default="%.9f",
+        help="printf-style format of the output values. Defaults to %%.9f.",
+    )
+
+    group = parser.add_argument_group("performance")
+    group.add_argument(
+        "--chunk-size",
+        type=_positive_int,
+        default=1_000_000,
+        help="Number of rows transformed at a time. Defaults to 1000000.",
+    )
+    group.add_argument(
+        "--workers",
+        type=_positive_int,
+        help="Transform each chunk using this many threads.",
+    )
+    group.add_argument(
+        "--grid-engine",
+        type=GridEngine,
+        default=GridEngine.PROJ,
+        help="Interpolate the grids with proj or numpy. Defaults to proj.",
+    )
+    parser.add_argument(
+        "-q", "--quiet", action="store_true", help="Do not report the throughput."
+    )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the csrspy command line interface.
+
+    `csrspy serve ...` runs the HTTP service of `csrspy.server` instead.
+
+    Args:
+        argv: The command line arguments. Defaults to `sys.argv[1:]`.
+
+    Returns:
+        int: The exit status.
+
+    """
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv[:1] == ["serve"]:
+        from csrspy.server import main as serve  # noqa: PLC0415
+
+        return serve(argv[1:])
+
+    args = build_parser().parse_args(argv)
+    transformer = CSRSTransformer(
+        s_ref_frame=args.s_ref_frame,
+        s_coords=args.s_coords,
+        s_epoch=args.s_epoch,
+        s_vd=args.s_vd,
+        t_ref_frame=args.t_ref_frame,
+        t_coords=args.t_coords,
+        t_epoch=args.t_epoch,
+        t_vd=args.t_vd,
+        epoch_shift_grid=args.epoch_shift_grid,
+        grid_engine=args.grid_engine,
+    )
+    delimiter = (
+        args.delimiter if args.delimiter is not None else _infer_delimiter(args.input)
+    )
+
+    start = time.perf_counter()
+    rows = 0
+    with ExitStack() as stack:
+        lines = io.TextIOWrapper(_open_input(args.input, stack), encoding="utf-8")
+        out = _open_output(args.output, stack)
+        for line in islice(lines, args.skip_header):
+            out.write(line.encode())
+
+        # Write each chunk in the background while the next one is read
+        writer = stack.enter_context(ThreadPoolExecutor(max_workers=1))
+        pending: Future | None = None
+        chunks = _read_chunks(lines, args.chunk_size, delimiter, args.columns)
+        for chunk, coords in chunks:
+            if args.workers is None:
+                x, y, z = transformer.transform_arrays(*coords.T)
+            else:
+                x, y, z = transformer.transform_parallel(
+                    *coords.T, workers=args.workers
+                )
+            if pending is not None:
+                pending.result()
+            pending = writer.submit(
+                _write_chunk,
+                out,
+                chunk,
+                np.column_stack((x, y, z)),
+                args.columns,
+                args.fmt,
+                delimiter,
+            )
+            rows += len(x)
+        if pending is not None:
+            pending.result()
+        out.flush()
+
+    if not args.quiet:
+        elapsed = time.perf_counter() - start
+        rate = rows / elapsed if elapsed > 0 else float("inf")
+        sys.stderr.write(
+            f"Transformed {rows} rows in {elapsed:.2f} s ({rate:,.0f} rows/s)\n"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
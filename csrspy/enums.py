@@ -125,3 +125,38 @@ class CoordType(str, Enum):
     UTM21 = "utm21"
     UTM22 = "utm22"
     UTM23 = "utm23"
+
+
+class GridEngine(str, Enum):
+    """Enum for the engines that interpolate grids during transformations.
+
+    Attributes:
+        PROJ: PROJ interpolates the grids one point at a time.
+        NUMPY: The grids are loaded into memory once and interpolated with NumPy,
+            and the Helmert and Cartesian conversion steps are applied with NumPy.
+            See `csrspy.grids` and `csrspy.kernels`.
+
+    """
+
+    PROJ = "proj"
+    NUMPY = "numpy"
+
+
+class RoundingMode(str, Enum):
+    """Enum for the rounding of transformed coordinates to scaled integers.
+
+    Attributes:
+        NEAREST: Round to the nearest integer, with halves away from zero, as LAStools
+            and PDAL do.
+        NEAREST_EVEN: Round to the nearest integer, with halves to even.
+        FLOOR: Round down.
+        CEIL: Round up.
+        TRUNC: Round towards zero.
+
+    """
+
+    NEAREST = "nearest"
+    NEAREST_EVEN = "nearest_even"
+    FLOOR = "floor"
+    CEIL = "ceil"
+    TRUNC = "trunc"
@@ -11,12 +11,278 @@ defined PROJ strings.
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-
-from pyproj import Transformer
+from dataclasses import astuple, dataclass
+from functools import cache, lru_cache
+from typing import TYPE_CHECKING
 
 from csrspy.enums import Reference, VerticalDatum
 
+if TYPE_CHECKING:
+    from pyproj import Transformer
+
+# Helmert parameters from each reference frame to NAD83(CSRS)
+_HELMERT_PARAMS: dict[Reference, tuple[float, ...]] = {
+    Reference.NAD83CSRS: (0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2010),
+    Reference.ITRF88: (
+        0.97300,
+        0.00000,
+        -1.90720,
+        0.00000,
+        -0.42090,
+        0.00000,
+        -26.58160,
+        -0.05320,
+        -0.00010,
+        0.74230,
+        -11.24920,
+        0.03160,
+        -7.40000,
+        0.00000,
+        2010,
+    ),
+    Reference.ITRF89: (
+        0.96800,
+        0.00000,
+        -1.94320,
+        0.00000,
+        -0.44490,
+        0.00000,
+        -26.48160,
+        -0.05320,
+        -0.00010,
+        0.74230,
+        -11.24920,
+        0.03160,
+        -4.30000,
+        0.00000,
+        2010,
+    ),
+    Reference.ITRF90: (
+        0.97300,
+        0.00000,
+        -1.91920,
+        0.00000,
+        -0.48290,
+        0.00000,
+        -26.48160,
+        -0.05320,
+        -0.00010,
+        0.74230,
+        -11.24920,
+        0.03160,
+        -0.90000,
+        0.00000,
+        2010,
+    ),
+    Reference.ITRF91: (
+        0.97100,
+        0.00000,
+        -1.92320,
+        0.00000,
+        -0.49890,
+        0.00000,
+        -26.48160,
+        -0.05320,
+        -0.00010,
+        0.74230,
+        -11.24920,
+        0.03160,
+        -0.60000,
+        0.00000,
+        2010,
+    ),
+    Reference.ITRF92: (
+        0.98300,
+        0.00000,
+        -1.90920,
+        0.00000,
+        -0.50490,
+        0.00000,
+        -26.48160,
+        -0.05320,
+        -0.00010,
+        0.74230,
+        -11.24920,
+        0.03160,
+        0.80000,
+        0.00000,
+        2010,
+    ),
+    Reference.ITRF93: (
+        1.04880,
+        0.00290,
+        -1.91100,
+        -0.00040,
+        -0.51550,
+        -0.00080,
+        -23.67160,
+        0.05680,
+        3.37990,
+        0.93230,
+        -11.38920,
+        -0.01840,
+        -0.40000,
+        0.00000,
+        2010,
+    ),
+    Reference.ITRF94: (
+        0.99100,
+        0.00000,
+        -1.90720,
+        0.00000,
+        -0.51290,
+        0.00000,
+        -26.48160,
+        -0.05320,
+        -0.00010,
+        0.74230,
+        -11.24920,
+        0.03160,
+        0.00000,
+        0.00000,
+        2010,
+    ),
+    Reference.ITRF96: (
+        0.99100,
+        0.00000,
+        -1.90720,
+        0.00000,
+        -0.51290,
+        0.00000,
+        -26.48160,
+        -0.05320,
+        -0.00010,
+        0.74230,
+        -11.24920,
+        0.03160,
+        0.00000,
+        0.00000,
+        2010,
+    ),
+    Reference.ITRF97: (
+        0.99790,
+        0.00069,
+        -1.90871,
+        -0.00010,
+        -0.47877,
+        0.00186,
+        -26.78138,
+        -0.06667,
+        0.42027,
+        0.75744,
+        -11.19206,
+        0.03133,
+        -3.43109,
+        -0.19201,
+        2010,
+    ),
+    Reference.ITRF00: (
+        1.00460,
+        0.00069,
+        -1.91041,
+        -0.00070,
+        -0.51547,
+        0.00046,
+        -26.78138,
+        -0.06667,
+        0.42027,
+        0.75744,
+        -10.93206,
+        0.05133,
+        -1.75109,
+        -0.18201,
+        2010,
+    ),
+    Reference.ITRF05: (
+        1.00270,
+        0.00049,
+        -1.91021,
+        -0.00060,
+        -0.53927,
+        -0.00134,
+        -26.78138,
+        -0.06667,
+        0.42027,
+        0.75744,
+        -10.93206,
+        0.05133,
+        -0.55109,
+        -0.10201,
+        2010,
+    ),
+    Reference.ITRF08: (
+        1.00370,
+        0.00079,
+        -1.91111,
+        -0.00060,
+        -0.54397,
+        -0.00134,
+        -26.78138,
+        -0.06667,
+        0.42027,
+        0.75744,
+        -10.93206,
+        0.05133,
+        0.38891,
+        -0.10201,
+        2010,
+    ),
+    Reference.ITRF14: (
+        1.00530,
+        0.00079,
+        -1.90921,
+        -0.00060,
+        -0.54157,
+        -0.00144,
+        -26.78138,
+        -0.06667,
+        0.42027,
+        0.75744,
+        -10.93206,
+        0.05133,
+        0.36891,
+        -0.07201,
+        2010,
+    ),
+    Reference.ITRF20: (
+        1.00390,
+        0.00079,
+        -1.90961,
+        -0.00070,
+        -0.54117,
+        -0.00124,
+        -26.78138,
+        -0.06667,
+        0.42027,
+        0.75744,
+        -10.93206,
+        0.05133,
+        -0.05109,
+        -0.07201,
+        2010,
+    ),
+}
+
+
+@lru_cache(maxsize=256)
+def transformer_from_pipeline(proj_str: str) -> Transformer:
+    """Create a Transformer from a PROJ pipeline string, reusing existing instances.
+
+    Transformers are cached process-wide and keyed on the PROJ string, so identical
+    stages are only initialized once. pyproj Transformers keep a separate PROJ
+    object per thread, so the cached instances are safe to share.
+
+    Args:
+        proj_str (str): The PROJ pipeline string.
+
+    Returns:
+        Transformer: A Transformer object initialized with the PROJ string.
+
+    """
+    from pyproj import Transformer  # noqa: PLC0415
+
+    return Transformer.from_pipeline(proj_str)
+
 
 class Factory(ABC):
     """Abstract base class for transformation factories.
@@ -56,7 +322,7 @@ class Factory(ABC):
             Transformer: A Transformer object initialized with the PROJ string.
 
         """
-        return Transformer.from_pipeline(self.proj_str)
+        return transformer_from_pipeline(self.proj_str)
 
 
 @dataclass(frozen=True)
@@ -131,6 +397,7 @@ class HelmertFactory(Factory):
         )
 
     @classmethod
+    @cache
     def from_ref_frame(cls, ref_frame: Reference | str) -> HelmertFactory:
         """Create a Helmert transformation based on the reference frame.
 
@@ -146,254 +413,47 @@ class HelmertFactory(Factory):
             KeyError: If the reference frame is not recognized.
 
         """
-        # Define all transformation parameters in a dictionary
-        params = {
-            Reference.NAD83CSRS: (0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2010),
-            Reference.ITRF88: (
-                0.97300,
-                0.00000,
-                -1.90720,
-                0.00000,
-                -0.42090,
-                0.00000,
-                -26.58160,
-                -0.05320,
-                -0.00010,
-                0.74230,
-                -11.24920,
-                0.03160,
-                -7.40000,
-                0.00000,
-                2010,
-            ),
-            Reference.ITRF89: (
-                0.96800,
-                0.00000,
-                -1.94320,
-                0.00000,
-                -0.44490,
-                0.00000,
-                -26.48160,
-                -0.05320,
-                -0.00010,
-                0.74230,
-                -11.24920,
-                0.03160,
-                -4.30000,
-                0.00000,
-                2010,
-            ),
-            Reference.ITRF90: (
-                0.97300,
-                0.00000,
-                -1.91920,
-                0.00000,
-                -0.48290,
-                0.00000,
-                -26.48160,
-                -0.05320,
-                -0.00010,
-                0.74230,
-                -11.24920,
-                0.03160,
-                -0.90000,
-                0.00000,
-                2010,
-            ),
-            Reference.ITRF91: (
-                0.97100,
-                0.00000,
-                -1.92320,
-                0.00000,
-                -0.49890,
-                0.00000,
-                -26.48160,
-                -0.05320,
-                -0.00010,
-                0.74230,
-                -11.24920,
-                0.03160,
-                -0.60000,
-                0.00000,
-                2010,
-            ),
-            Reference.ITRF92: (
-                0.98300,
-                0.00000,
-                -1.90920,
-                0.00000,
-                -0.50490,
-                0.00000,
-                -26.48160,
-                -0.05320,
-                -0.00010,
-                0.74230,
-                -11.24920,
-                0.03160,
-                0.80000,
-                0.00000,
-                2010,
-            ),
-            Reference.ITRF93: (
-                1.04880,
-                0.00290,
-                -1.91100,
-                -0.00040,
-                -0.51550,
-                -0.00080,
-                -23.67160,
-                0.05680,
-                3.37990,
-                0.93230,
-                -11.38920,
-                -0.01840,
-                -0.40000,
-                0.00000,
-                2010,
-            ),
-            Reference.ITRF94: (
-                0.99100,
-                0.00000,
-                -1.90720,
-                0.00000,
-                -0.51290,
-                0.00000,
-                -26.48160,
-                -0.05320,
-                -0.00010,
-                0.74230,
-                -11.24920,
-                0.03160,
-                0.00000,
-                0.00000,
-                2010,
-            ),
-            Reference.ITRF96: (
-                0.99100,
-                0.00000,
-                -1.90720,
-                0.00000,
-                -0.51290,
-                0.00000,
-                -26.48160,
-                -0.05320,
-                -0.00010,
-                0.74230,
-                -11.24920,
-                0.03160,
-                0.00000,
-                0.00000,
-                2010,
-            ),
-            Reference.ITRF97: (
-                0.99790,
-                0.00069,
-                -1.90871,
-                -0.00010,
-                -0.47877,
-                0.00186,
-                -26.78138,
-                -0.06667,
-                0.42027,
-                0.75744,
-                -11.19206,
-                0.03133,
-                -3.43109,
-                -0.19201,
-                2010,
-            ),
-            Reference.ITRF00: (
-                1.00460,
-                0.00069,
-                -1.91041,
-                -0.00070,
-                -0.51547,
-                0.00046,
-                -26.78138,
-                -0.06667,
-                0.42027,
-                0.75744,
-                -10.93206,
-                0.05133,
-                -1.75109,
-                -0.18201,
-                2010,
-            ),
-            Reference.ITRF05: (
-                1.00270,
-                0.00049,
-                -1.91021,
-                -0.00060,
-                -0.53927,
-                -0.00134,
-                -26.78138,
-                -0.06667,
-                0.42027,
-                0.75744,
-                -10.93206,
-                0.05133,
-                -0.55109,
-                -0.10201,
-                2010,
-            ),
-            Reference.ITRF08: (
-                1.00370,
-                0.00079,
-                -1.91111,
-                -0.00060,
-                -0.54397,
-                -0.00134,
-                -26.78138,
-                -0.06667,
-                0.42027,
-                0.75744,
-                -10.93206,
-                0.05133,
-                0.38891,
-                -0.10201,
-                2010,
-            ),
-            Reference.ITRF14: (
-                1.00530,
-                0.00079,
-                -1.90921,
-                -0.00060,
-                -0.54157,
-                -0.00144,
-                -26.78138,
-                -0.06667,
-                0.42027,
-                0.75744,
-                -10.93206,
-                0.05133,
-                0.36891,
-                -0.07201,
-                2010,
-            ),
-            Reference.ITRF20: (
-                1.00390,
-                0.00079,
-                -1.90961,
-                -0.00070,
-                -0.54117,
-                -0.00124,
-                -26.78138,
-                -0.06667,
-                0.42027,
-                0.75744,
-                -10.93206,
-                0.05133,
-                -0.05109,
-                -0.07201,
-                2010,
-            ),
-        }
-
         try:
-            return cls(*params[ref_frame])
+            return cls(*_HELMERT_PARAMS[ref_frame])
         except KeyError:
             raise KeyError(ref_frame) from None
 
+    @classmethod
+    @cache
+    def between(
+        cls, s_ref_frame: Reference | str, t_ref_frame: Reference | str
+    ) -> HelmertFactory:
+        """Create a Helmert transformation directly between two reference frames.
+
+        The parameters from `s_ref_frame` to NAD83(CSRS) and from `t_ref_frame` to
+        NAD83(CSRS) are composed into a single time-dependent transformation. This
+        is accurate to the first order in the rotations and scale, which differs
+        from applying both transformations in turn by well under a micrometre.
+
+        Args:
+            s_ref_frame (Reference | str): The source reference frame.
+            t_ref_frame (Reference | str): The target reference frame.
+
+        Returns:
+            HelmertFactory: An instance of HelmertFactory with the composed
+                parameters.
+
+        Raises:
+            KeyError: If either reference frame is not recognized.
+            ValueError: If the parameters of the reference frames are given at
+                different epochs.
+
+        """
+        s_params = cls.from_ref_frame(s_ref_frame)
+        t_params = cls.from_ref_frame(t_ref_frame)
+        if s_params.itrf_epoch != t_params.itrf_epoch:
+            msg = "Helmert parameters must share an epoch to be composed."
+            raise ValueError(msg)
+        return cls(
+            *(s - t for s, t in zip(astuple(s_params)[:-1], astuple(t_params)[:-1])),
+            itrf_epoch=s_params.itrf_epoch,
+        )
+
 
 @dataclass(frozen=True)
 class VerticalGridShiftFactory(Factory):
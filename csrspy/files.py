@@ -0,0 +1,240 @@
+"""Transformation of coordinate files that are larger than memory.
+
+This module provides functions that stream coordinates stored on disk through a
+`CSRSTransformer` in windows, without loading whole files into memory.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from csrspy.frames import transform_arrow
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from os import PathLike
+    from types import ModuleType
+
+    from csrspy.main import CSRSTransformer
+
+
+def _open_memmap(
+    path: Path, mode: str, n_columns: int, shape: tuple[int, ...] | None = None
+) -> np.memmap:
+    """Memory-map a .npy file, or a raw file of interleaved float64 values."""
+    if path.suffix == ".npy":
+        if mode == "w+":
+            return np.lib.format.open_memmap(
+                path, mode=mode, dtype=np.float64, shape=shape
+            )
+        return np.load(path, mmap_mode=mode)
+    if mode == "w+":
+        return np.memmap(path, dtype=np.float64, mode=mode, shape=shape)
+    return np.memmap(path, dtype=np.float64, mode=mode).reshape(-1, n_columns)
+
+
+def _check_distinct(src: str | PathLike, dst: str | PathLike) -> None:
+    """Refuse to write the output over the source, which would truncate it."""
+    if Path(dst).exists() and Path(dst).samefile(src):
+        msg = "dst must not be the source file. Use inplace=True instead."
+        raise ValueError(msg)
+
+
+def transform_file(
+    transformer: CSRSTransformer,
+    src: str | PathLike,
+    dst: str | PathLike | None = None,
+    *,
+    inplace: bool = False,
+    columns: Sequence[int] = (0, 1, 2),
+    n_columns: int = 3,
+    chunk_size: int = 1_000_000,
+    workers: int | None = None,
+) -> np.memmap:
+    """Transform the coordinates of a memory-mapped .npy or raw float64 file.
+
+    The file holds one point per row, in a `.npy` file with a 2D float64 array or
+    a raw file of interleaved float64 values. Rows are transformed sequentially in
+    windows of `chunk_size`, so files larger than memory can be processed.
+
+    Args:
+        transformer: The transformer used to transform the coordinates.
+        src: The path of the source file.
+        dst: The path of the output file, which has the same format and shape as the
+            source file. Columns other than the coordinates are copied unchanged.
+        inplace: If True, the transformed coordinates are written back into the
+            source file instead of `dst`.
+        columns: The indices of the x, y, and z columns.
+        n_columns: The number of values per row in a raw file.
+        chunk_size: The number of rows transformed at a time.
+        workers: If given, each window is transformed with
+            `CSRSTransformer.transform_parallel` using this many threads.
+
+    Returns:
+        np.memmap: The memory-mapped output array.
+
+    Raises:
+        ValueError: If neither or both of `dst` and `inplace` are given, `dst` is
+            the source file, chunk_size is not positive, or the source file is not
+            a C-ordered 2D float64 array.
+
+    """
+    if inplace == (dst is not None):
+        msg = "Exactly one of dst or inplace=True must be given."
+        raise ValueError(msg)
+    if chunk_size < 1:
+        msg = "chunk_size must be a positive integer."
+        raise ValueError(msg)
+    if dst is not None:
+        _check_distinct(src, dst)
+
+    src_arr = _open_memmap(Path(src), "r+" if inplace else "r", n_columns)
+    if (
+        src_arr.ndim != 2  # noqa: PLR2004
+        or src_arr.dtype != np.float64
+        or not src_arr.flags.c_contiguous
+    ):
+        msg = "The source file must contain a C-ordered 2D float64 array."
+        raise ValueError(msg)
+
+    if inplace:
+        dst_arr = src_arr
+    else:
+        dst_arr = _open_memmap(Path(dst), "w+", n_columns, shape=src_arr.shape)
+
+    # Buffers reused by every window for the transformed coordinates
+    buffers = tuple(np.empty(min(chunk_size, len(src_arr))) for _ in range(3))
+
+    cx, cy, cz = columns
+    for start in range(0, len(src_arr), chunk_size):
+        window = src_arr[start : start + chunk_size]
+        x, y, z = window[:, cx], window[:, cy], window[:, cz]
+        bufs = tuple(b[: len(window)] for b in buffers)
+        if workers is None:
+            x, y, z = transformer.transform_arrays(x, y, z, out=bufs)
+        else:
+            x, y, z = transformer.transform_parallel(x, y, z, workers=workers, out=bufs)
+
+        out = dst_arr[start : start + chunk_size]
+        if not inplace:
+            out[:] = window
+        out[:, cx], out[:, cy], out[:, cz] = x, y, z
+
+    dst_arr.flush()
+    return dst_arr
+
+
+def _parquet() -> ModuleType:
+    """Import pyarrow.parquet, which is needed to read and write Parquet files."""
+    try:
+        import pyarrow.parquet as pq  # noqa: PLC0415
+    except ImportError:
+        msg = (
+            "Transforming Parquet files requires the pyarrow package. Install it with "
+            "`pip install csrspy[arrow]`."
+        )
+        raise ImportError(msg) from None
+    return pq
+
+
+def transform_parquet(
+    transformer: CSRSTransformer,
+    src: str | PathLike,
+    dst: str | PathLike,
+    columns: Sequence[str] = ("x", "y", "z"),
+    *,
+    epoch_column: str | None = None,
+    workers: int | None = None,
+    prefetch: int = 2,
+    compression: str = "snappy",
+) -> int:
+    """Transform the coordinate columns of a Parquet or GeoParquet file.
+
+    The file is streamed one row group at a time. Row groups are read ahead and
+    written in the background on their own threads while the current row group is
+    transformed, so reading, transforming and writing overlap and at most
+    `prefetch` + 2 row groups are held in memory. The output has the same row groups
+    and schema metadata as the source, with float64 coordinate columns. Other
+    columns, including GeoParquet geometry columns, are copied unchanged.
+
+    Args:
+        transformer: The transformer used to transform the coordinates.
+        src: The path of the source file.
+        dst: The path of the output file. It is incomplete if an error is raised.
+        columns: The names of the x, y, and z columns.
+        epoch_column: Optional name of a column with per-point source epochs, as
+            decimal years or timestamps. See `CSRSTransformer.transform_arrays`.
+        workers: If given, each row group is transformed with
+            `CSRSTransformer.transform_parallel` using this many threads.
+        prefetch: The number of row groups read ahead of the one being transformed.
+        compression: The compression codec of the output file.
+
+    Returns:
+        int: The number of rows transformed.
+
+    Raises:
+        ValueError: If `columns` does not name three columns, `dst` is the source
+            file, or prefetch is not positive.
+        KeyError: If a column is missing.
+
+    """
+    if prefetch < 1:
+        msg = "prefetch must be a positive integer."
+        raise ValueError(msg)
+    _check_distinct(src, dst)
+
+    pq = _parquet()
+    rows = 0
+    with ExitStack() as stack:
+        source = stack.enter_context(pq.ParquetFile(src))
+        # Transforming an empty table validates the columns and gives the output schema
+        schema = transform_arrow(
+            transformer,
+            source.schema_arrow.empty_table(),
+            columns,
+            epoch_column=epoch_column,
+        ).schema
+        writer = stack.enter_context(
+            pq.ParquetWriter(dst, schema, compression=compression)
+        )
+        # Row groups are read, and written, in order on a single thread each
+        read_executor = stack.enter_context(ThreadPoolExecutor(max_workers=1))
+        write_executor = stack.enter_context(ThreadPoolExecutor(max_workers=1))
+        groups = iter(range(source.num_row_groups))
+        reads = deque(
+            read_executor.submit(source.read_row_group, i)
+            for _, i in zip(range(prefetch), groups)
+        )
+        pending: Future | None = None
+        try:
+            while reads:
+                table = reads.popleft().result()
+                i = next(groups, None)
+                if i is not None:
+                    reads.append(read_executor.submit(source.read_row_group, i))
+
+                table = transform_arrow(
+                    transformer,
+                    table,
+                    columns,
+                    epoch_column=epoch_column,
+                    workers=workers,
+                )
+                if pending is not None:
+                    pending.result()
+                pending = write_executor.submit(
+                    writer.write_table, table, row_group_size=max(table.num_rows, 1)
+                )
+                rows += table.num_rows
+            if pending is not None:
+                pending.result()
+        finally:
+            for future in reads:
+                future.cancel()
+    return rows
@@ -0,0 +1,176 @@
+"""Transformation of the coordinate columns of pandas and Apache Arrow tables.
+
+The columns are read as NumPy views of their buffers where possible, transformed with
+the vectorized array methods of `CSRSTransformer`, and returned as new float64 columns
+that wrap the transformed arrays, so no Python objects are created per row.
+
+Transforming Arrow tables requires the optional pyarrow package. pandas is not
+imported, as the methods of the data frame are used directly.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable, Sequence
+    from types import ModuleType
+
+    import pandas as pd
+    import pyarrow as pa
+    from numpy.typing import NDArray
+
+    from csrspy.main import CSRSTransformer, T_Arrays3D
+
+
+def _pyarrow() -> ModuleType:
+    """Import pyarrow, which is needed to build the transformed Arrow columns."""
+    try:
+        import pyarrow as pa  # noqa: PLC0415
+    except ImportError:
+        msg = (
+            "Transforming Arrow tables requires the pyarrow package. Install it with "
+            "`pip install csrspy[arrow]`."
+        )
+        raise ImportError(msg) from None
+    return pa
+
+
+def _transform(
+    transformer: CSRSTransformer,
+    coords: Sequence[NDArray],
+    epoch: NDArray | None,
+    workers: int | None,
+) -> T_Arrays3D:
+    """Transform the coordinates of a block into new arrays."""
+    if workers is None:
+        return transformer.transform_arrays(*coords, epoch=epoch)
+    return transformer.transform_parallel(*coords, epoch=epoch, workers=workers)
+
+
+def transform_dataframe(
+    transformer: CSRSTransformer,
+    df: pd.DataFrame,
+    columns: Sequence[Hashable] = ("x", "y", "z"),
+    *,
+    epoch_column: Hashable | None = None,
+    workers: int | None = None,
+    inplace: bool = False,
+) -> pd.DataFrame:
+    """Transform the coordinate columns of a pandas DataFrame.
+
+    Float64 columns without missing values are read without a copy. Missing values
+    are read as NaN.
+
+    Args:
+        transformer: The transformer used to transform the coordinates.
+        df: The data frame to transform.
+        columns: The names of the x, y, and z columns.
+        epoch_column: Optional name of a column with per-point source epochs, as
+            decimal years or timezone-naive datetimes. See
+            `CSRSTransformer.transform_arrays`.
+        workers: If given, the columns are transformed with
+            `CSRSTransformer.transform_parallel` using this many threads.
+        inplace: If True, the coordinate columns of `df` are replaced instead of
+            those of a shallow copy.
+
+    Returns:
+        A data frame with the transformed float64 coordinate columns and the other
+        columns of `df`. This is `df` if `inplace` is True.
+
+    Raises:
+        ValueError: If `columns` does not name three columns.
+        KeyError: If a column is missing.
+
+    """
+    if len(columns) != 3:  # noqa: PLR2004
+        msg = "columns must name the x, y, and z columns."
+        raise ValueError(msg)
+
+    coords = [
+        df[name].to_numpy(dtype=np.float64, copy=False, na_value=np.nan)
+        for name in columns
+    ]
+    epoch = None if epoch_column is None else df[epoch_column].to_numpy()
+    transformed = _transform(transformer, coords, epoch, workers)
+
+    result = df if inplace else df.copy(deep=False)
+    for name, values in zip(columns, transformed):
+        result[name] = values
+    return result
+
+
+def transform_arrow(
+    transformer: CSRSTransformer,
+    table: pa.Table | pa.RecordBatch,
+    columns: Sequence[str] = ("x", "y", "z"),
+    *,
+    epoch_column: str | None = None,
+    workers: int | None = None,
+) -> pa.Table | pa.RecordBatch:
+    """Transform the coordinate columns of an Arrow Table or RecordBatch.
+
+    The table is transformed one record batch at a time, so chunked columns are not
+    concatenated and the output columns keep the chunks of the input. Float64
+    columns without nulls are read without a copy, and the transformed arrays are
+    wrapped as Arrow arrays without a copy. Nulls are kept as nulls.
+
+    Args:
+        transformer: The transformer used to transform the coordinates.
+        table: The table or record batch to transform.
+        columns: The names of the x, y, and z columns.
+        epoch_column: Optional name of a column with per-point source epochs, as
+            decimal years or timestamps. See `CSRSTransformer.transform_arrays`.
+        workers: If given, each batch is transformed with
+            `CSRSTransformer.transform_parallel` using this many threads.
+
+    Returns:
+        A new table or record batch with the transformed float64 coordinate columns
+        and the other columns of `table`.
+
+    Raises:
+        ValueError: If `columns` does not name three columns.
+        KeyError: If a column is missing.
+
+    """
+    pa = _pyarrow()
+    if len(columns) != 3:  # noqa: PLR2004
+        msg = "columns must name the x, y, and z columns."
+        raise ValueError(msg)
+    names = [*columns, *([] if epoch_column is None else [epoch_column])]
+    missing = [name for name in names if name not in table.schema.names]
+    if missing:
+        msg = f"The table has no columns named {', '.join(missing)}."
+        raise KeyError(msg)
+
+    is_batch = isinstance(table, pa.RecordBatch)
+    batches = [table] if is_batch else table.to_batches()
+    chunks: list[list[pa.Array]] = [[], [], []]
+    for batch in batches:
+        arrays = [batch.column(name) for name in columns]
+        coords = [a.to_numpy(zero_copy_only=False) for a in arrays]
+        epoch = None
+        if epoch_column is not None:
+            epoch = batch.column(epoch_column).to_numpy(zero_copy_only=False)
+        transformed = _transform(transformer, coords, epoch, workers)
+        for chunk, array, values in zip(chunks, arrays, transformed):
+            chunk.append(_arrow_array(pa, values, array))
+
+    for name, chunk in zip(columns, chunks):
+        i = table.schema.get_field_index(name)
+        field = pa.field(name, pa.float64(), metadata=table.schema.field(i).metadata)
+        column = chunk[0] if is_batch else pa.chunked_array(chunk, type=pa.float64())
+        table = table.set_column(i, field, column)
+    return table
+
+
+def _arrow_array(
+    pa: ModuleType, values: NDArray[np.float64], like: pa.Array
+) -> pa.Array:
+    """Wrap transformed values as an Arrow array with the nulls of the input."""
+    mask = None
+    if like.null_count:
+        mask = like.is_null().to_numpy(zero_copy_only=False)
+    return pa.array(values, type=pa.float64(), mask=mask)
@@ -0,0 +1,980 @@
+"""In-memory interpolation of PROJ grids with NumPy.
+
+This module loads the GeoTIFF grids used by the vgridshift and deformation steps of
+a transformation pipeline into NumPy arrays once, and applies those steps to whole
+arrays of coordinates with vectorized bilinear interpolation. The interpolation
+follows PROJ, including at the edges of grids, between nested subgrids and around
+nodata values, so the results match PROJ to within floating point rounding. The
+cart, helmert and set steps between them are applied with the closed-form kernels
+of `csrspy.kernels`.
+
+Reading the grids requires the optional tifffile package, and imagecodecs for
+compressed grids. Both are installed with the `grids` extra.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import re
+from dataclasses import dataclass, field
+from functools import cache
+from itertools import islice
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
+from xml.etree import ElementTree as ET
+
+import numpy as np
+
+from csrspy.factories import transformer_from_pipeline
+from csrspy.kernels import (
+    ELLIPSOIDS,
+    cartesian_to_geodetic,
+    geodetic_to_cartesian,
+    helmert_affine,
+    helmert_rotation,
+    helmert_transform,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Iterable, Iterator, Sequence
+    from types import ModuleType
+
+    from numpy.typing import ArrayLike, NDArray
+
+    T_Step = Callable[
+        [
+            "NDArray[np.float64]",
+            "NDArray[np.float64]",
+            "NDArray[np.float64]",
+            "NDArray[np.float64]",
+        ],
+        None,
+    ]
+
+# GeoTIFF and GDAL tags read from the grid files
+MODEL_PIXEL_SCALE_TAG = 33550
+MODEL_TIEPOINT_TAG = 33922
+GEO_KEY_DIRECTORY_TAG = 34735
+GDAL_METADATA_TAG = 42112
+GDAL_NODATA_TAG = 42113
+GT_MODEL_TYPE_GEO_KEY = 1024
+GT_RASTER_TYPE_GEO_KEY = 1025
+MODEL_TYPE_GEOGRAPHIC = 2
+RASTER_PIXEL_IS_AREA = 1
+
+# Convergence criteria of the inverse deformation, the same as PROJ's
+DEFORMATION_TOL = 1e-8
+DEFORMATION_MAX_ITERATIONS = 10
+
+# The parameters of a PROJ helmert step, in the order used by `Helmert`
+HELMERT_PARAMS = ("x", "y", "z", "rx", "ry", "rz", "s")
+
+# PROJ rejects angular input beyond these limits, in radians
+EPS_LAT = 1e-12
+MAX_LAM = 10
+
+# The number of points read from an iterable and transformed at a time by itransform
+ITRANSFORM_CHUNK_SIZE = 65_536
+
+# Whether the input and output of operations are angular, in the forward direction.
+# Operations that are not listed are map projections, and the listed operations
+# with None leave the coordinates unchanged.
+ANGULAR_IO: dict[str, tuple[bool, bool] | None] = {
+    "longlat": (True, True),
+    "latlong": (True, True),
+    "lonlat": (True, True),
+    "latlon": (True, True),
+    "vgridshift": (True, True),
+    "cart": (True, False),
+    "helmert": (False, False),
+    "deformation": (False, False),
+    "set": None,
+    "noop": None,
+}
+
+
+def _tifffile() -> ModuleType:
+    """Import tifffile, which is needed to read the grids."""
+    try:
+        import tifffile  # noqa: PLC0415
+    except ImportError:
+        msg = (
+            "The numpy grid engine requires the tifffile package. Install it with "
+            "`pip install csrspy[grids]`."
+        )
+        raise ImportError(msg) from None
+    return tifffile
+
+
+@dataclass(eq=False)
+class Grid:
+    """A grid of values on a regular longitude and latitude raster.
+
+    Attributes:
+        west (float): The longitude of the westernmost nodes in radians.
+        south (float): The latitude of the southernmost nodes in radians.
+        east (float): The longitude of the easternmost nodes in radians.
+        north (float): The latitude of the northernmost nodes in radians.
+        res_x (float): The spacing of the nodes in longitude in radians.
+        res_y (float): The spacing of the nodes in latitude in radians.
+        values (NDArray): The (samples, height, width) grid values, with rows
+            ordered from south to north.
+        nodata (NDArray): A boolean array marking the nodata values.
+        descriptions (tuple[str, ...]): The description of each sample.
+        units (tuple[str, ...]): The unit of each sample.
+        children (list[Grid]): The finer grids nested inside this grid.
+
+    """
+
+    west: float
+    south: float
+    east: float
+    north: float
+    res_x: float
+    res_y: float
+    values: NDArray[np.float64]
+    nodata: NDArray[np.bool_]
+    descriptions: tuple[str, ...] = ()
+    units: tuple[str, ...] = ()
+    children: list[Grid] = field(default_factory=list)
+
+    @property
+    def width(self) -> int:
+        """The number of nodes in longitude."""
+        return self.values.shape[2]
+
+    @property
+    def height(self) -> int:
+        """The number of nodes in latitude."""
+        return self.values.shape[1]
+
+    @property
+    def full_world_longitude(self) -> bool:
+        """Whether the grid wraps around the whole world in longitude."""
+        return self.east - self.west + self.res_x >= 2 * math.pi - 1e-10
+
+    def sample(self, *descriptions: str, default: int = 0) -> int:
+        """Get the index of the first sample with one of the given descriptions."""
+        for i, description in enumerate(self.descriptions):
+            if description in descriptions:
+                return i
+        return default
+
+    def contains(self, other: Grid) -> bool:
+        """Check if the extent of another grid is within this grid."""
+        return (
+            self.west <= other.west
+            and self.south <= other.south
+            and self.east >= other.east
+            and self.north >= other.north
+        )
+
+    def contains_points(
+        self, lam: NDArray[np.float64], phi: NDArray[np.float64]
+    ) -> NDArray[np.bool_]:
+        """Check which points are within the extent of the grid."""
+        inside = (phi >= self.south) & (phi <= self.north)
+        if self.full_world_longitude:
+            return inside
+        lam = np.where(lam < self.west, lam + 2 * math.pi, lam)
+        lam = np.where(lam > self.east, lam - 2 * math.pi, lam)
+        return inside & (lam >= self.west) & (lam <= self.east)
+
+    def insert(self, grid: Grid) -> None:
+        """Insert a grid into the hierarchy of grids nested inside this grid."""
+        for child in self.children:
+            if child.contains(grid):
+                child.insert(grid)
+                return
+        self.children.append(grid)
+
+    def grid_coords(
+        self, lam: NDArray[np.float64], phi: NDArray[np.float64]
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """Get the fractional column and row of points within the grid."""
+        x = (lam - self.west) / self.res_x
+        outside = (lam < self.west) | (lam > self.east)
+        if self.full_world_longitude:
+            wrapped = np.fmod(
+                np.fmod(x + self.width, self.width) + self.width, self.width
+            )
+        else:
+            wrapped = np.where(
+                lam < self.west,
+                (lam + 2 * math.pi - self.west) / self.res_x,
+                (lam - 2 * math.pi - self.west) / self.res_x,
+            )
+        x = np.where(outside, wrapped, x)
+        y = (phi - self.south) / self.res_y
+        return x, y
+
+
+def _grid_from_page(page: Any) -> Grid:  # noqa: ANN401
+    """Read a grid from a page of a GeoTIFF file."""
+    tags = page.tags
+    geo_keys = tags[GEO_KEY_DIRECTORY_TAG].value
+    keys = {geo_keys[i]: geo_keys[i + 3] for i in range(4, 4 * (geo_keys[3] + 1), 4)}
+    if keys.get(GT_MODEL_TYPE_GEO_KEY) != MODEL_TYPE_GEOGRAPHIC:
+        msg = "Only grids referenced in a geographic CRS are supported."
+        raise ValueError(msg)
+
+    res_x, res_y = tags[MODEL_PIXEL_SCALE_TAG].value[:2]
+    i, j, _, west, north, _ = tags[MODEL_TIEPOINT_TAG].value[:6]
+    west -= i * res_x
+    north += j * res_y
+    if keys.get(GT_RASTER_TYPE_GEO_KEY, RASTER_PIXEL_IS_AREA) == RASTER_PIXEL_IS_AREA:
+        # Tie points refer to the corner of the pixels rather than their center
+        west += res_x / 2
+        north -= res_y / 2
+
+    raw = page.asarray()
+    if raw.ndim == 2:  # noqa: PLR2004
+        raw = raw[np.newaxis]
+    elif "S" in page.axes and page.axes.index("S") == raw.ndim - 1:
+        raw = np.moveaxis(raw, -1, 0)
+    n_samples = raw.shape[0]
+
+    nodata = np.isnan(raw)
+    if GDAL_NODATA_TAG in tags:
+        nodata |= raw == float(tags[GDAL_NODATA_TAG].value.strip("\x00 "))
+
+    metadata = _sample_metadata(tags, n_samples)
+    scales = np.array([float(m.get("scale", 1)) for m in metadata])
+    offsets = np.array([float(m.get("offset", 0)) for m in metadata])
+    values = raw.astype(np.float64) * scales[:, None, None] + offsets[:, None, None]
+    rows = slice(None, None, -1)
+    deg = math.pi / 180
+    return Grid(
+        west=west * deg,
+        south=(north - (raw.shape[1] - 1) * res_y) * deg,
+        east=(west + (raw.shape[2] - 1) * res_x) * deg,
+        north=north * deg,
+        res_x=res_x * deg,
+        res_y=res_y * deg,
+        values=np.ascontiguousarray(values[:, rows]),
+        nodata=np.ascontiguousarray(nodata[:, rows]),
+        descriptions=tuple(m.get("description", "") for m in metadata),
+        units=tuple(m.get("unittype", "") for m in metadata),
+    )
+
+
+def _sample_metadata(tags: Any, n_samples: int) -> list[dict[str, str]]:  # noqa: ANN401
+    """Read the GDAL metadata of each sample, keyed by role."""
+    metadata: list[dict[str, str]] = [{} for _ in range(n_samples)]
+    if GDAL_METADATA_TAG not in tags:
+        return metadata
+    root = ET.fromstring(tags[GDAL_METADATA_TAG].value)  # noqa: S314
+    for item in root.iter("Item"):
+        sample, role = item.get("sample"), item.get("role")
+        if sample is not None and role is not None and int(sample) < n_samples:
+            metadata[int(sample)][role] = (item.text or "").strip()
+    return metadata
+
+
+def find_grid_file(name: str) -> Path:
+    """Find a grid file in the PROJ data directories.
+
+    Args:
+        name (str): The file name of the grid, or its path.
+
+    Returns:
+        Path: The path of the grid file.
+
+    Raises:
+        FileNotFoundError: If the grid file cannot be found.
+
+    """
+    path = Path(name)
+    if path.is_absolute():
+        candidates = [path]
+    else:
+        import pyproj.datadir  # noqa: PLC0415
+
+        directories = [
+            *pyproj.datadir.get_data_dir().split(os.pathsep),
+            pyproj.datadir.get_user_data_dir(),
+        ]
+        candidates = [Path(directory, name) for directory in directories]
+    for candidate in candidates:
+        if candidate.is_file():
+            return candidate
+    msg = (
+        f"Grid file {name} was not found in the PROJ data directories. "
+        "Download it with csrspy.utils.sync_missing_grid_files."
+    )
+    raise FileNotFoundError(msg)
+
+
+@cache
+def load_grids(name: str) -> tuple[Grid, ...]:
+    """Load the grids of a GeoTIFF grid file into memory.
+
+    Subgrids are nested within the grids whose extents contain them, as in PROJ.
+    The result is cached, so each file is read only once.
+
+    Args:
+        name (str): The file name of the grid, or its path.
+
+    Returns:
+        tuple[Grid, ...]: The top level grids of the file.
+
+    Raises:
+        FileNotFoundError: If the grid file cannot be found.
+        ValueError: If the grids are not referenced in a geographic CRS.
+
+    """
+    tifffile = _tifffile()
+    top_grids: list[Grid] = []
+    with tifffile.TiffFile(find_grid_file(name)) as tif:
+        for page in tif.pages:
+            # Skip overviews and masks
+            if page.subfiletype:
+                continue
+            grid = _grid_from_page(page)
+            for parent in top_grids:
+                if parent.contains(grid):
+                    parent.insert(grid)
+                    break
+            else:
+                top_grids.append(grid)
+    return tuple(top_grids)
+
+
+def _locate(
+    grids: Iterable[Grid],
+    lam: NDArray[np.float64],
+    phi: NDArray[np.float64],
+    points: NDArray[np.intp],
+) -> Generator[tuple[Grid, NDArray[np.intp]], None, NDArray[np.intp]]:
+    """Find the finest grid that contains each point, as PROJ does.
+
+    Yields:
+        Each grid and the indices of the points that are interpolated in it.
+
+    Returns:
+        The indices of the points that are outside of all the grids.
+
+    """
+    for grid in grids:
+        if points.size == 0:
+            break
+        inside = grid.contains_points(lam[points], phi[points])
+        if inside.any():
+            # Points within a subgrid are interpolated in the subgrid
+            rest = yield from _locate(grid.children, lam, phi, points[inside])
+            yield grid, rest
+        points = points[~inside]
+    return points
+
+
+def _corners(
+    grid: Grid, x: NDArray[np.float64], y: NDArray[np.float64]
+) -> tuple[NDArray[np.intp], ...]:
+    """Get the column and row indices of the four nodes around each point."""
+    ix1 = np.minimum(x.astype(np.intp), grid.width - 1)
+    iy1 = np.minimum(y.astype(np.intp), grid.height - 1)
+    ix2 = ix1 + 1
+    if grid.full_world_longitude:
+        ix2[ix2 >= grid.width] = 0
+    else:
+        ix2 = np.minimum(ix2, grid.width - 1)
+    iy2 = np.minimum(iy1 + 1, grid.height - 1)
+    return ix1, iy1, ix2, iy2
+
+
+def interpolate_vertical(
+    grids: Sequence[Grid], lam: NDArray[np.float64], phi: NDArray[np.float64]
+) -> NDArray[np.float64]:
+    """Interpolate vertical offsets, as the PROJ vgridshift operation does.
+
+    Nodes with nodata values are left out of the interpolation, and the weights of
+    the other nodes are scaled to sum to one.
+
+    Args:
+        grids (Sequence[Grid]): The top level grids to interpolate.
+        lam (NDArray): The longitudes of the points in radians.
+        phi (NDArray): The latitudes of the points in radians.
+
+    Returns:
+        NDArray: The interpolated values. Points outside of the grids, or with
+            only nodata values around them, are set to infinity.
+
+    """
+    out = np.full(lam.shape, np.inf)
+    for grid, idx in _locate(grids, lam, phi, np.arange(lam.size)):
+        sample = grid.sample("geoid_undulation", "vertical_offset")
+        values, nodata = grid.values[sample], grid.nodata[sample]
+        x, y = grid.grid_coords(lam[idx], phi[idx])
+        ix1, iy1, ix2, iy2 = _corners(grid, x, y)
+        x -= ix1
+        y -= iy1
+
+        value = np.zeros(idx.size)
+        total_weight = np.zeros(idx.size)
+        n_weights = np.zeros(idx.size, dtype=np.intp)
+        for ix, iy, weight in (
+            (ix1, iy1, (1 - x) * (1 - y)),
+            (ix2, iy1, x * (1 - y)),
+            (ix1, iy2, (1 - x) * y),
+            (ix2, iy2, x * y),
+        ):
+            valid = ~nodata[iy, ix]
+            value += np.where(valid, values[iy, ix] * weight, 0)
+            total_weight += np.where(valid, weight, 0)
+            n_weights += valid
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            value = np.where(n_weights == 4, value, value / total_weight)  # noqa: PLR2004
+        out[idx] = np.where(n_weights == 0, np.inf, value)
+    return out
+
+
+def interpolate_samples(
+    grids: Sequence[Grid],
+    lam: NDArray[np.float64],
+    phi: NDArray[np.float64],
+    samples: Sequence[Sequence[str]],
+) -> NDArray[np.float64]:
+    """Interpolate several samples, as PROJ does for velocity grids.
+
+    Unlike vertical offsets, nodata values are not treated specially.
+
+    Args:
+        grids (Sequence[Grid]): The top level grids to interpolate.
+        lam (NDArray): The longitudes of the points in radians.
+        phi (NDArray): The latitudes of the points in radians.
+        samples (Sequence[Sequence[str]]): For each sample to interpolate, the
+            descriptions it may have. The sample at the same position is used if
+            no sample has one of the descriptions.
+
+    Returns:
+        NDArray: The (samples, points) interpolated values. Points outside of the
+            grids are set to infinity.
+
+    """
+    out = np.full((len(samples), lam.size), np.inf)
+    for grid, idx in _locate(grids, lam, phi, np.arange(lam.size)):
+        x, y = grid.grid_coords(lam[idx], phi[idx])
+        ix1, iy1, ix2, iy2 = _corners(grid, x, y)
+        m10 = x - ix1
+        m01 = y - iy1
+        m11 = m10 * m01
+        m00 = 1 - m10 - m01 + m11
+        m10 -= m11
+        m01 -= m11
+
+        for i, descriptions in enumerate(samples):
+            values = grid.values[grid.sample(*descriptions, default=i)]
+            out[i, idx] = (
+                m00 * values[iy1, ix1]
+                + m10 * values[iy1, ix2]
+                + m01 * values[iy2, ix1]
+                + m11 * values[iy2, ix2]
+            )
+    return out
+
+
+def _parse_step(step: str) -> tuple[str, bool, dict[str, str]]:
+    """Split a PROJ step into its operation, direction and parameters."""
+    params = {}
+    inverse = False
+    for token in step.split():
+        key, _, value = token.lstrip("+").partition("=")
+        if key == "inv":
+            inverse = True
+        else:
+            params[key] = value
+    return params.pop("proj"), inverse, params
+
+
+def _grid_names(grids: str) -> list[str]:
+    """Get the grid files of a grids parameter, skipping missing optional grids."""
+    names = []
+    for name in grids.split(","):
+        if name.startswith("@"):
+            try:
+                find_grid_file(name[1:])
+            except FileNotFoundError:
+                continue
+            names.append(name[1:])
+        else:
+            names.append(name)
+    return names
+
+
+def _check_params(operation: str, params: dict[str, str], allowed: set[str]) -> None:
+    unsupported = set(params) - allowed
+    if unsupported:
+        msg = f"Unsupported {operation} parameters: {', '.join(sorted(unsupported))}"
+        raise ValueError(msg)
+
+
+class VerticalGridShift:
+    """The PROJ vgridshift operation, applied with NumPy.
+
+    Args:
+        step (str): The PROJ step, e.g.
+            "+inv +proj=vgridshift +grids=ca_nrc_CGG2013an83.tif +multiplier=1".
+
+    """
+
+    def __init__(self, step: str) -> None:
+        """Initialize the VerticalGridShift."""
+        operation, self.inverse, params = _parse_step(step)
+        _check_params(operation, params, {"grids", "multiplier"})
+        self.multiplier = float(params.get("multiplier", -1.0))
+        self.grids = tuple(
+            grid for name in _grid_names(params["grids"]) for grid in load_grids(name)
+        )
+
+    def __call__(
+        self,
+        x: NDArray[np.float64],
+        y: NDArray[np.float64],
+        z: NDArray[np.float64],
+        t: NDArray[np.float64],
+    ) -> None:
+        """Shift the heights of longitude and latitude coordinates in radians."""
+        value = interpolate_vertical(self.grids, x, y)
+        with np.errstate(invalid="ignore"):
+            if self.inverse:
+                z -= self.multiplier * value
+            else:
+                z += self.multiplier * value
+        # PROJ reports points that cannot be transformed as infinite
+        failed = np.isinf(value)
+        for c in (x, y, z, t):
+            c[failed] = np.inf
+
+
+class Deformation:
+    """The PROJ deformation operation with a velocity grid, applied with NumPy.
+
+    Args:
+        step (str): The PROJ step, e.g.
+            "+inv +proj=deformation +t_epoch=2010 +grids=ca_nrc_NAD83v70VG.tif".
+
+    """
+
+    def __init__(self, step: str) -> None:
+        """Initialize the Deformation."""
+        operation, self.inverse, params = _parse_step(step)
+        _check_params(operation, params, {"grids", "t_epoch", "ellps"})
+        if params.get("ellps", "GRS80") != "GRS80":
+            msg = "Only deformation on the GRS80 ellipsoid is supported."
+            raise ValueError(msg)
+        self.t_epoch = float(params["t_epoch"])
+        self.grids = tuple(
+            grid for name in _grid_names(params["grids"]) for grid in load_grids(name)
+        )
+        for grid in self.grids:
+            unit = grid.units[grid.sample("east_velocity")]
+            if unit not in ("", "millimetres per year"):
+                msg = "Only velocity grids in millimetres per year are supported."
+                raise ValueError(msg)
+
+    def shift(
+        self, x: NDArray[np.float64], y: NDArray[np.float64], z: NDArray[np.float64]
+    ) -> NDArray[np.float64]:
+        """Get the (3, n) velocities of Cartesian coordinates in metres per year.
+
+        Points outside of the grids have infinite velocities.
+        """
+        lam, phi, _ = cartesian_to_geodetic(x, y, z)
+        e, n, u = (
+            interpolate_samples(
+                self.grids,
+                lam.reshape(-1),
+                phi.reshape(-1),
+                [("east_velocity",), ("north_velocity",), ("up_velocity",)],
+            )
+            / 1000
+        )
+        sp, cp = np.sin(phi), np.cos(phi)
+        sl, cl = np.sin(lam), np.cos(lam)
+        velocity = np.stack(
+            [
+                -sp * cl * n - sl * e + cp * cl * u,
+                -sp * sl * n + cl * e + cp * sl * u,
+                cp * n + sp * u,
+            ]
+        )
+        velocity[:, np.isinf(e)] = np.inf
+        return velocity
+
+    def __call__(
+        self,
+        x: NDArray[np.float64],
+        y: NDArray[np.float64],
+        z: NDArray[np.float64],
+        t: NDArray[np.float64],
+    ) -> None:
+        """Shift Cartesian coordinates between their epoch and t_epoch."""
+        dt = t - self.t_epoch
+        with np.errstate(invalid="ignore"):
+            if not self.inverse:
+                # As in PROJ, points outside of the grids become infinite, or NaN
+                # if they are not shifted in time
+                x[:], y[:], z[:] = np.stack([x, y, z]) + dt * self.shift(x, y, z)
+                return
+            out = self._reverse_shift(np.stack([x, y, z]), dt)
+
+        # PROJ reports points that cannot be transformed as infinite
+        failed = np.isinf(out).any(axis=0)
+        x[:], y[:], z[:] = out
+        for c in (x, y, z, t):
+            c[failed] = np.inf
+
+    def _reverse_shift(
+        self, xyz: NDArray[np.float64], dt: NDArray[np.float64]
+    ) -> NDArray[np.float64]:
+        """Find the coordinates that the forward shift maps to xyz, by iteration."""
+        delta = self.shift(*xyz)
+        z0 = delta[2]
+        out = xyz - dt * delta
+
+        active = np.isfinite(delta).all(axis=0)
+        for _ in range(DEFORMATION_MAX_ITERATIONS):
+            idx = np.flatnonzero(active)
+            if idx.size == 0:
+                break
+            delta = self.shift(*out[:, idx])
+            # Points that leave the grids stop iterating, as in PROJ
+            ok = np.isfinite(delta).all(axis=0)
+            idx, delta = idx[ok], delta[:, ok]
+            diff = out[:, idx] + dt[idx] * delta - xyz[:, idx]
+            out[:, idx] -= diff
+            active[:] = False
+            active[idx] = np.hypot(diff[0], diff[1]) > DEFORMATION_TOL
+
+        out[2] = xyz[2] - dt * z0
+        # Points outside the grids are an error, even when dt is zero
+        out[:, ~np.isfinite(z0)] = np.inf
+        return out
+
+
+def _failed(
+    x: NDArray[np.float64], y: NDArray[np.float64], z: NDArray[np.float64]
+) -> NDArray[np.bool_]:
+    """Find the points that an earlier step failed to transform."""
+    return (x == np.inf) | (y == np.inf) | (z == np.inf)
+
+
+def _fail(failed: NDArray[np.bool_], *coords: NDArray[np.float64]) -> None:
+    """Report points that cannot be transformed as infinite, as PROJ does."""
+    if failed.any():
+        for c in coords:
+            c[failed] = np.inf
+
+
+class Cartesian:
+    """The PROJ cart operation, applied with NumPy.
+
+    Args:
+        step (str): The PROJ step, e.g. "+inv +proj=cart +ellps=GRS80".
+
+    """
+
+    def __init__(self, step: str) -> None:
+        """Initialize the Cartesian."""
+        operation, self.inverse, params = _parse_step(step)
+        _check_params(operation, params, {"ellps", "no_defs"})
+        self.ellps = params.get("ellps", "GRS80")
+        if self.ellps not in ELLIPSOIDS:
+            msg = f"Unsupported ellipsoid: {self.ellps}"
+            raise ValueError(msg)
+
+    def __call__(
+        self,
+        x: NDArray[np.float64],
+        y: NDArray[np.float64],
+        z: NDArray[np.float64],
+        t: NDArray[np.float64],
+    ) -> None:
+        """Convert between geodetic coordinates in radians and Cartesian."""
+        failed = _failed(x, y, z)
+        with np.errstate(invalid="ignore"):
+            if self.inverse:
+                x[:], y[:], z[:] = cartesian_to_geodetic(x, y, z, self.ellps)
+            else:
+                failed |= (np.abs(y) - math.pi / 2 > EPS_LAT) | (np.abs(x) > MAX_LAM)
+                x[:], y[:], z[:] = geodetic_to_cartesian(x, y, z, self.ellps)
+        _fail(failed, x, y, z, t)
+
+
+class Helmert:
+    """The PROJ helmert operation, applied with NumPy.
+
+    When all points share an epoch, the transformation is reduced to a 3x3 matrix
+    and an offset, which are reused until the epoch changes.
+
+    Args:
+        step (str): The PROJ step, e.g. "proj=helmert convention=position_vector
+            t_epoch=2010 x=1.0053 dx=0.00079 ...".
+
+    """
+
+    def __init__(self, step: str) -> None:
+        """Initialize the Helmert."""
+        operation, self.inverse, params = _parse_step(step)
+        rates = {f"d{name}" for name in HELMERT_PARAMS}
+        _check_params(
+            operation, params, {"convention", "t_epoch", *HELMERT_PARAMS, *rates}
+        )
+        convention = params.get("convention", "position_vector")
+        if convention not in ("position_vector", "coordinate_frame"):
+            msg = f"Unsupported Helmert convention: {convention}"
+            raise ValueError(msg)
+        self.position_vector = convention == "position_vector"
+        self.t_epoch = float(params.get("t_epoch", 0))
+        self.values = np.array([float(params.get(k, 0)) for k in HELMERT_PARAMS])
+        self.rates = np.array([float(params.get(f"d{k}", 0)) for k in HELMERT_PARAMS])
+        self._affine: tuple[float, NDArray[np.float64], NDArray[np.float64]] | None = (
+            None
+        )
+
+    def params(self, t: ArrayLike) -> NDArray[np.float64]:
+        """Get the parameters at epoch t, in the order of `HELMERT_PARAMS`."""
+        dt = np.asarray(t, dtype=np.float64) - self.t_epoch
+        return self.values.reshape(-1, *(1,) * dt.ndim) + np.multiply.outer(
+            self.rates, dt
+        )
+
+    def affine(self, t: float) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """Get the matrix and offset of the transformation at epoch t."""
+        # Read and replaced as a whole, as pipelines are shared between threads
+        cached = self._affine
+        if cached is None or cached[0] != t:
+            x, y, z, rx, ry, rz, s = self.params(t)
+            rotation = helmert_rotation(
+                rx, ry, rz, position_vector=self.position_vector
+            )
+            cached = (
+                t,
+                *helmert_affine((x, y, z), rotation, s, inverse=self.inverse),
+            )
+            self._affine = cached
+        return cached[1], cached[2]
+
+    def __call__(
+        self,
+        x: NDArray[np.float64],
+        y: NDArray[np.float64],
+        z: NDArray[np.float64],
+        t: NDArray[np.float64],
+    ) -> None:
+        """Transform Cartesian coordinates at their epochs."""
+        if x.size == 0:
+            return
+        failed = _failed(x, y, z)
+        xyz = np.stack([x, y, z])
+        with np.errstate(invalid="ignore"):
+            if (t == t[0]).all():
+                matrix, offset = self.affine(float(t[0]))
+                x[:], y[:], z[:] = matrix @ xyz + offset
+            else:
+                x0, y0, z0, rx, ry, rz, s = self.params(t)
+                rotation = helmert_rotation(
+                    rx, ry, rz, position_vector=self.position_vector
+                )
+                x[:], y[:], z[:] = helmert_transform(
+                    xyz, np.stack([x0, y0, z0]), rotation, s, inverse=self.inverse
+                )
+        _fail(failed, x, y, z, t)
+
+
+class SetEpoch:
+    """The PROJ set operation for the time coordinate, applied with NumPy.
+
+    Args:
+        step (str): The PROJ step, e.g. "+proj=set +v_4=2010".
+
+    """
+
+    def __init__(self, step: str) -> None:
+        """Initialize the SetEpoch."""
+        operation, _, params = _parse_step(step)
+        _check_params(operation, params, {"v_4"})
+        self.epoch = float(params["v_4"])
+
+    def __call__(
+        self,
+        x: NDArray[np.float64],
+        y: NDArray[np.float64],  # noqa: ARG002
+        z: NDArray[np.float64],  # noqa: ARG002
+        t: NDArray[np.float64],
+    ) -> None:
+        """Set the time coordinate of the points that have not failed."""
+        t[x != np.inf] = self.epoch
+
+
+# The operations that are applied with NumPy rather than PROJ
+NUMPY_OPERATIONS: dict[str, Callable[[str], T_Step]] = {
+    "vgridshift": VerticalGridShift,
+    "deformation": Deformation,
+    "cart": Cartesian,
+    "helmert": Helmert,
+    "set": SetEpoch,
+}
+
+
+def _angular_io(steps: Sequence[str]) -> tuple[bool, bool]:
+    """Check whether the input and output of a pipeline are angular."""
+    angular = []
+    for step in steps:
+        operation, inverse, _ = _parse_step(step)
+        io = ANGULAR_IO.get(operation, (True, False))
+        if io is not None:
+            angular.append(io[::-1] if inverse else io)
+    if not angular:
+        return False, False
+    return angular[0][0], angular[-1][1]
+
+
+class GridPipeline:
+    """A PROJ pipeline whose grid operations are interpolated with NumPy.
+
+    The vgridshift, deformation, cart, helmert and set steps are applied with
+    NumPy, noop steps are skipped, and each run of the other steps is applied by
+    PROJ. Angles are passed between the steps in radians, and converted from and to
+    degrees only at the input and output of the pipeline, as pyproj does. This
+    provides the part of the `pyproj.Transformer` interface used by
+    `CSRSTransformer`.
+
+    Args:
+        proj_str (str): The PROJ pipeline string.
+
+    """
+
+    def __init__(self, proj_str: str) -> None:
+        """Initialize the GridPipeline."""
+        self.proj_str = proj_str
+        steps = re.split(r"\s*\+step\s+", proj_str)
+        if steps[0].strip() in ("+proj=pipeline", "proj=pipeline"):
+            steps = steps[1:]
+        self.angular_input, self.angular_output = _angular_io(steps)
+
+        self.steps: list[T_Step] = []
+        proj_steps: list[str] = []
+        for step in steps:
+            operation = _parse_step(step)[0]
+            if operation == "noop":
+                continue
+            if operation not in NUMPY_OPERATIONS:
+                proj_steps.append(step)
+                continue
+            if proj_steps:
+                self.steps.append(self._proj_step(proj_steps))
+                proj_steps = []
+            self.steps.append(NUMPY_OPERATIONS[operation](step))
+        if proj_steps:
+            self.steps.append(self._proj_step(proj_steps))
+
+    @staticmethod
+    def _proj_step(steps: list[str]) -> T_Step:
+        if len(steps) == 1:
+            transformer = transformer_from_pipeline(steps[0])
+        else:
+            transformer = transformer_from_pipeline(
+                " ".join(["+proj=pipeline", *(f"+step {step}" for step in steps)])
+            )
+
+        def step(
+            x: NDArray[np.float64],
+            y: NDArray[np.float64],
+            z: NDArray[np.float64],
+            t: NDArray[np.float64],
+        ) -> None:
+            transformer.transform(x, y, z, t, radians=True, inplace=True)
+
+        return step
+
+    def transform(
+        self,
+        xx: ArrayLike,
+        yy: ArrayLike,
+        zz: ArrayLike,
+        tt: ArrayLike,
+        *,
+        inplace: bool = False,
+    ) -> tuple[NDArray[np.float64], ...]:
+        """Transform arrays of coordinates through the pipeline.
+
+        Args:
+            xx: The x coordinates.
+            yy: The y coordinates.
+            zz: The z coordinates.
+            tt: The time coordinates.
+            inplace: If True, the coordinates are transformed in place when they are
+                C-contiguous, writeable float64 NumPy arrays.
+
+        Returns:
+            tuple: The transformed x, y, z and time coordinates.
+
+        """
+        coords = []
+        for c in (xx, yy, zz, tt):
+            if not (
+                inplace
+                and isinstance(c, np.ndarray)
+                and c.dtype == np.float64
+                and c.flags.c_contiguous
+                and c.flags.writeable
+            ):
+                c = np.array(c, dtype=np.float64)  # noqa: PLW2901
+            coords.append(c)
+
+        flat = [c.reshape(-1) for c in coords]
+        if self.angular_input:
+            np.radians(flat[0], out=flat[0])
+            np.radians(flat[1], out=flat[1])
+        for step in self.steps:
+            step(*flat)
+        if self.angular_output:
+            np.degrees(flat[0], out=flat[0])
+            np.degrees(flat[1], out=flat[1])
+        return tuple(coords)
+
+    def itransform(
+        self, points: Iterable[Sequence[float]]
+    ) -> Iterator[tuple[float, ...]]:
+        """Transform an iterable of (x, y, z, t) coordinates.
+
+        Args:
+            points: The coordinates to transform.
+
+        Returns:
+            Iterator: The transformed (x, y, z, t) coordinates.
+
+        """
+        return itransform_chunks(self.transform, points)
+
+
+def itransform_chunks(
+    transform: Callable[..., Any],
+    points: Iterable[Sequence[float]],
+    chunk_size: int = ITRANSFORM_CHUNK_SIZE,
+) -> Iterator[tuple[float, ...]]:
+    """Transform an iterable of (x, y, z, t) coordinates in chunks of arrays.
+
+    Points are read lazily, `chunk_size` at a time, and the transformed points of a
+    chunk are yielded before the next chunk is read, so the memory used does not
+    grow with the number of points and unbounded iterables can be transformed.
+
+    Args:
+        transform: A function that transforms x, y, z and t arrays in place when
+            called with `inplace=True`.
+        points: The coordinates to transform.
+        chunk_size: The number of points transformed at a time.
+
+    Yields:
+        The transformed (x, y, z, t) coordinates.
+
+    """
+    points = iter(points)
+    while chunk := list(islice(points, chunk_size)):
+        coords = np.array(chunk, dtype=np.float64).reshape(-1, 4)
+        x, y, z, t = (np.ascontiguousarray(c) for c in coords.T)
+        transform(x, y, z, t, inplace=True)
+        yield from zip(x.tolist(), y.tolist(), z.tolist(), t.tolist())
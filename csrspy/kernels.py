@@ -0,0 +1,187 @@
+"""Closed-form coordinate operations with NumPy.
+
+This module provides vectorized versions of the PROJ `cart` and `helmert`
+operations, which convert between geodetic and Cartesian coordinates and apply
+time-dependent Helmert transformations to whole arrays of coordinates at once. The
+formulas are the ones PROJ uses, so the results match PROJ to within floating point
+rounding.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from numpy.typing import ArrayLike, NDArray
+
+# The semi-major axis in metres and inverse flattening of the supported ellipsoids
+ELLIPSOIDS: dict[str, tuple[float, float]] = {
+    "GRS80": (6378137.0, 298.257222101),
+    "WGS84": (6378137.0, 298.257223563),
+}
+
+ARCSEC_TO_RAD = math.pi / (180 * 3600)
+
+# Below this cosine of the latitude, heights are computed from z, as in PROJ
+POLAR_COS_PHI = 1e-6
+
+
+def _ellipsoid(ellps: str) -> tuple[float, float, float]:
+    """Get the semi-major axis, semi-minor axis and eccentricity squared."""
+    try:
+        a, rf = ELLIPSOIDS[ellps]
+    except KeyError:
+        msg = f"Unsupported ellipsoid: {ellps}"
+        raise ValueError(msg) from None
+    f = 1 / rf
+    return a, a * (1 - f), 2 * f - f * f
+
+
+def geodetic_to_cartesian(
+    lam: ArrayLike, phi: ArrayLike, h: ArrayLike, ellps: str = "GRS80"
+) -> tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.float64]]:
+    """Convert geodetic coordinates to geocentric Cartesian coordinates.
+
+    Args:
+        lam (ArrayLike): The longitudes in radians.
+        phi (ArrayLike): The latitudes in radians.
+        h (ArrayLike): The ellipsoidal heights in metres.
+        ellps (str): The name of the ellipsoid. Defaults to "GRS80".
+
+    Returns:
+        tuple: The x, y and z coordinates in metres.
+
+    """
+    a, _, es = _ellipsoid(ellps)
+    sin_phi, cos_phi = np.sin(phi), np.cos(phi)
+    n = a / np.sqrt(1 - es * sin_phi * sin_phi)
+    r = (n + h) * cos_phi
+    return r * np.cos(lam), r * np.sin(lam), (n * (1 - es) + h) * sin_phi
+
+
+def cartesian_to_geodetic(
+    x: ArrayLike, y: ArrayLike, z: ArrayLike, ellps: str = "GRS80"
+) -> tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.float64]]:
+    """Convert geocentric Cartesian coordinates to geodetic coordinates.
+
+    This uses the closed-form approximation of Bowring (1976), as PROJ does, which
+    is accurate to well under a millimetre for points near the Earth's surface.
+
+    Args:
+        x (ArrayLike): The x coordinates in metres.
+        y (ArrayLike): The y coordinates in metres.
+        z (ArrayLike): The z coordinates in metres.
+        ellps (str): The name of the ellipsoid. Defaults to "GRS80".
+
+    Returns:
+        tuple: The longitudes and latitudes in radians, and the ellipsoidal heights
+            in metres.
+
+    """
+    a, b, es = _ellipsoid(ellps)
+    # Work with coordinates normalized to the unit ellipsoid
+    x, y, z = (np.asarray(c, dtype=np.float64) * (1 / a) for c in (x, y, z))
+    p = np.hypot(x, y)
+    theta = np.arctan2(z, p * (b / a))
+    sin_theta, cos_theta = np.sin(theta), np.cos(theta)
+    y_phi = z + es / (1 - es) * (b / a) * sin_theta**3
+    x_phi = p - es * cos_theta**3
+    norm_phi = np.hypot(x_phi, y_phi)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sin_phi, cos_phi = y_phi / norm_phi, x_phi / norm_phi
+        phi = np.where(x_phi > 0, np.arctan2(y_phi, x_phi), np.copysign(math.pi / 2, z))
+        n = a / np.sqrt(1 - es * sin_phi * sin_phi)
+        h = np.where(cos_phi < POLAR_COS_PHI, np.abs(z) * a - b, a * p / cos_phi - n)
+    return np.arctan2(y, x), phi, h
+
+
+def helmert_rotation(
+    rx: ArrayLike, ry: ArrayLike, rz: ArrayLike, *, position_vector: bool = True
+) -> NDArray[np.float64]:
+    """Get the rotation matrix of a Helmert transformation.
+
+    As in PROJ, the rotations are assumed to be small and the matrix is linearized.
+
+    Args:
+        rx (ArrayLike): The rotation about the x axis in arcseconds.
+        ry (ArrayLike): The rotation about the y axis in arcseconds.
+        rz (ArrayLike): The rotation about the z axis in arcseconds.
+        position_vector (bool): If True, use the position vector convention,
+            otherwise the coordinate frame convention.
+
+    Returns:
+        NDArray: The (3, 3) rotation matrix, or a (3, 3, n) stack of matrices if
+            the rotations are arrays.
+
+    """
+    rx, ry, rz = (
+        np.asarray(r, dtype=np.float64) * ARCSEC_TO_RAD
+        for r in np.broadcast_arrays(rx, ry, rz)
+    )
+    one = np.ones_like(rx)
+    rotation = np.array([[one, rz, -ry], [-rz, one, rx], [ry, -rx, one]])
+    if position_vector:
+        return rotation.swapaxes(0, 1)
+    return rotation
+
+
+def helmert_affine(
+    translation: ArrayLike,
+    rotation: NDArray[np.float64],
+    scale: float,
+    *,
+    inverse: bool = False,
+) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """Reduce a Helmert transformation at one epoch to a matrix and an offset.
+
+    The transformed coordinates are `matrix @ xyz + offset` for a (3, n) array of
+    Cartesian coordinates `xyz`.
+
+    Args:
+        translation (ArrayLike): The x, y and z translations in metres.
+        rotation (NDArray): The (3, 3) rotation matrix from `helmert_rotation`.
+        scale (float): The scale difference in parts per million.
+        inverse (bool): If True, reduce the inverse transformation.
+
+    Returns:
+        tuple: The (3, 3) matrix and the (3, 1) offset.
+
+    """
+    translation = np.asarray(translation, dtype=np.float64).reshape(3, 1)
+    factor = 1 + scale * 1e-6
+    if inverse:
+        matrix = rotation.T / factor
+        return matrix, -matrix @ translation
+    return factor * rotation, translation
+
+
+def helmert_transform(
+    xyz: NDArray[np.float64],
+    translation: NDArray[np.float64],
+    rotation: NDArray[np.float64],
+    scale: NDArray[np.float64],
+    *,
+    inverse: bool = False,
+) -> NDArray[np.float64]:
+    """Apply a Helmert transformation with different parameters for each point.
+
+    Args:
+        xyz (NDArray): The (3, n) Cartesian coordinates in metres.
+        translation (NDArray): The (3, n) translations in metres.
+        rotation (NDArray): The (3, 3, n) rotation matrices from
+            `helmert_rotation`.
+        scale (NDArray): The (n,) scale differences in parts per million.
+        inverse (bool): If True, apply the inverse transformation.
+
+    Returns:
+        NDArray: The (3, n) transformed coordinates.
+
+    """
+    factor = 1 + scale * 1e-6
+    if inverse:
+        return np.einsum("ji...,j...->i...", rotation, (xyz - translation) / factor)
+    return factor * np.einsum("ij...,j...->i...", rotation, xyz) + translation
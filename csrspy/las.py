@@ -0,0 +1,182 @@
+"""Transformation of LAS-style scaled integer coordinates.
+
+LAS point records store coordinates as int32 values that are scaled and offset by
+per-file factors, so that `coordinate = value * scale + offset`. The functions in this
+module dequantize, transform and requantize such coordinates in windows, reusing the
+same float64 buffers for every window instead of converting whole arrays at once.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable
+
+import numpy as np
+
+from csrspy.enums import RoundingMode
+
+if TYPE_CHECKING:
+    from numpy.typing import ArrayLike, NDArray
+
+    from csrspy.main import CSRSTransformer
+
+T_IntArrays3D = tuple["NDArray[np.int32]", "NDArray[np.int32]", "NDArray[np.int32]"]
+
+INT32_MIN, INT32_MAX = np.iinfo(np.int32).min, np.iinfo(np.int32).max
+
+
+def _round_nearest(values: NDArray[np.float64]) -> None:
+    # Halves are rounded away from zero
+    np.add(values, np.copysign(0.5, values), out=values)
+    np.trunc(values, out=values)
+
+
+_ROUNDING: dict[RoundingMode, Callable[[NDArray[np.float64]], None]] = {
+    RoundingMode.NEAREST: _round_nearest,
+    RoundingMode.NEAREST_EVEN: lambda values: np.rint(values, out=values),
+    RoundingMode.FLOOR: lambda values: np.floor(values, out=values),
+    RoundingMode.CEIL: lambda values: np.ceil(values, out=values),
+    RoundingMode.TRUNC: lambda values: np.trunc(values, out=values),
+}
+
+
+def _per_axis(value: ArrayLike, name: str) -> NDArray[np.float64]:
+    """Broadcast a scale or offset to one value per axis."""
+    try:
+        return np.array(np.broadcast_to(value, 3), dtype=np.float64)
+    except ValueError:
+        msg = f"{name} must be a scalar or have one value per axis."
+        raise ValueError(msg) from None
+
+
+def _output_arrays(
+    coords: tuple[NDArray, ...],
+    x: ArrayLike,
+    y: ArrayLike,
+    z: ArrayLike,
+    *,
+    inplace: bool,
+    out: T_IntArrays3D | None,
+) -> T_IntArrays3D:
+    """Get the int32 arrays that the requantized coordinates are written into."""
+    shape = coords[0].shape
+    if not all(c.shape == shape for c in coords):
+        msg = "x, y, and z must have the same shape."
+        raise ValueError(msg)
+
+    if inplace and out is not None:
+        msg = "inplace and out cannot be used together."
+        raise ValueError(msg)
+    if inplace:
+        out = (x, y, z)
+    elif out is None:
+        return tuple(np.empty(shape, dtype=np.int32) for _ in range(3))
+
+    for o in out:
+        if not (
+            isinstance(o, np.ndarray)
+            and o.dtype == np.int32
+            and o.shape == shape
+            and o.flags.c_contiguous
+            and o.flags.writeable
+        ):
+            msg = (
+                "Output arrays must be writeable, C-contiguous int32 NumPy arrays "
+                "with the shape of the input."
+            )
+            raise ValueError(msg)
+    return tuple(out)
+
+
+def transform_scaled(
+    transformer: CSRSTransformer,
+    x: ArrayLike,
+    y: ArrayLike,
+    z: ArrayLike,
+    scale: ArrayLike,
+    offset: ArrayLike,
+    *,
+    out_scale: ArrayLike | None = None,
+    out_offset: ArrayLike | None = None,
+    rounding: RoundingMode | str = RoundingMode.NEAREST,
+    epoch: ArrayLike | None = None,
+    inplace: bool = False,
+    out: T_IntArrays3D | None = None,
+    chunk_size: int = 65_536,
+) -> T_IntArrays3D:
+    """Transform scaled integer coordinates, such as those of LAS point records.
+
+    Each window of `chunk_size` points is dequantized into reused float64 buffers,
+    transformed in place and requantized to `out_scale` and `out_offset`, so the
+    memory used besides the integer arrays does not grow with the number of points.
+
+    Args:
+        transformer: The transformer used to transform the coordinates.
+        x: The scaled integer x coordinates.
+        y: The scaled integer y coordinates.
+        z: The scaled integer z coordinates.
+        scale: The scale of the input coordinates, for all axes or per axis.
+        offset: The offset of the input coordinates, for all axes or per axis.
+        out_scale: The scale of the output coordinates. Defaults to `scale`.
+        out_offset: The offset of the output coordinates. Defaults to `offset`.
+        rounding: How the transformed coordinates are rounded to integers.
+        epoch: Optional per-point source epochs, as decimal years or
+            `numpy.datetime64` values. See `CSRSTransformer.transform_arrays`.
+        inplace: If True, the output is written into `x`, `y` and `z`, which must be
+            C-contiguous int32 NumPy arrays.
+        out: Optional C-contiguous int32 (x, y, z) arrays with the same shape as the
+            input to write the output into.
+        chunk_size: The number of points transformed at a time.
+
+    Returns:
+        The requantized x, y and z coordinates as int32 arrays. These are the input
+        arrays if `inplace` is True, or the `out` arrays if given.
+
+    Raises:
+        ValueError: If the arrays do not have the same shape or cannot be used as
+            output arrays, or if a point cannot be transformed or its output does not
+            fit in an int32. The output arrays are partially written in that case.
+
+    """
+    if chunk_size < 1:
+        msg = "chunk_size must be a positive integer."
+        raise ValueError(msg)
+
+    coords = tuple(np.asarray(c) for c in (x, y, z))
+    out = _output_arrays(coords, x, y, z, inplace=inplace, out=out)
+
+    scale, offset = _per_axis(scale, "scale"), _per_axis(offset, "offset")
+    out_scale = scale if out_scale is None else _per_axis(out_scale, "out_scale")
+    out_offset = offset if out_offset is None else _per_axis(out_offset, "out_offset")
+    round_values = _ROUNDING[RoundingMode(rounding)]
+    if epoch is not None:
+        epoch = np.broadcast_to(np.asarray(epoch), coords[0].shape).reshape(-1)
+
+    # Flat views, so that the output arrays are written in place
+    flat = [c.reshape(-1) for c in coords]
+    flat_out = [o.reshape(-1) for o in out]
+    n = flat[0].size
+    # Buffers reused by every window for the dequantized coordinates
+    buffers = np.empty((3, min(chunk_size, n)), dtype=np.float64)
+
+    for start in range(0, n, chunk_size):
+        window = slice(start, start + chunk_size)
+        bufs = [b[: len(flat[0][window])] for b in buffers]
+        for c, b, s, o in zip(flat, bufs, scale, offset):
+            np.multiply(c[window], s, out=b)
+            np.add(b, o, out=b)
+
+        t = None if epoch is None else epoch[window]
+        transformer.transform_arrays(*bufs, epoch=t, inplace=True)
+
+        for o, b, s, off in zip(flat_out, bufs, out_scale, out_offset):
+            np.subtract(b, off, out=b)
+            np.divide(b, s, out=b)
+            round_values(b)
+            if not np.all((b >= INT32_MIN) & (b <= INT32_MAX)):
+                msg = (
+                    "Transformed coordinates are not finite or do not fit in an int32 "
+                    "with the output scale and offset."
+                )
+                raise ValueError(msg)
+            o[window] = b
+    return out
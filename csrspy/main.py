@@ -6,25 +6,91 @@ Transforms coordinates between different reference frames, epochs, and vertical
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import os
+import re
+import sys
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import cache, cached_property, lru_cache, partial
+from typing import TYPE_CHECKING, Any
 
-from pyproj import CRS, Transformer
+import numpy as np
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
-from pyproj.enums import TransformDirection
-
-from csrspy.enums import CoordType, Reference, VerticalDatum
-from csrspy.factories import HelmertFactory, VerticalGridShiftFactory
+    from collections.abc import (
+        AsyncIterable,
+        AsyncIterator,
+        Iterable,
+        Iterator,
+        Sequence,
+    )
+    from functools import _CacheInfo as CacheInfo
+    from typing import TextIO
+
+    from numpy.typing import ArrayLike, NDArray
+    from pyproj import Transformer
+
+from csrspy.enums import CoordType, GridEngine, Reference, VerticalDatum
+from csrspy.factories import (
+    HelmertFactory,
+    VerticalGridShiftFactory,
+    transformer_from_pipeline,
+)
+from csrspy.grids import GridPipeline, find_grid_file, load_grids
+from csrspy.profiling import (
+    ProfiledPipeline,
+    StageStats,
+    WarmupReport,
+    format_stages,
+    stage_name,
+)
+from csrspy.utils import datetime64_to_decimal_year
 
 EPS = 1e-8
+NOOP = "+proj=noop"
+
+# The number of points transformed per task by the asyncio methods
+ASYNC_CHUNK_SIZE = 65_536
+
+# The number of points of a structured array gathered into contiguous buffers at a time
+STRUCTURED_CHUNK_SIZE = 65_536
+
+# The (west, south, east, north) extent of the Canadian grids in degrees, and the
+# spacing of the probe points used to warm up every tile of the grids
+WARMUP_EXTENT = (-141.0, 40.0, -47.0, 84.0)
+WARMUP_SPACING = 1.0
 
 T_Coord3D = tuple[float, float, float]
 T_Coord4D = tuple[float, float, float, float]
+T_Arrays3D = tuple["NDArray[np.float64]", "NDArray[np.float64]", "NDArray[np.float64]"]
+
+
+def _is_noop(step: str) -> bool:
+    """Check if a PROJ operation step, or its inverse, is a no-op."""
+    return step.removeprefix("+inv ") == NOOP
+
+
+def _pipeline(steps: Iterable[str]) -> str:
+    """Join PROJ operation steps into a single PROJ string, skipping no-ops."""
+    steps = [step for step in steps if not _is_noop(step)]
+    if not steps:
+        return NOOP
+    if len(steps) == 1:
+        return steps[0]
+    return " ".join(["+proj=pipeline", *(f"+step {step}" for step in steps)])
+
+
+def _invert(step: str) -> str:
+    """Toggle the direction of a single PROJ operation step."""
+    if _is_noop(step):
+        return NOOP
+    if step.startswith("+inv "):
+        return step.removeprefix("+inv ")
+    return f"+inv {step}"
 
 
 class _ToNAD83:
-    direction = TransformDirection.FORWARD
+    direction = "FORWARD"
 
     def __init__(
         self,
@@ -36,6 +102,8 @@ class _ToNAD83:
         t_epoch: float | None = None,
         t_vd: VerticalDatum | str = VerticalDatum.GRS80,
         epoch_shift_grid: str = "ca_nrc_NAD83v70VG.tif",
+        *,
+        variable_epochs: bool = False,
     ) -> None:
         super().__init__()
         self.s_ref_frame = (
@@ -49,48 +117,73 @@ class _ToNAD83:
         self.t_vd = t_vd
         self.epoch_shift_grid = epoch_shift_grid
 
-        self.transforms = []
+        # Each stage is a sequence of PROJ operation steps
+        self.stages = self._build_stages(variable_epochs=variable_epochs)
+        self.transforms = [
+            transformer_from_pipeline(_pipeline(stage)) for stage in self.stages
+        ]
 
+    def _build_stages(self, *, variable_epochs: bool) -> list[tuple[str, ...]]:
         # 1. ITRFxx GRS80 / WGS84  -> ECEF GRS80
-        in_crs = CRS.from_proj4(
-            self._coord_type_to_proj4(
-                self.s_coords,
-                VerticalDatum.WGS84
-                if self.s_vd == VerticalDatum.WGS84
-                else VerticalDatum.GRS80,
-            )
-        )
-        grs80_crs = CRS.from_proj4("+proj=cart +ellps=GRS80")
-        transform_in2cartestian = Transformer.from_crs(in_crs, grs80_crs)
-        self.transforms.append(transform_in2cartestian)
+        stages = [self._input_stage()]
 
         # 2. ECEF GRS80 -> NAD83
-        transform_helmert = HelmertFactory.from_ref_frame(self.s_ref_frame).transformer
-        self.transforms.append(transform_helmert)
+        stages.append((HelmertFactory.from_ref_frame(self.s_ref_frame).proj_str,))
 
         # 3. NAD83(CSRS) Ellips s_epoch -> NAD83(CSRS) Ellips t_epoch
-        if abs(self.t_epoch - self.s_epoch) > EPS:
-            # Epoch shift transform
-            epoch_shift_proj_str = (
-                f"+inv +proj=deformation "
-                f"+t_epoch={self.t_epoch:.5f} +grids={self.epoch_shift_grid}"
-            )
-            transform_epoch_shift = Transformer.from_pipeline(epoch_shift_proj_str)
-            self.transforms.append(transform_epoch_shift)
+        # With variable epochs, each point is shifted from its own epoch
+        if self._needs_epoch_shift(variable_epochs=variable_epochs):
+            stages.append(self._epoch_shift_stage())
 
         # 4. Convert cartographic coords to lonlat in radians
-        transform_lonlat2rad = Transformer.from_pipeline("+inv +proj=cart +ellps=GRS80")
-        self.transforms.append(transform_lonlat2rad)
+        stages.append(("+inv +proj=cart +ellps=GRS80",))
 
         # 5. NAD83(CSRS) Ellips t_epoch -> NAD83(CSRS) Orthometric t_epoch
-        transform_vshift = VerticalGridShiftFactory(self.t_vd).transformer
-        self.transforms.append(transform_vshift)
+        stages.append((VerticalGridShiftFactory(self.t_vd).proj_str,))
 
         # 6. Final transform to output
-        transform_out = Transformer.from_pipeline(
-            self._coord_type_to_proj4(self.t_coords)
+        stages.append((self._coord_type_to_proj4(self.t_coords),))
+        return stages
+
+    def _input_stage(self) -> tuple[str, ...]:
+        if self.s_coords == CoordType.CART:
+            return (NOOP,)
+        in_proj_str = self._coord_type_to_proj4(
+            self.s_coords,
+            VerticalDatum.WGS84
+            if self.s_vd == VerticalDatum.WGS84
+            else VerticalDatum.GRS80,
         )
-        self.transforms.append(transform_out)
+        return (f"+inv {in_proj_str}", "+proj=cart +ellps=GRS80")
+
+    def _needs_epoch_shift(self, *, variable_epochs: bool) -> bool:
+        return variable_epochs or abs(self.t_epoch - self.s_epoch) > EPS
+
+    @property
+    def input_epoch(self) -> float:
+        """The epoch assigned to the time coordinate of the input coordinates."""
+        return self.s_epoch
+
+    def _epoch_shift_stage(self) -> tuple[str, ...]:
+        # Shift coordinates from the epoch of their time coordinate to t_epoch
+        return (
+            (
+                f"+inv +proj=deformation "
+                f"+t_epoch={self.t_epoch:.5f} +grids={self.epoch_shift_grid}"
+            ),
+        )
+
+    @property
+    def stage_steps(self) -> list[list[str]]:
+        """The PROJ steps of each stage, in the order they are applied."""
+        if self.direction == "INVERSE":
+            return [[_invert(step) for step in stage[::-1]] for stage in self.stages]
+        return [list(stage) for stage in self.stages]
+
+    @property
+    def steps(self) -> list[str]:
+        """The PROJ steps of all stages, in the order they are applied."""
+        return [step for stage in self.stage_steps for step in stage]
 
     @staticmethod
     def _coord_type_to_proj4(
@@ -107,7 +200,7 @@ class _ToNAD83:
         return f"+proj=utm +zone={zone} +ellps={ellps} +units=m +no_defs"
 
     def _coord_3d_to_4d(self, coord: T_Coord3D) -> T_Coord4D:
-        return coord[0], coord[1], coord[2], self.s_epoch
+        return coord[0], coord[1], coord[2], self.input_epoch
 
     @staticmethod
     def _coord_4d_to_3d(coord: T_Coord4D) -> T_Coord3D:
@@ -130,11 +223,31 @@ class _ToNAD83:
             coords = trans.itransform(coords, direction=self.direction)
         return map(self._coord_4d_to_3d, coords)
 
+    def transform_arrays(self, x: ArrayLike, y: ArrayLike, z: ArrayLike) -> T_Arrays3D:
+        """Transform coordinate arrays from s_ref_frame, s_crs, s_epoch to Nad83(CSRS).
+
+        Each stage is applied to the whole arrays at once, rather than point by point.
+
+        Args:
+            x: The x coordinates (longitude, easting or ECEF X).
+            y: The y coordinates (latitude, northing or ECEF Y).
+            z: The z coordinates (height or ECEF Z).
+
+        Return:
+            The transformed x, y, and z coordinates as float64 arrays.
+
+        """
+        x, y, z = (np.asarray(c, dtype=np.float64) for c in (x, y, z))
+        t = np.full(x.shape, self.input_epoch, dtype=np.float64)
+        for trans in self.transforms:
+            x, y, z, t = trans.transform(x, y, z, t, direction=self.direction)
+        return x, y, z
+
 
 class _FromNAD83(_ToNAD83):
     """The same as _toNAD83, but does all transformations in reverse."""
 
-    direction = TransformDirection.INVERSE
+    direction = "INVERSE"
 
     def __init__(
         self,
@@ -146,6 +259,8 @@ class _FromNAD83(_ToNAD83):
         s_epoch: float | None = None,
         s_vd: VerticalDatum | str = VerticalDatum.GRS80,
         epoch_shift_grid: str = "ca_nrc_NAD83v70VG.tif",
+        *,
+        variable_epochs: bool = False,
     ) -> None:
         super().__init__(
             s_ref_frame=t_ref_frame,
@@ -156,9 +271,148 @@ class _FromNAD83(_ToNAD83):
             t_epoch=s_epoch,
             t_vd=s_vd,
             epoch_shift_grid=epoch_shift_grid,
+            variable_epochs=variable_epochs,
         )
+        self.stages.reverse()
         self.transforms.reverse()
 
+    @property
+    def input_epoch(self) -> float:
+        """The epoch assigned to the time coordinate of the input coordinates."""
+        return self.t_epoch
+
+    def _epoch_shift_stage(self) -> tuple[str, ...]:
+        # Applied in reverse, this shifts the input coordinates from the epoch of
+        # their time coordinate to s_epoch, then sets the time coordinate to s_epoch
+        # for the Helmert transform
+        return (
+            f"+inv +proj=set +v_4={self.s_epoch}",
+            (
+                f"+proj=deformation "
+                f"+t_epoch={self.s_epoch:.5f} +grids={self.epoch_shift_grid}"
+            ),
+        )
+
+
+class _NAD83ToNAD83(_ToNAD83):
+    """Transforms between NAD83(CSRS) epochs, vertical datums and coordinate types.
+
+    Only the stages that change the coordinates are applied, rather than going
+    through ITRF14 and back with two Helmert transforms that cancel out.
+    """
+
+    def __init__(
+        self,
+        s_coords: str | CoordType,
+        s_epoch: float,
+        s_vd: VerticalDatum | str = VerticalDatum.GRS80,
+        t_coords: str | CoordType | None = None,
+        t_epoch: float | None = None,
+        t_vd: VerticalDatum | str = VerticalDatum.GRS80,
+        epoch_shift_grid: str = "ca_nrc_NAD83v70VG.tif",
+        *,
+        variable_epochs: bool = False,
+    ) -> None:
+        super().__init__(
+            s_ref_frame=Reference.NAD83CSRS,
+            s_coords=s_coords,
+            s_epoch=s_epoch,
+            s_vd=s_vd,
+            t_coords=t_coords,
+            t_epoch=t_epoch,
+            t_vd=t_vd,
+            epoch_shift_grid=epoch_shift_grid,
+            variable_epochs=variable_epochs,
+        )
+
+    def _build_stages(self, *, variable_epochs: bool) -> list[tuple[str, ...]]:
+        stages = []
+        epoch_shift = self._needs_epoch_shift(variable_epochs=variable_epochs)
+
+        # 1. Input coordinates -> NAD83(CSRS) lonlat in radians
+        stages.append((f"+inv {self._coord_type_to_proj4(self.s_coords)}",))
+
+        # 2. NAD83(CSRS) Orthometric s_epoch -> NAD83(CSRS) Ellips s_epoch
+        # The vertical grid shifts cancel out if only the coordinate type changes
+        change_vd = epoch_shift or self.s_vd != self.t_vd
+        if change_vd and self.s_vd != VerticalDatum.GRS80:
+            stages.append((_invert(VerticalGridShiftFactory(self.s_vd).proj_str),))
+
+        # 3. NAD83(CSRS) Ellips s_epoch -> NAD83(CSRS) Ellips t_epoch
+        if epoch_shift:
+            stages.append(
+                (
+                    "+proj=cart +ellps=GRS80",
+                    *self._epoch_shift_stage(),
+                    "+inv +proj=cart +ellps=GRS80",
+                )
+            )
+
+        # 4. NAD83(CSRS) Ellips t_epoch -> NAD83(CSRS) Orthometric t_epoch
+        if change_vd:
+            stages.append((VerticalGridShiftFactory(self.t_vd).proj_str,))
+
+        # 5. Final transform to output
+        stages.append((self._coord_type_to_proj4(self.t_coords),))
+        return stages
+
+
+class _ITRFToITRF(_ToNAD83):
+    """Transforms between ITRF realizations at a single epoch.
+
+    The Helmert transforms to and from NAD83(CSRS) are composed into one, so the
+    coordinates are not converted to NAD83(CSRS) geodetic coordinates in between.
+    """
+
+    def __init__(
+        self,
+        s_ref_frame: Reference | str,
+        t_ref_frame: Reference | str,
+        s_coords: str | CoordType,
+        s_epoch: float,
+        s_vd: VerticalDatum | str = VerticalDatum.GRS80,
+        t_coords: str | CoordType | None = None,
+        t_vd: VerticalDatum | str = VerticalDatum.GRS80,
+        epoch_shift_grid: str = "ca_nrc_NAD83v70VG.tif",
+    ) -> None:
+        self.t_ref_frame = (
+            Reference.ITRF14 if t_ref_frame == Reference.WGS84 else t_ref_frame
+        )
+        super().__init__(
+            s_ref_frame=s_ref_frame,
+            s_coords=s_coords,
+            s_epoch=s_epoch,
+            s_vd=s_vd,
+            t_coords=t_coords,
+            t_epoch=s_epoch,
+            t_vd=t_vd,
+            epoch_shift_grid=epoch_shift_grid,
+        )
+
+    def _build_stages(self, *, variable_epochs: bool) -> list[tuple[str, ...]]:  # noqa: ARG002
+        # 1. ITRFxx GRS80 / WGS84  -> ECEF GRS80
+        stages = [self._input_stage()]
+
+        # 2. ECEF GRS80 s_ref_frame -> ECEF GRS80 t_ref_frame
+        if self.s_ref_frame == self.t_ref_frame:
+            stages.append((NOOP,))
+        else:
+            helmert = HelmertFactory.between(self.s_ref_frame, self.t_ref_frame)
+            stages.append((helmert.proj_str,))
+
+        # 3. ECEF GRS80 -> ITRFxx GRS80 / WGS84 output
+        if self.t_coords == CoordType.CART:
+            stages.append((NOOP,))
+        else:
+            out_proj_str = self._coord_type_to_proj4(
+                self.t_coords,
+                VerticalDatum.WGS84
+                if self.t_vd == VerticalDatum.WGS84
+                else VerticalDatum.GRS80,
+            )
+            stages.append(("+inv +proj=cart +ellps=GRS80", out_proj_str))
+        return stages
+
 
 class CSRSTransformer:
     """The main coordinate transformation object.
@@ -184,6 +438,14 @@ class CSRSTransformer:
             See `csrspy.enums.Geoid` for options.
         epoch_shift_grid: The name of the proj grid file used for epoch transformations.
             Defaults to "ca_nrc_NAD83v70VG.tif"
+        grid_engine: The engine that interpolates the epoch shift and vertical datum
+            grids. See `csrspy.enums.GridEngine` for options. Defaults to PROJ.
+        profile: If True, the stages of the transformation are applied one at a
+            time and the wall time and number of points of each are recorded. See
+            `stage_stats` and `explain`. Defaults to False.
+        warmup: If True, the grids are loaded when the transformer is constructed,
+            instead of on the first transformation. See `warmup`. Defaults to
+            False.
 
     Raises:
         ValueError: If VerticalDatum and RefFrame are incompatible with each other.
@@ -202,6 +464,9 @@ class CSRSTransformer:
         t_epoch: float | None = None,
         t_vd: VerticalDatum | str | None = None,
         epoch_shift_grid: str = "ca_nrc_NAD83v70VG.tif",
+        grid_engine: GridEngine | str = GridEngine.PROJ,
+        profile: bool = False,
+        warmup: bool = False,
     ) -> None:
         """Initialize the CSRSTransformer.
 
@@ -216,9 +481,14 @@ class CSRSTransformer:
             t_vd: The target orthometric heights model.
             epoch_shift_grid: The name of the proj grid file used for epoch
                 transformations.
+            grid_engine: The engine that interpolates the epoch shift and vertical
+                datum grids.
+            profile: If True, record the cost of each transformation stage.
+            warmup: If True, load the grids of the transformation immediately.
 
         Raises:
             ValueError: If the reference frame and vertical datum are incompatible.
+            FileNotFoundError: If `warmup` is True and a grid file is missing.
 
         """
         super().__init__()
@@ -231,12 +501,30 @@ class CSRSTransformer:
         self.s_vd = s_vd
         self.t_vd = t_vd if t_vd is not None else s_vd
         self.epoch_shift_grid = epoch_shift_grid
+        self.grid_engine = GridEngine(grid_engine)
+        self.profile = profile
 
         self.validate_crs(s_ref_frame, s_vd)
         self.validate_crs(t_ref_frame, t_vd)
 
-        if (not self.is_nad83(s_ref_frame)) and self.is_nad83(t_ref_frame):
-            self.transformers = [
+        self.transformers = self._build_transformers()
+        self.pipeline = self._pipeline_from_str(self.proj_str)
+        if warmup:
+            self.warmup()
+
+    def _build_transformers(self, *, variable_epochs: bool = False) -> list[_ToNAD83]:
+        """Build the chain of transformers for the configured reference frames.
+
+        Args:
+            variable_epochs: If True, the first transformer shifts each point from the
+                epoch of its time coordinate, even when `s_epoch` equals `t_epoch`.
+
+        Returns:
+            list: The transformers to apply in turn.
+
+        """
+        if (not self.is_nad83(self.s_ref_frame)) and self.is_nad83(self.t_ref_frame):
+            return [
                 _ToNAD83(
                     s_ref_frame=self.s_ref_frame,
                     s_coords=self.s_coords,
@@ -246,11 +534,12 @@ class CSRSTransformer:
                     t_epoch=self.t_epoch,
                     t_vd=self.t_vd,
                     epoch_shift_grid=self.epoch_shift_grid,
+                    variable_epochs=variable_epochs,
                 )
             ]
 
-        elif self.is_nad83(s_ref_frame) and (not self.is_nad83(t_ref_frame)):
-            self.transformers = [
+        if self.is_nad83(self.s_ref_frame) and (not self.is_nad83(self.t_ref_frame)):
+            return [
                 _FromNAD83(
                     t_ref_frame=self.t_ref_frame,
                     t_coords=self.t_coords,
@@ -260,11 +549,26 @@ class CSRSTransformer:
                     s_epoch=self.s_epoch,
                     s_vd=self.s_vd,
                     epoch_shift_grid=self.epoch_shift_grid,
+                    variable_epochs=variable_epochs,
                 )
             ]
 
-        elif not (self.is_nad83(s_ref_frame) or self.is_nad83(t_ref_frame)):
-            self.transformers = [
+        if not (self.is_nad83(self.s_ref_frame) or self.is_nad83(self.t_ref_frame)):
+            # Without a change of epoch, no NAD83(CSRS) deformation is needed
+            if not variable_epochs and abs(self.t_epoch - self.s_epoch) <= EPS:
+                return [
+                    _ITRFToITRF(
+                        s_ref_frame=self.s_ref_frame,
+                        t_ref_frame=self.t_ref_frame,
+                        s_coords=self.s_coords,
+                        s_epoch=self.s_epoch,
+                        s_vd=self.s_vd,
+                        t_coords=self.t_coords,
+                        t_vd=self.t_vd,
+                        epoch_shift_grid=self.epoch_shift_grid,
+                    )
+                ]
+            return [
                 _ToNAD83(
                     s_ref_frame=self.s_ref_frame,
                     s_coords=self.s_coords,
@@ -274,6 +578,7 @@ class CSRSTransformer:
                     t_epoch=self.t_epoch,
                     t_vd=VerticalDatum.GRS80,
                     epoch_shift_grid=self.epoch_shift_grid,
+                    variable_epochs=variable_epochs,
                 ),
                 _FromNAD83(
                     t_ref_frame=self.t_ref_frame,
@@ -287,29 +592,275 @@ class CSRSTransformer:
                 ),
             ]
 
-        elif self.is_nad83(s_ref_frame) and self.is_nad83(t_ref_frame):
-            self.transformers = [
-                _FromNAD83(
-                    t_ref_frame=Reference.ITRF14,
-                    t_coords=self.t_coords,
-                    t_epoch=self.t_epoch,
-                    t_vd=self.t_vd,
-                    s_coords=self.s_coords,
-                    s_epoch=self.s_epoch,
-                    s_vd=self.s_vd,
-                    epoch_shift_grid=self.epoch_shift_grid,
-                ),
-                _ToNAD83(
-                    s_ref_frame=Reference.ITRF14,
-                    s_coords=self.t_coords,
-                    s_epoch=self.t_epoch,
-                    s_vd=self.t_vd,
-                    t_coords=self.t_coords,
-                    t_epoch=self.t_epoch,
-                    t_vd=self.t_vd,
-                    epoch_shift_grid=self.epoch_shift_grid,
-                ),
-            ]
+        # Both reference frames are NAD83(CSRS)
+        return [
+            _NAD83ToNAD83(
+                s_coords=self.s_coords,
+                s_epoch=self.s_epoch,
+                s_vd=self.s_vd,
+                t_coords=self.t_coords,
+                t_epoch=self.t_epoch,
+                t_vd=self.t_vd,
+                epoch_shift_grid=self.epoch_shift_grid,
+                variable_epochs=variable_epochs,
+            ),
+        ]
+
+    @property
+    def config(self) -> dict[str, Any]:
+        """The constructor arguments needed to recreate this transformer.
+
+        Returns:
+            dict: Keyword arguments for `CSRSTransformer`.
+
+        """
+        return {
+            "s_ref_frame": self.s_ref_frame,
+            "s_coords": self.s_coords,
+            "s_epoch": self.s_epoch,
+            "s_vd": self.s_vd,
+            "t_ref_frame": self.t_ref_frame,
+            "t_coords": self.t_coords,
+            "t_epoch": self.t_epoch,
+            "t_vd": self.t_vd,
+            "epoch_shift_grid": self.epoch_shift_grid,
+            "grid_engine": self.grid_engine,
+        }
+
+    @property
+    def proj_str(self) -> str:
+        """The PROJ pipeline string that fuses every transformation stage.
+
+        Returns:
+            str: A single PROJ pipeline equivalent to applying each of the
+                transformers in turn.
+
+        """
+        return self._fuse(self.transformers)
+
+    def _pipeline_from_str(self, proj_str: str) -> Transformer | GridPipeline:
+        if self.grid_engine == GridEngine.NUMPY:
+            return GridPipeline(proj_str)
+        return transformer_from_pipeline(proj_str)
+
+    @cached_property
+    def variable_epoch_pipeline(self) -> Transformer | GridPipeline:
+        """The fused pipeline used for coordinates with per-point source epochs.
+
+        Unlike `pipeline`, this always includes the epoch shift, so that each point is
+        shifted from the epoch of its own time coordinate to `t_epoch`.
+
+        Returns:
+            Transformer | GridPipeline: The fused transformation pipeline.
+
+        """
+        return self._pipeline_from_str(
+            self._fuse(self._build_transformers(variable_epochs=True))
+        )
+
+    def _profiled(self, transformers: list[_ToNAD83]) -> ProfiledPipeline:
+        """Build a pipeline that applies and times each stage of the transformers."""
+        stages = []
+        for i, transformer in enumerate(transformers):
+            for j, steps in enumerate(transformer.stage_steps):
+                if i > 0 and j == 0:
+                    # Each transformer starts from its own input epoch
+                    steps.insert(0, f"+proj=set +v_4={transformer.input_epoch}")
+                proj_str = _pipeline(steps)
+                stats = StageStats(i, j, stage_name(steps), proj_str)
+                stages.append((stats, self._pipeline_from_str(proj_str)))
+        return ProfiledPipeline(stages)
+
+    @cached_property
+    def _profiled_pipeline(self) -> ProfiledPipeline:
+        return self._profiled(self.transformers)
+
+    @cached_property
+    def _variable_epoch_profiled_pipeline(self) -> ProfiledPipeline:
+        return self._profiled(self._build_transformers(variable_epochs=True))
+
+    def _active_pipeline(
+        self, *, variable_epochs: bool
+    ) -> Transformer | GridPipeline | ProfiledPipeline:
+        """Get the pipeline that transforms points, depending on the profile mode."""
+        if variable_epochs:
+            if self.profile:
+                return self._variable_epoch_profiled_pipeline
+            return self.variable_epoch_pipeline
+        return self._profiled_pipeline if self.profile else self.pipeline
+
+    def stage_stats(self, *, variable_epochs: bool = False) -> list[StageStats]:
+        """Get the PROJ string and measured cost of each transformation stage.
+
+        Costs are only recorded while `profile` is True.
+
+        Args:
+            variable_epochs: If True, get the stages used for coordinates with
+                per-point source epochs.
+
+        Returns:
+            list[StageStats]: The statistics of each stage, in the order the stages
+                are applied.
+
+        """
+        if variable_epochs:
+            return self._variable_epoch_profiled_pipeline.stats
+        return self._profiled_pipeline.stats
+
+    def reset_profile(self) -> None:
+        """Reset the measured cost of every transformation stage."""
+        self._profiled_pipeline.reset()
+        if "_variable_epoch_profiled_pipeline" in self.__dict__:
+            self._variable_epoch_profiled_pipeline.reset()
+
+    def explain(
+        self, *, variable_epochs: bool = False, file: TextIO | None = None
+    ) -> None:
+        """Print the stages of the transformation with their PROJ strings and cost.
+
+        Args:
+            variable_epochs: If True, explain the stages used for coordinates with
+                per-point source epochs.
+            file: The stream to print to. Defaults to stdout.
+
+        """
+        transformers = (
+            self._build_transformers(variable_epochs=True)
+            if variable_epochs
+            else self.transformers
+        )
+        labels = [type(t).__name__.lstrip("_") for t in transformers]
+        header = (
+            f"{self.s_ref_frame} {self.s_coords} {self.s_epoch} {self.s_vd} -> "
+            f"{self.t_ref_frame} {self.t_coords} {self.t_epoch} {self.t_vd} "
+            f"(grid engine: {self.grid_engine.value}, profile: {self.profile})"
+        )
+        stats = self.stage_stats(variable_epochs=variable_epochs)
+        print(header, format_stages(stats, labels), sep="\n", file=file or sys.stdout)
+
+    def grid_files(self, *, variable_epochs: bool = False) -> list[str]:
+        """Get the names of the grid files used by the transformation.
+
+        Args:
+            variable_epochs: If True, get the grids used for coordinates with
+                per-point source epochs.
+
+        Returns:
+            list[str]: The grid file names, in the order they are used.
+
+        """
+        return list(self._grid_steps(variable_epochs=variable_epochs))
+
+    def _grid_steps(self, *, variable_epochs: bool) -> dict[str, str]:
+        """Map each grid file name to the PROJ operation that uses it."""
+        transformers = (
+            self._build_transformers(variable_epochs=True)
+            if variable_epochs
+            else self.transformers
+        )
+        grids = {}
+        for transformer in transformers:
+            for step in transformer.steps:
+                match = re.search(r"proj=(\w+).*\bgrids=(\S+)", step)
+                if match is None:
+                    continue
+                for name in match.group(2).split(","):
+                    # Optional grids are prefixed with @
+                    grids.setdefault(name.removeprefix("@"), match.group(1))
+        return grids
+
+    def warmup(self, *, variable_epochs: bool = False) -> WarmupReport:
+        """Load the grids of the transformation before the first transformation.
+
+        PROJ reads the tiles of grid files lazily, when the first point that falls
+        in them is transformed, which makes the first transformations of a new
+        transformer slow. This loads each grid the transformation uses and then
+        transforms a lattice of probe points that covers the grids through the
+        transformation pipeline, so that later transformations are fast.
+
+        Args:
+            variable_epochs: If True, warm up the pipeline used for coordinates with
+                per-point source epochs.
+
+        Returns:
+            WarmupReport: The time taken to load each grid and transform the probe
+                points.
+
+        Raises:
+            FileNotFoundError: If a grid file is missing.
+
+        """
+        grids = self._grid_steps(variable_epochs=variable_epochs)
+        # Check every grid before loading any of them, to fail fast
+        for name in grids:
+            find_grid_file(name)
+
+        lon, lat = self._probe_lattice()
+        timings = {}
+        for name, operation in grids.items():
+            start = time.perf_counter()
+            self._load_grid(name, operation, lon, lat)
+            timings[name] = time.perf_counter() - start
+
+        to_source = transformer_from_pipeline(
+            _ToNAD83._coord_type_to_proj4(self.s_coords)  # noqa: SLF001
+        )
+        x, y, z = to_source.transform(lon, lat, np.zeros_like(lon))
+        epoch = self.transformers[0].input_epoch if variable_epochs else None
+        start = time.perf_counter()
+        self.transform_arrays(x, y, z, epoch=epoch, inplace=True)
+        probe = time.perf_counter() - start
+        return WarmupReport(grids=timings, probe_points=lon.size, probe=probe)
+
+    def _probe_lattice(self) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """Get probe points that cover the grids, in the zone of UTM coordinates."""
+        west, south, east, north = WARMUP_EXTENT
+        s_coords = CoordType(self.s_coords)
+        if s_coords not in {CoordType.GEOG, CoordType.CART}:
+            meridian = 6 * int(s_coords.value[3:]) - 183
+            west, east = max(west, meridian - 3), min(east, meridian + 3)
+            west, east = (west, east) if west <= east else (meridian, meridian)
+        lon, lat = np.meshgrid(
+            np.arange(west, east + WARMUP_SPACING / 2, WARMUP_SPACING),
+            np.arange(south, north + WARMUP_SPACING / 2, WARMUP_SPACING),
+        )
+        return lon.ravel(), lat.ravel()
+
+    def _load_grid(
+        self,
+        name: str,
+        operation: str,
+        lon: NDArray[np.float64],
+        lat: NDArray[np.float64],
+    ) -> None:
+        """Load a grid file, reading every tile that contains a probe point."""
+        if self.grid_engine == GridEngine.NUMPY:
+            load_grids(name)
+            return
+
+        from pyproj import Transformer  # noqa: PLC0415
+
+        h = np.zeros_like(lon)
+        if operation == "deformation":
+            proj_str = (
+                "+proj=pipeline +step +proj=cart +ellps=GRS80 "
+                f"+step +proj=deformation +t_epoch=2010 +grids={name}"
+            )
+            t = np.full_like(lon, 2011.0)
+            Transformer.from_pipeline(proj_str).transform(lon, lat, h, t)
+        else:
+            proj_str = f"+proj={operation} +grids={name} +multiplier=1"
+            Transformer.from_pipeline(proj_str).transform(lon, lat, h)
+
+    @staticmethod
+    def _fuse(transformers: list[_ToNAD83]) -> str:
+        steps = []
+        for i, transformer in enumerate(transformers):
+            if i > 0:
+                # Each transformer starts from its own input epoch
+                steps.append(f"+proj=set +v_4={transformer.input_epoch}")
+            steps.extend(transformer.steps)
+        return _pipeline(steps)
 
     @staticmethod
     def is_nad83(ref_frame: Reference) -> bool:
@@ -385,7 +936,604 @@ class CSRSTransformer:
             A list of transformed 3D coordinates
 
         """
-        for transformer in self.transformers:
-            coords = transformer(coords)
+        epoch = self.transformers[0].input_epoch
+        coords = ((c[0], c[1], c[2], epoch) for c in coords)
+        coords = self._active_pipeline(variable_epochs=False).itransform(coords)
+        return ((c[0], c[1], c[2]) for c in coords)
+
+    def transform_arrays(
+        self,
+        x: ArrayLike,
+        y: ArrayLike,
+        z: ArrayLike,
+        *,
+        epoch: ArrayLike | None = None,
+        inplace: bool = False,
+        out: T_Arrays3D | None = None,
+    ) -> T_Arrays3D:
+        """Transform arrays of coordinates in a vectorized manner.
+
+        This is equivalent to `__call__`, but avoids the per-point Python overhead by
+        passing whole NumPy arrays through the fused transformation pipeline.
+
+        Args:
+            x: The source x coordinates (longitude, easting or ECEF X).
+            y: The source y coordinates (latitude, northing or ECEF Y).
+            z: The source z coordinates (height or ECEF Z).
+            epoch: Optional per-point source epochs, as decimal years or
+                `numpy.datetime64` values, broadcastable to the shape of the
+                coordinates. Each point is transformed from its own epoch instead
+                of `s_epoch`.
+            inplace: If True, the transformed coordinates are written into `x`, `y`,
+                and `z`, which must be C-contiguous float64 NumPy arrays.
+            out: Optional C-contiguous float64 (x, y, z) arrays with the same shape
+                as the input to write the transformed coordinates into.
+
+        Returns:
+            The transformed x, y, and z coordinates as float64 arrays. These are the
+            input arrays if `inplace` is True, or the `out` arrays if given.
+
+        Raises:
+            ValueError: If the input arrays do not have the same shape, cannot be
+                used as output buffers, or `epoch` cannot be broadcast to their shape.
+
+        """
+        result = self._output_arrays(x, y, z, inplace=inplace, out=out)
+        # Flat views, so that 0-d arrays are also transformed in place
+        x, y, z = (c.reshape(-1) for c in result)
+        pipeline, t = self._time_coords(x.shape, epoch)
+        pipeline.transform(x, y, z, t, inplace=True)
+        return result
+
+    def transform_parallel(
+        self,
+        x: ArrayLike,
+        y: ArrayLike,
+        z: ArrayLike,
+        *,
+        epoch: ArrayLike | None = None,
+        workers: int | None = None,
+        chunk_size: int | None = None,
+        inplace: bool = False,
+        out: T_Arrays3D | None = None,
+    ) -> T_Arrays3D:
+        """Transform arrays of coordinates using a pool of worker threads.
+
+        The arrays are split into chunks that are transformed concurrently. PROJ
+        releases the GIL while transforming, and pyproj gives each thread its own
+        copy of the underlying PROJ transformation, so the work scales across cores.
+
+        Args:
+            x: The source x coordinates (longitude, easting or ECEF X).
+            y: The source y coordinates (latitude, northing or ECEF Y).
+            z: The source z coordinates (height or ECEF Z).
+            epoch: Optional per-point source epochs, as decimal years or
+                `numpy.datetime64` values, broadcastable to the shape of the
+                coordinates. Each point is transformed from its own epoch instead
+                of `s_epoch`.
+            workers: The number of worker threads. Defaults to the number of CPUs.
+            chunk_size: The number of points transformed per task. Defaults to
+                splitting the points evenly between the workers.
+            inplace: If True, the transformed coordinates are written into `x`, `y`,
+                and `z`, which must be C-contiguous float64 NumPy arrays.
+            out: Optional C-contiguous float64 (x, y, z) arrays with the same shape
+                as the input to write the transformed coordinates into.
+
+        Returns:
+            The transformed x, y, and z coordinates as float64 arrays. These are the
+            input arrays if `inplace` is True, or the `out` arrays if given.
+
+        Raises:
+            ValueError: If the input arrays do not have the same shape or cannot be
+                used as output buffers, if `epoch` cannot be broadcast to their shape,
+                or if workers or chunk_size are not positive.
+
+        """
+        workers = workers if workers is not None else os.cpu_count() or 1
+        if workers < 1:
+            msg = "workers must be a positive integer."
+            raise ValueError(msg)
+
+        result = self._output_arrays(x, y, z, inplace=inplace, out=out)
+        # Flat views of the output arrays that each chunk is transformed into
+        x, y, z = (c.reshape(-1) for c in result)
+        pipeline, t = self._time_coords(x.shape, epoch)
+
+        if chunk_size is None:
+            chunk_size = max(1, -(-x.size // workers))
+        if chunk_size < 1:
+            msg = "chunk_size must be a positive integer."
+            raise ValueError(msg)
+
+        def transform_chunk(start: int) -> None:
+            chunk = slice(start, start + chunk_size)
+            pipeline.transform(x[chunk], y[chunk], z[chunk], t[chunk], inplace=True)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Consume the results to propagate any exceptions
+            list(executor.map(transform_chunk, range(0, x.size, chunk_size)))
+
+        return result
+
+    def transform_chunks(
+        self,
+        chunks: Iterable[tuple[ArrayLike, ...]],
+        *,
+        workers: int | None = None,
+        max_block: int | None = None,
+    ) -> Iterator[T_Arrays3D]:
+        """Transform a stream of coordinate array blocks.
+
+        Blocks are read from `chunks` lazily and yielded in order as soon as they are
+        transformed, so only one block is held in memory at a time. This allows
+        datasets larger than memory to be transformed at vectorized speed, e.g. by
+        passing a generator that reads blocks from a file.
+
+        Args:
+            chunks: An iterable of (x, y, z) coordinate array blocks, or of
+                (x, y, z, epoch) blocks with per-point source epochs.
+            workers: If given, each block is transformed with `transform_parallel`
+                using this many threads.
+            max_block: If given, blocks with more points are flattened and split
+                into consecutive blocks of at most this many points, which are
+                transformed and yielded in turn. This bounds the memory used for
+                output arrays, whatever the size of the input blocks.
+
+        Yields:
+            The transformed (x, y, z) float64 arrays of each block.
+
+        Raises:
+            ValueError: If the arrays of a block do not have the same shape, or
+                max_block is not positive.
+
+        """
+        if max_block is not None and max_block < 1:
+            msg = "max_block must be a positive integer."
+            raise ValueError(msg)
+
+        for x, y, z, *epoch in chunks:
+            t = epoch[0] if epoch else None
+            for bx, by, bz, bt in self._split_block(x, y, z, t, max_block):
+                if workers is None:
+                    yield self.transform_arrays(bx, by, bz, epoch=bt)
+                else:
+                    yield self.transform_parallel(bx, by, bz, epoch=bt, workers=workers)
+
+    @staticmethod
+    def _split_block(
+        x: ArrayLike,
+        y: ArrayLike,
+        z: ArrayLike,
+        epoch: ArrayLike | None,
+        max_block: int | None,
+    ) -> Iterator[tuple[ArrayLike, ...]]:
+        """Split a block of coordinates into flat blocks of at most max_block points."""
+        x, y, z = (np.asarray(c) for c in (x, y, z))
+        if max_block is None or x.size <= max_block:
+            yield x, y, z, epoch
+            return
+
+        if not x.shape == y.shape == z.shape:
+            msg = "x, y, and z must have the same shape."
+            raise ValueError(msg)
+        if epoch is not None and np.ndim(epoch) > 0:
+            try:
+                epoch = np.broadcast_to(epoch, x.shape).reshape(-1)
+            except ValueError:
+                msg = "epoch must be broadcastable to the shape of the coordinates."
+                raise ValueError(msg) from None
+
+        x, y, z = (c.reshape(-1) for c in (x, y, z))
+        for start in range(0, x.size, max_block):
+            block = slice(start, start + max_block)
+            t = epoch[block] if np.ndim(epoch) > 0 else epoch
+            yield x[block], y[block], z[block], t
+
+    def transform_structured(
+        self,
+        points: NDArray[np.void],
+        fields: Sequence[str] = ("x", "y", "z"),
+        *,
+        time_field: str | None = None,
+        chunk_size: int = STRUCTURED_CHUNK_SIZE,
+    ) -> NDArray[np.void]:
+        """Transform the coordinate fields of a structured or record array in place.
+
+        The fields are strided views into the records, so windows of `chunk_size`
+        points are gathered into reused contiguous buffers, transformed, and written
+        back. The other fields of the records are neither read nor copied.
+
+        Args:
+            points: A writeable NumPy structured array or record array.
+            fields: The names of the x, y, and z fields, which must have a floating
+                point type.
+            time_field: Optional name of a field with per-point source epochs, as
+                decimal years or `numpy.datetime64` values. Each point is
+                transformed from its own epoch instead of `s_epoch`. The field is
+                not modified.
+            chunk_size: The number of points transformed at a time.
+
+        Returns:
+            The `points` array, with its coordinate fields transformed.
+
+        Raises:
+            ValueError: If `points` is not a writeable structured array, a field is
+                missing or has an unsupported type, or chunk_size is not positive.
+
+        """
+        self._check_structured(points, fields, time_field)
+        if chunk_size < 1:
+            msg = "chunk_size must be a positive integer."
+            raise ValueError(msg)
+
+        # A view of the records as a single axis, without copying them
+        flat = points.reshape(-1)
+        if not np.may_share_memory(flat, points):
+            msg = "points must be an array that can be flattened without a copy."
+            raise ValueError(msg)
+        columns = [flat[name] for name in fields]
+        times = None if time_field is None else flat[time_field]
+
+        pipeline = self._active_pipeline(variable_epochs=times is not None)
+        n = flat.size
+        # Buffers reused by every window for the x, y, z and time coordinates
+        buffers = np.empty((4, min(chunk_size, n)), dtype=np.float64)
+
+        for start in range(0, n, chunk_size):
+            window = slice(start, start + chunk_size)
+            x, y, z, t = buffers[:, : min(chunk_size, n - start)]
+            for column, buffer in zip(columns, (x, y, z)):
+                np.copyto(buffer, column[window])
+            # The pipeline sets t to the target epoch, so it is refilled every window
+            if times is None:
+                t.fill(self.transformers[0].input_epoch)
+            else:
+                epoch = times[window]
+                if np.issubdtype(epoch.dtype, np.datetime64):
+                    epoch = datetime64_to_decimal_year(epoch)
+                np.copyto(t, epoch)
+
+            pipeline.transform(x, y, z, t, inplace=True)
+            for column, buffer in zip(columns, (x, y, z)):
+                np.copyto(column[window], buffer, casting="same_kind")
+        return points
+
+    @staticmethod
+    def _check_structured(
+        points: NDArray[np.void], fields: Sequence[str], time_field: str | None
+    ) -> None:
+        if not (isinstance(points, np.ndarray) and points.dtype.names is not None):
+            msg = "points must be a NumPy structured array."
+            raise ValueError(msg)
+        if not points.flags.writeable:
+            msg = "points must be writeable."
+            raise ValueError(msg)
+        if len(fields) != 3:  # noqa: PLR2004
+            msg = "fields must name the x, y, and z fields."
+            raise ValueError(msg)
+
+        names = [*fields, *([] if time_field is None else [time_field])]
+        missing = [name for name in names if name not in points.dtype.names]
+        if missing:
+            msg = f"points has no fields named {', '.join(missing)}."
+            raise ValueError(msg)
+        for name in fields:
+            if not np.issubdtype(points.dtype[name], np.floating):
+                msg = f"Field {name} must have a floating point type."
+                raise ValueError(msg)
+        if time_field is not None and not any(
+            np.issubdtype(points.dtype[time_field], kind)
+            for kind in (np.floating, np.integer, np.datetime64)
+        ):
+            msg = f"Field {time_field} must be a number or numpy.datetime64."
+            raise ValueError(msg)
+
+    async def atransform(
+        self,
+        x: ArrayLike,
+        y: ArrayLike,
+        z: ArrayLike,
+        *,
+        epoch: ArrayLike | None = None,
+        chunk_size: int = ASYNC_CHUNK_SIZE,
+        executor: Executor | None = None,
+        inplace: bool = False,
+        out: T_Arrays3D | None = None,
+    ) -> T_Arrays3D:
+        """Transform arrays of coordinates without blocking the asyncio event loop.
+
+        The arrays are split into chunks that are transformed on the threads of an
+        executor, so the event loop keeps serving other tasks, such as network I/O,
+        in the meantime. pyproj gives each worker thread its own copy of the PROJ
+        transformations, so the chunks are transformed concurrently.
+
+        If the awaiting task is cancelled, chunks that have not started are
+        cancelled and the chunks being transformed are left to finish. The output
+        arrays are then partially transformed.
+
+        Args:
+            x: The source x coordinates (longitude, easting or ECEF X).
+            y: The source y coordinates (latitude, northing or ECEF Y).
+            z: The source z coordinates (height or ECEF Z).
+            epoch: Optional per-point source epochs, as decimal years or
+                `numpy.datetime64` values, broadcastable to the shape of the
+                coordinates. Each point is transformed from its own epoch instead
+                of `s_epoch`.
+            chunk_size: The number of points transformed per task.
+            executor: The executor to transform the chunks on. Defaults to a thread
+                pool shared by all transformers, with one thread per CPU.
+            inplace: If True, the transformed coordinates are written into `x`, `y`,
+                and `z`, which must be C-contiguous float64 NumPy arrays.
+            out: Optional C-contiguous float64 (x, y, z) arrays with the same shape
+                as the input to write the transformed coordinates into.
+
+        Returns:
+            The transformed x, y, and z coordinates as float64 arrays. These are the
+            input arrays if `inplace` is True, or the `out` arrays if given.
+
+        Raises:
+            ValueError: If the input arrays do not have the same shape or cannot be
+                used as output buffers, if `epoch` cannot be broadcast to their shape,
+                or if chunk_size is not positive.
+
+        """
+        import asyncio  # noqa: PLC0415
+
+        if chunk_size < 1:
+            msg = "chunk_size must be a positive integer."
+            raise ValueError(msg)
+
+        result = self._output_arrays(x, y, z, inplace=inplace, out=out)
+        # Flat views of the output arrays that each chunk is transformed into
+        x, y, z = (c.reshape(-1) for c in result)
+        pipeline, t = self._time_coords(x.shape, epoch)
+
+        def transform_chunk(start: int) -> None:
+            chunk = slice(start, start + chunk_size)
+            pipeline.transform(x[chunk], y[chunk], z[chunk], t[chunk], inplace=True)
+
+        loop = asyncio.get_running_loop()
+        executor = executor if executor is not None else _async_executor()
+        # Cancelling the gathered futures cancels the chunks that have not started
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(executor, transform_chunk, start)
+                for start in range(0, x.size, chunk_size)
+            )
+        )
+        return result
+
+    async def atransform_chunks(
+        self,
+        chunks: Iterable[tuple[ArrayLike, ...]] | AsyncIterable[tuple[ArrayLike, ...]],
+        *,
+        prefetch: int = 2,
+        executor: Executor | None = None,
+    ) -> AsyncIterator[T_Arrays3D]:
+        """Transform a stream of coordinate array blocks without blocking the loop.
+
+        This is the asyncio counterpart of `transform_chunks`. Up to `prefetch`
+        blocks are transformed on the executor while the previous results are
+        consumed, so reading and writing blocks can overlap with their
+        transformation. Blocks are yielded in order.
+
+        Blocks from a synchronous iterable are also read on the executor, so that
+        slow sources, such as file readers, do not block the event loop. If the
+        iteration is cancelled or stopped early, the blocks that have not started
+        are cancelled.
+
+        Args:
+            chunks: An iterable or async iterable of (x, y, z) coordinate array
+                blocks, or of (x, y, z, epoch) blocks with per-point source epochs.
+            prefetch: The largest number of blocks transformed at once.
+            executor: The executor to transform the blocks on. Defaults to a thread
+                pool shared by all transformers, with one thread per CPU.
+
+        Yields:
+            The transformed (x, y, z) float64 arrays of each block.
+
+        Raises:
+            ValueError: If the arrays of a block do not have the same shape, or if
+                prefetch is not positive.
+
+        """
+        import asyncio  # noqa: PLC0415
+
+        if prefetch < 1:
+            msg = "prefetch must be a positive integer."
+            raise ValueError(msg)
+
+        loop = asyncio.get_running_loop()
+        executor = executor if executor is not None else _async_executor()
+        pending: list[asyncio.Future[T_Arrays3D]] = []
+        try:
+            async for x, y, z, *epoch in _aiter_blocks(chunks, executor):
+                t = epoch[0] if epoch else None
+                transform = partial(self.transform_arrays, x, y, z, epoch=t)
+                pending.append(loop.run_in_executor(executor, transform))
+                if len(pending) >= prefetch:
+                    yield await pending.pop(0)
+            while pending:
+                yield await pending.pop(0)
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def _time_coords(
+        self, shape: tuple[int, ...], epoch: ArrayLike | None
+    ) -> tuple[Transformer | GridPipeline | ProfiledPipeline, NDArray[np.float64]]:
+        """Get the pipeline and the time coordinates of the points to transform."""
+        if epoch is None:
+            t = np.full(shape, self.transformers[0].input_epoch, dtype=np.float64)
+            return self._active_pipeline(variable_epochs=False), t
+
+        epoch = np.asarray(epoch)
+        if np.issubdtype(epoch.dtype, np.datetime64):
+            epoch = datetime64_to_decimal_year(epoch)
+        try:
+            t = np.array(np.broadcast_to(epoch, shape), dtype=np.float64)
+        except ValueError:
+            msg = "epoch must be broadcastable to the shape of the coordinates."
+            raise ValueError(msg) from None
+        return self._active_pipeline(variable_epochs=True), t
+
+    @classmethod
+    def _output_arrays(
+        cls,
+        x: ArrayLike,
+        y: ArrayLike,
+        z: ArrayLike,
+        *,
+        inplace: bool,
+        out: T_Arrays3D | None,
+    ) -> T_Arrays3D:
+        """Get the arrays that transformed coordinates are written into in place."""
+        if inplace and out is not None:
+            msg = "inplace and out cannot be used together."
+            raise ValueError(msg)
+
+        if inplace:
+            for c in (x, y, z):
+                cls._check_buffer(c)
+            return cls._as_arrays(x, y, z)
+
+        x, y, z = cls._as_arrays(x, y, z)
+        if out is None:
+            return x.copy(order="C"), y.copy(order="C"), z.copy(order="C")
+
+        for c, o in zip((x, y, z), out):
+            cls._check_buffer(o)
+            if o.shape != c.shape:
+                msg = "out arrays must have the same shape as the input arrays."
+                raise ValueError(msg)
+            np.copyto(o, c)
+        return tuple(out)
+
+    @staticmethod
+    def _check_buffer(arr: ArrayLike) -> None:
+        if not (
+            isinstance(arr, np.ndarray)
+            and arr.dtype == np.float64
+            and arr.flags.c_contiguous
+            and arr.flags.writeable
+        ):
+            msg = "Output arrays must be writeable, C-contiguous float64 NumPy arrays."
+            raise ValueError(msg)
+
+    @staticmethod
+    def _as_arrays(x: ArrayLike, y: ArrayLike, z: ArrayLike) -> T_Arrays3D:
+        x, y, z = (np.asarray(c, dtype=np.float64) for c in (x, y, z))
+        if not x.shape == y.shape == z.shape:
+            msg = "x, y, and z must have the same shape."
+            raise ValueError(msg)
+        return x, y, z
+
+
+@cache
+def _async_executor() -> ThreadPoolExecutor:
+    """Get the thread pool shared by the asyncio methods of all transformers."""
+    return ThreadPoolExecutor(thread_name_prefix="csrspy")
+
+
+async def _aiter_blocks(
+    chunks: Iterable[tuple[ArrayLike, ...]] | AsyncIterable[tuple[ArrayLike, ...]],
+    executor: Executor,
+) -> AsyncIterator[tuple[ArrayLike, ...]]:
+    """Iterate over blocks, reading synchronous iterables on the executor."""
+    import asyncio  # noqa: PLC0415
+
+    if hasattr(chunks, "__aiter__"):
+        async for block in chunks:
+            yield block
+        return
+
+    loop = asyncio.get_running_loop()
+    iterator = iter(chunks)
+    done = object()
+    while (
+        block := await loop.run_in_executor(executor, next, iterator, done)
+    ) is not done:
+        yield block
+
+
+@lru_cache(maxsize=128)
+def _cached_transformer(
+    *,
+    s_ref_frame: Reference,
+    s_coords: CoordType,
+    s_epoch: float,
+    s_vd: VerticalDatum | None,
+    t_ref_frame: Reference,
+    t_coords: CoordType | None,
+    t_epoch: float | None,
+    t_vd: VerticalDatum | None,
+    epoch_shift_grid: str,
+    grid_engine: GridEngine,
+) -> CSRSTransformer:
+    return CSRSTransformer(
+        s_ref_frame=s_ref_frame,
+        s_coords=s_coords,
+        s_epoch=s_epoch,
+        s_vd=s_vd,
+        t_ref_frame=t_ref_frame,
+        t_coords=t_coords,
+        t_epoch=t_epoch,
+        t_vd=t_vd,
+        epoch_shift_grid=epoch_shift_grid,
+        grid_engine=grid_engine,
+    )
+
+
+def get_transformer(
+    *,
+    s_ref_frame: Reference | str,
+    s_coords: str | CoordType,
+    s_epoch: float,
+    s_vd: VerticalDatum | str | None = None,
+    t_ref_frame: Reference | str,
+    t_coords: str | CoordType | None = None,
+    t_epoch: float | None = None,
+    t_vd: VerticalDatum | str | None = None,
+    epoch_shift_grid: str = "ca_nrc_NAD83v70VG.tif",
+    grid_engine: GridEngine | str = GridEngine.PROJ,
+) -> CSRSTransformer:
+    """Get a CSRSTransformer from a process-wide LRU cache.
+
+    Transformers are keyed on their constructor arguments, so repeated requests for
+    the same configuration return the same instance instead of building a new one.
+    See `CSRSTransformer` for a description of the arguments.
+
+    Returns:
+        CSRSTransformer: A shared transformer for the given configuration.
+
+    Raises:
+        ValueError: If the reference frame and vertical datum are incompatible.
+
+    """
+    return _cached_transformer(
+        s_ref_frame=Reference(s_ref_frame),
+        s_coords=CoordType(s_coords),
+        s_epoch=s_epoch,
+        s_vd=None if s_vd is None else VerticalDatum(s_vd),
+        t_ref_frame=Reference(t_ref_frame),
+        t_coords=None if t_coords is None else CoordType(t_coords),
+        t_epoch=t_epoch,
+        t_vd=None if t_vd is None else VerticalDatum(t_vd),
+        epoch_shift_grid=epoch_shift_grid,
+        grid_engine=GridEngine(grid_engine),
+    )
+
+
+def transformer_cache_info() -> CacheInfo:
+    """Get the hit and miss statistics of the `get_transformer` cache.
+
+    Returns:
+        CacheInfo: A named tuple with hits, misses, maxsize and currsize fields.
+
+    """
+    return _cached_transformer.cache_info()
+
 
-        return coords
+def clear_transformer_cache() -> None:
+    """Clear the `get_transformer` cache and reset its statistics."""
+    _cached_transformer.cache_clear()
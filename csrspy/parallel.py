@@ -0,0 +1,191 @@
+"""Multi-process execution of coordinate transformations.
+
+This module provides a process pool that transforms coordinate arrays held in
+shared memory. Each worker process builds its own `CSRSTransformer` once from the
+transformer configuration, and only chunk offsets are sent between processes.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from csrspy.main import CSRSTransformer
+
+if TYPE_CHECKING:
+    from multiprocessing.context import BaseContext
+    from types import TracebackType
+
+    from numpy.typing import ArrayLike
+    from typing_extensions import Self
+
+    from csrspy.main import T_Arrays3D
+
+# The transformer of the current worker process
+_worker_transformer: CSRSTransformer | None = None
+
+
+def _init_worker(config: dict[str, Any]) -> None:
+    global _worker_transformer  # noqa: PLW0603
+    _worker_transformer = CSRSTransformer(**config)
+
+
+def _attach(name: str) -> SharedMemory:
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, track=False)
+    # Workers share the resource tracker of the parent process, where the block is
+    # already registered, so attaching does not take over its cleanup
+    return SharedMemory(name=name)
+
+
+def _transform_chunk(
+    name: str, size: int, start: int, stop: int, *, variable_epochs: bool = False
+) -> None:
+    shm = _attach(name)
+    try:
+        buf = np.ndarray((4, size), dtype=np.float64, buffer=shm.buf)
+        x, y, z, t = buf[:, start:stop]
+        if variable_epochs:
+            pipeline = _worker_transformer.variable_epoch_pipeline
+        else:
+            pipeline = _worker_transformer.pipeline
+        pipeline.transform(x, y, z, t, inplace=True)
+        del buf, x, y, z, t
+    finally:
+        shm.close()
+
+
+class ProcessPoolTransformer:
+    """Transform coordinate arrays using a pool of worker processes.
+
+    Coordinates are copied into a shared memory block that every worker transforms
+    in place, so no coordinate data is pickled. The pool is kept alive between
+    calls until `close` is called, or the context manager exits.
+
+    Args:
+        transformer: The transformer whose configuration the workers use.
+        workers: The number of worker processes. Defaults to the number of CPUs.
+        mp_context: The multiprocessing context used to start the workers.
+
+    Usage:
+        with ProcessPoolTransformer(transformer, workers=8) as pool:
+            x, y, z = pool.transform_arrays(x, y, z)
+
+    """
+
+    def __init__(
+        self,
+        transformer: CSRSTransformer,
+        workers: int | None = None,
+        mp_context: BaseContext | None = None,
+    ) -> None:
+        """Initialize the ProcessPoolTransformer.
+
+        Args:
+            transformer: The transformer whose configuration the workers use.
+            workers: The number of worker processes. Defaults to the number of CPUs.
+            mp_context: The multiprocessing context used to start the workers.
+
+        """
+        self.transformer = transformer
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=(transformer.config,),
+        )
+
+    def transform_arrays(
+        self,
+        x: ArrayLike,
+        y: ArrayLike,
+        z: ArrayLike,
+        *,
+        epoch: ArrayLike | None = None,
+        chunk_size: int | None = None,
+    ) -> T_Arrays3D:
+        """Transform arrays of coordinates in the worker processes.
+
+        Args:
+            x: The source x coordinates (longitude, easting or ECEF X).
+            y: The source y coordinates (latitude, northing or ECEF Y).
+            z: The source z coordinates (height or ECEF Z).
+            epoch: Optional per-point source epochs, as decimal years or
+                `numpy.datetime64` values. See `CSRSTransformer.transform_arrays`.
+            chunk_size: The number of points transformed per task. Defaults to
+                splitting the points evenly between the workers.
+
+        Returns:
+            The transformed x, y, and z coordinates as float64 arrays.
+
+        Raises:
+            ValueError: If the input arrays do not have the same shape, if `epoch`
+                cannot be broadcast to their shape, or if chunk_size is not positive.
+
+        """
+        x, y, z = (np.asarray(c, dtype=np.float64) for c in (x, y, z))
+        if not x.shape == y.shape == z.shape:
+            msg = "x, y, and z must have the same shape."
+            raise ValueError(msg)
+        shape, size = x.shape, x.size
+        if size == 0:
+            return x.copy(), y.copy(), z.copy()
+
+        if chunk_size is None:
+            chunk_size = -(-size // self.workers)
+        if chunk_size < 1:
+            msg = "chunk_size must be a positive integer."
+            raise ValueError(msg)
+        _, t = self.transformer._time_coords(shape, epoch)  # noqa: SLF001
+
+        shm = SharedMemory(create=True, size=4 * size * np.dtype(np.float64).itemsize)
+        try:
+            buf = np.ndarray((4, size), dtype=np.float64, buffer=shm.buf)
+            for row, c in zip(buf[:3], (x, y, z)):
+                row[:] = c.reshape(-1)
+            buf[3] = t.reshape(-1)
+
+            futures = [
+                self.executor.submit(
+                    _transform_chunk,
+                    shm.name,
+                    size,
+                    start,
+                    start + chunk_size,
+                    variable_epochs=epoch is not None,
+                )
+                for start in range(0, size, chunk_size)
+            ]
+            for future in futures:
+                future.result()
+
+            x, y, z = (row.reshape(shape).copy() for row in buf[:3])
+            del buf
+        finally:
+            shm.close()
+            shm.unlink()
+
+        return x, y, z
+
+    def close(self) -> None:
+        """Shut down the worker processes."""
+        self.executor.shutdown()
+
+    def __enter__(self) -> Self:
+        """Enter the runtime context."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        """Shut down the worker processes when exiting the runtime context."""
+        self.close()
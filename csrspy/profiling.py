@@ -0,0 +1,236 @@
+"""Per-stage profiling of transformation pipelines.
+
+A `ProfiledPipeline` applies the stages of a transformation one at a time instead of
+as a single fused pipeline, and records the wall time and number of points of each
+stage, so the cost of a transformation can be attributed to its Helmert, epoch
+shift, vertical grid shift and projection stages. A `WarmupReport` records the
+one-off cost of loading the grids of a transformation.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Union
+
+import numpy as np
+
+from csrspy.grids import itransform_chunks
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+
+    from numpy.typing import ArrayLike, NDArray
+    from pyproj import Transformer
+
+    from csrspy.grids import GridPipeline
+
+    T_Pipeline = Union[Transformer, GridPipeline]
+
+
+@dataclass
+class StageStats:
+    """The resolved PROJ string and measured cost of one transformation stage.
+
+    Attributes:
+        transformer (int): The index of the stage's transformer in
+            `CSRSTransformer.transformers`.
+        stage (int): The index of the stage within the transformer, in the order
+            the stages are applied.
+        name (str): The operations of the stage, e.g. "inv longlat, cart".
+        proj_str (str): The PROJ string of the stage.
+        calls (int): The number of times the stage was applied.
+        points (int): The total number of points the stage transformed.
+        seconds (float): The total wall time spent in the stage.
+
+    """
+
+    transformer: int
+    stage: int
+    name: str
+    proj_str: str
+    calls: int = 0
+    points: int = 0
+    seconds: float = 0.0
+
+    @property
+    def points_per_second(self) -> float:
+        """The mean throughput of the stage, or 0 if it has not been timed."""
+        return self.points / self.seconds if self.seconds > 0 else 0.0
+
+    def reset(self) -> None:
+        """Reset the measured cost of the stage."""
+        self.calls = 0
+        self.points = 0
+        self.seconds = 0.0
+
+
+@dataclass(frozen=True)
+class WarmupReport:
+    """The time taken to warm up a transformer.
+
+    Attributes:
+        grids (dict[str, float]): The seconds taken to load each grid file.
+        probe_points (int): The number of probe points transformed.
+        probe (float): The seconds taken to transform the probe points through the
+            warmed up pipeline.
+
+    """
+
+    grids: dict[str, float] = field(default_factory=dict)
+    probe_points: int = 0
+    probe: float = 0.0
+
+    @property
+    def total(self) -> float:
+        """The total time of the warmup in seconds."""
+        return sum(self.grids.values()) + self.probe
+
+    def __str__(self) -> str:
+        """Format the report with one line per grid."""
+        lines = [f"{name}: {seconds:.6f} s" for name, seconds in self.grids.items()]
+        lines.append(f"probe ({self.probe_points:,} points): {self.probe:.6f} s")
+        lines.append(f"Total: {self.total:.6f} s")
+        return "\n".join(lines)
+
+
+def stage_name(steps: Iterable[str]) -> str:
+    """Describe the operations of a sequence of PROJ steps.
+
+    Args:
+        steps: The PROJ steps.
+
+    Returns:
+        str: The operation of each step, prefixed with "inv" if it is inverted.
+
+    """
+    names = []
+    for step in steps:
+        match = re.search(r"proj=(\w+)", step)
+        operation = match.group(1) if match else step
+        inverse = re.match(r"\+?inv\b", step) is not None
+        names.append(f"inv {operation}" if inverse else operation)
+    return ", ".join(names)
+
+
+class ProfiledPipeline:
+    """A pipeline that applies its stages one at a time and times each of them.
+
+    This provides the same interface as the fused pipeline of `CSRSTransformer`, and
+    is safe to use from several threads at once.
+
+    Args:
+        stages: The stages to apply in turn, with the statistics to record them in.
+
+    """
+
+    def __init__(self, stages: Sequence[tuple[StageStats, T_Pipeline]]) -> None:
+        """Initialize the ProfiledPipeline."""
+        self.stages = list(stages)
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> list[StageStats]:
+        """The statistics of each stage, in the order the stages are applied."""
+        return [stats for stats, _ in self.stages]
+
+    def transform(
+        self,
+        xx: ArrayLike,
+        yy: ArrayLike,
+        zz: ArrayLike,
+        tt: ArrayLike,
+        *,
+        inplace: bool = False,
+    ) -> tuple[NDArray[np.float64], ...]:
+        """Transform arrays of coordinates, timing each stage.
+
+        Args:
+            xx: The x coordinates.
+            yy: The y coordinates.
+            zz: The z coordinates.
+            tt: The time coordinates.
+            inplace: If True, the coordinates are transformed in place when they are
+                C-contiguous, writeable float64 NumPy arrays.
+
+        Returns:
+            tuple: The transformed x, y, z and time coordinates.
+
+        """
+        coords = []
+        for c in (xx, yy, zz, tt):
+            if not (
+                inplace
+                and isinstance(c, np.ndarray)
+                and c.dtype == np.float64
+                and c.flags.c_contiguous
+                and c.flags.writeable
+            ):
+                c = np.array(c, dtype=np.float64)  # noqa: PLW2901
+            coords.append(c)
+
+        flat = [c.reshape(-1) for c in coords]
+        for stats, pipeline in self.stages:
+            start = time.perf_counter()
+            pipeline.transform(*flat, inplace=True)
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                stats.calls += 1
+                stats.points += flat[0].size
+                stats.seconds += elapsed
+        return tuple(coords)
+
+    def itransform(
+        self, points: Iterable[Sequence[float]]
+    ) -> Iterator[tuple[float, ...]]:
+        """Transform an iterable of (x, y, z, t) coordinates, timing each stage.
+
+        The points are transformed in chunks, and the cost of each chunk is added to
+        the statistics of the stages.
+
+        Args:
+            points: The coordinates to transform.
+
+        Returns:
+            Iterator: The transformed (x, y, z, t) coordinates.
+
+        """
+        return itransform_chunks(self.transform, points)
+
+    def reset(self) -> None:
+        """Reset the measured cost of every stage."""
+        with self._lock:
+            for stats in self.stats:
+                stats.reset()
+
+
+def format_stages(stats: Sequence[StageStats], labels: Sequence[str]) -> str:
+    """Format the stages of a pipeline and their cost as a table.
+
+    Args:
+        stats: The statistics of each stage.
+        labels: The name of each transformer, indexed by `StageStats.transformer`.
+
+    Returns:
+        str: One line per stage with its cost, followed by its PROJ string.
+
+    """
+    total = sum(s.seconds for s in stats)
+    lines = []
+    for s in stats:
+        cost = "not profiled"
+        if s.calls:
+            share = s.seconds / total if total > 0 else 0.0
+            cost = (
+                f"{s.calls} calls, {s.points:,} points, {s.seconds:.6f} s "
+                f"({share:.1%}, {s.points_per_second:,.0f} points/s)"
+            )
+        lines.append(
+            f"[{s.transformer}.{s.stage}] {labels[s.transformer]}: {s.name}: {cost}"
+        )
+        lines.append(f"    {s.proj_str}")
+    if total > 0:
+        lines.append(f"Total: {total:.6f} s")
+    return "\n".join(lines)
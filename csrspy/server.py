@@ -0,0 +1,370 @@
+"""A local HTTP service that transforms batches of coordinates.
+
+The service keeps a bounded pool of warm `CSRSTransformer` instances keyed on their
+configuration, so that clients share the cost of building transformers and loading
+grids instead of paying it in every process. Connections are kept alive between
+requests.
+
+Endpoints:
+    GET /health
+        Returns the number of pooled transformers.
+    POST /transform
+        Takes a JSON object with the transformer `config`, the `coords` to transform
+        as a list of [x, y, z] rows and an optional `epoch` of each point, and
+        returns the transformed `coords`.
+    POST /transform/binary
+        Takes the transformer configuration as query parameters and a body of
+        little-endian float64 (x, y, z) rows, or (x, y, z, epoch) rows with
+        `columns=4`, and returns the transformed (x, y, z) rows in the same format.
+
+Usage:
+    csrspy serve --port 8080
+    curl -d '{"config": {...}, "coords": [[-123.36, 48.43, 0]]}' \
+        localhost:8080/transform
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import threading
+from collections import OrderedDict
+from contextlib import suppress
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+
+from csrspy.enums import CoordType, GridEngine, Reference, VerticalDatum
+from csrspy.main import CSRSTransformer
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping, Sequence
+
+# The largest request body accepted, in bytes
+MAX_BODY_SIZE = 256 * 1024 * 1024
+
+# The type of each `CSRSTransformer` argument that clients may set
+_CONFIG_TYPES = {
+    "s_ref_frame": Reference,
+    "s_coords": CoordType,
+    "s_epoch": float,
+    "s_vd": VerticalDatum,
+    "t_ref_frame": Reference,
+    "t_coords": CoordType,
+    "t_epoch": float,
+    "t_vd": VerticalDatum,
+    "epoch_shift_grid": str,
+}
+_REQUIRED_CONFIG = ("s_ref_frame", "s_coords", "s_epoch", "t_ref_frame")
+
+
+def parse_config(config: Mapping[str, Any]) -> dict[str, Any]:
+    """Validate and normalize the transformer configuration of a request.
+
+    Args:
+        config: `CSRSTransformer` arguments, as JSON values or query strings.
+
+    Returns:
+        dict: The arguments converted to their enum and float types.
+
+    Raises:
+        ValueError: If an argument is unknown, missing or invalid.
+
+    """
+    unknown = sorted(set(config) - set(_CONFIG_TYPES))
+    if unknown:
+        msg = f"Unknown config parameters: {', '.join(unknown)}."
+        raise ValueError(msg)
+    missing = [name for name in _REQUIRED_CONFIG if name not in config]
+    if missing:
+        msg = f"Missing config parameters: {', '.join(missing)}."
+        raise ValueError(msg)
+    return {
+        name: _CONFIG_TYPES[name](value)
+        for name, value in config.items()
+        if value is not None
+    }
+
+
+class TransformerPool:
+    """A bounded, thread-safe pool of transformers keyed on their configuration.
+
+    When the pool is full, the least recently used transformer is discarded.
+
+    Args:
+        maxsize: The largest number of transformers kept.
+        grid_engine: The grid engine of the transformers.
+        warmup: If True, the grids of each transformer are loaded when it is built,
+            rather than by the first request that uses it.
+
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 16,
+        grid_engine: GridEngine | str = GridEngine.PROJ,
+        *,
+        warmup: bool = True,
+    ) -> None:
+        """Initialize the TransformerPool."""
+        if maxsize < 1:
+            msg = "maxsize must be a positive integer."
+            raise ValueError(msg)
+        self.maxsize = maxsize
+        self.grid_engine = GridEngine(grid_engine)
+        self.warmup = warmup
+        self._transformers: OrderedDict[tuple, CSRSTransformer] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Get the number of pooled transformers."""
+        return len(self._transformers)
+
+    def get(self, config: Mapping[str, Any]) -> CSRSTransformer:
+        """Get the transformer for a configuration, building it if needed.
+
+        Args:
+            config: `CSRSTransformer` arguments, as accepted by `parse_config`.
+
+        Returns:
+            CSRSTransformer: The pooled transformer.
+
+        Raises:
+            ValueError: If the configuration is invalid.
+
+        """
+        config = parse_config(config)
+        key = tuple(sorted(config.items()))
+        with self._lock:
+            if key in self._transformers:
+                self._transformers.move_to_end(key)
+                return self._transformers[key]
+
+        # Build outside the lock, so requests for pooled transformers are not held up
+        transformer = CSRSTransformer(
+            **config, grid_engine=self.grid_engine, warmup=self.warmup
+        )
+        with self._lock:
+            transformer = self._transformers.setdefault(key, transformer)
+            self._transformers.move_to_end(key)
+            while len(self._transformers) > self.maxsize:
+                self._transformers.popitem(last=False)
+        return transformer
+
+    def preload(self, configs: Iterable[Mapping[str, Any]]) -> None:
+        """Build the transformers for a list of configurations ahead of requests.
+
+        Args:
+            configs: `CSRSTransformer` arguments, as accepted by `parse_config`.
+
+        """
+        for config in configs:
+            self.get(config)
+
+
+class _BadRequestError(Exception):
+    """A request that cannot be processed, reported to the client with a 4xx status."""
+
+    def __init__(
+        self, message: str, status: HTTPStatus = HTTPStatus.BAD_REQUEST
+    ) -> None:
+        """Initialize the _BadRequestError."""
+        super().__init__(message)
+        self.status = status
+
+
+class TransformHandler(BaseHTTPRequestHandler):
+    """Handle transformation requests with the transformers of the server pool."""
+
+    # HTTP/1.1 keeps connections alive between requests
+    protocol_version = "HTTP/1.1"
+    # Send small responses immediately instead of waiting for delayed ACKs
+    disable_nagle_algorithm = True
+    server: TransformServer
+
+    def do_GET(self) -> None:
+        """Handle a health check."""
+        if urlsplit(self.path).path != "/health":
+            self._send_json({"error": "Not found."}, HTTPStatus.NOT_FOUND)
+            return
+        self._send_json({"status": "ok", "transformers": len(self.server.pool)})
+
+    def do_POST(self) -> None:
+        """Handle a JSON or binary transformation request."""
+        url = urlsplit(self.path)
+        routes = {"/transform": self._transform_json, "/transform/binary": self._binary}
+        try:
+            body = self._read_body()
+            if url.path not in routes:
+                self._send_json({"error": "Not found."}, HTTPStatus.NOT_FOUND)
+                return
+            routes[url.path](body, dict(parse_qsl(url.query)))
+        except _BadRequestError as e:
+            self._send_json({"error": str(e)}, e.status)
+        except (ValueError, TypeError, KeyError) as e:
+            self._send_json({"error": str(e)}, HTTPStatus.BAD_REQUEST)
+        except Exception as e:  # noqa: BLE001
+            # e.g. a missing grid file, which the client cannot fix
+            self._send_json({"error": str(e)}, HTTPStatus.INTERNAL_SERVER_ERROR)
+
+    def _read_body(self) -> bytes:
+        header = self.headers.get("Content-Length", "0")
+        try:
+            length = int(header)
+        except ValueError:
+            length = -1
+        if length < 0:
+            # The end of the body is unknown, so the connection cannot be reused
+            self.close_connection = True
+            msg = f"Invalid Content-Length: {header!r}."
+            raise _BadRequestError(msg)
+        if length > MAX_BODY_SIZE:
+            # The body is not read, so the connection cannot be reused
+            self.close_connection = True
+            msg = f"The request body is larger than {MAX_BODY_SIZE} bytes."
+            raise _BadRequestError(msg, HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+        return self.rfile.read(length)
+
+    def _transform_json(self, body: bytes, query: dict[str, str]) -> None:  # noqa: ARG002
+        try:
+            request = json.loads(body)
+        except json.JSONDecodeError as e:
+            msg = f"Invalid JSON: {e}"
+            raise _BadRequestError(msg) from None
+        if not isinstance(request, dict):
+            msg = "The request must be a JSON object."
+            raise _BadRequestError(msg)
+
+        transformer = self.server.pool.get(request.get("config", {}))
+        coords = np.asarray(request.get("coords", []), dtype=np.float64)
+        coords = coords.reshape(-1, 3) if coords.size == 0 else coords
+        if coords.ndim != 2 or coords.shape[1] != 3:  # noqa: PLR2004
+            msg = "coords must be a list of [x, y, z] rows."
+            raise _BadRequestError(msg)
+
+        x, y, z = transformer.transform_arrays(*coords.T, epoch=request.get("epoch"))
+        self._send_json({"coords": np.column_stack((x, y, z)).tolist()})
+
+    def _binary(self, body: bytes, query: dict[str, str]) -> None:
+        columns = int(query.pop("columns", 3))
+        if columns not in {3, 4}:
+            msg = "columns must be 3 or 4."
+            raise _BadRequestError(msg)
+        if len(body) % (8 * columns):
+            msg = f"The body must contain rows of {columns} float64 values."
+            raise _BadRequestError(msg)
+
+        transformer = self.server.pool.get(query)
+        rows = np.frombuffer(body, dtype="<f8").reshape(-1, columns)
+        epoch = rows[:, 3] if columns == 4 else None  # noqa: PLR2004
+        x, y, z = transformer.transform_arrays(*rows[:, :3].T, epoch=epoch)
+        out = np.column_stack((x, y, z)).astype("<f8", copy=False)
+        self._send(out.tobytes(), "application/octet-stream")
+
+    def _send_json(
+        self, document: dict[str, Any], status: HTTPStatus = HTTPStatus.OK
+    ) -> None:
+        self._send(json.dumps(document).encode(), "application/json", status)
+
+    def _send(
+        self, body: bytes, content_type: str, status: HTTPStatus = HTTPStatus.OK
+    ) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002, ANN401
+        """Log requests, unless the server is quiet."""
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class TransformServer(ThreadingHTTPServer):
+    """An HTTP server that handles each connection on its own thread.
+
+    Args:
+        address: The (host, port) to listen on. Port 0 picks a free port.
+        pool: The transformers shared by all connections.
+        quiet: If True, requests are not logged.
+
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self, address: tuple[str, int], pool: TransformerPool, *, quiet: bool = False
+    ) -> None:
+        """Initialize the TransformServer."""
+        super().__init__(address, TransformHandler)
+        self.pool = pool
+        self.quiet = quiet
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the serve command.
+
+    Returns:
+        argparse.ArgumentParser: The argument parser.
+
+    """
+    parser = argparse.ArgumentParser(
+        prog="csrspy serve",
+        description="Serve coordinate transformations over HTTP with a pool of warm "
+        "transformers.",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Defaults to 127.0.0.1.")
+    parser.add_argument("--port", type=int, default=8080, help="Defaults to 8080.")
+    parser.add_argument(
+        "--max-transformers",
+        type=int,
+        default=16,
+        help="Number of transformers kept in the pool. Defaults to 16.",
+    )
+    parser.add_argument(
+        "--preload",
+        help="JSON file with a list of transformer configurations to build at start.",
+    )
+    parser.add_argument(
+        "--grid-engine",
+        type=GridEngine,
+        default=GridEngine.PROJ,
+        help="Interpolate the grids with proj or numpy. Defaults to proj.",
+    )
+    parser.add_argument(
+        "-q", "--quiet", action="store_true", help="Do not log requests."
+    )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the transformation service until it is interrupted.
+
+    Args:
+        argv: The command line arguments. Defaults to `sys.argv[1:]`.
+
+    Returns:
+        int: The exit status.
+
+    """
+    args = build_parser().parse_args(argv)
+    pool = TransformerPool(args.max_transformers, grid_engine=args.grid_engine)
+    if args.preload is not None:
+        pool.preload(json.loads(Path(args.preload).read_text()))
+
+    with TransformServer((args.host, args.port), pool, quiet=args.quiet) as server:
+        host, port = server.server_address[:2]
+        sys.stderr.write(f"Serving csrspy on http://{host}:{port}\n")
+        with suppress(KeyboardInterrupt):
+            server.serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
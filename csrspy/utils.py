@@ -4,14 +4,48 @@ This module provides functions for date conversion and synchronization of PROJ
 grid files.
 """
 
+from __future__ import annotations
+
+import hashlib
+import json
 import logging
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import date
-from typing import TypeVar
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TypeVar
+from urllib.request import urlopen
+
+import numpy as np
+
+from csrspy.enums import VerticalDatum
+from csrspy.factories import VerticalGridShiftFactory
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Iterator, Mapping
 
-import pyproj.sync
+    from numpy.typing import ArrayLike, NDArray
 
 T = TypeVar("T")
 
+DEFAULT_EPOCH_SHIFT_GRID = "ca_nrc_NAD83v70VG.tif"
+
+# Vertical datums of ellipsoidal heights, that need no grid
+_ELLIPSOIDAL_DATUMS = (VerticalDatum.GRS80, VerticalDatum.WGS84)
+
+# The catalog of the grid files of a PROJ endpoint, with their SHA-256 checksums
+GRID_CATALOG = "files.geojson"
+
+# The longest time to wait for the lock of a grid file on Windows, in seconds, and
+# the longest pause between attempts to take it
+_LOCK_TIMEOUT = 600
+_LOCK_MAX_BACKOFF = 5.0
+
+_DOWNLOAD_BLOCK_SIZE = 1024 * 1024
+
 logger = logging.getLogger(__name__)
 
 
@@ -30,24 +64,228 @@ def date_to_decimal_year(d: date) -> float:
     return d.year + year_part / year_length
 
 
-def sync_missing_grid_files() -> None:
-    """Synchronize missing PROJ grid files for the Canada area of use.
+def datetime64_to_decimal_year(dt: ArrayLike) -> NDArray[np.float64]:
+    """Convert an array of datetime64 values to decimal years.
+
+    This is a vectorized counterpart to `date_to_decimal_year`, that also accounts
+    for the time of day.
+
+    Args:
+        dt (ArrayLike): The datetime64 values to convert.
+
+    Returns:
+        NDArray[np.float64]: The decimal year representation of the input values.
+
+    """
+    dt = np.asarray(dt, dtype="datetime64[us]")
+    year = dt.astype("datetime64[Y]")
+    year_start = year.astype("datetime64[us]")
+    year_end = (year + 1).astype("datetime64[us]")
+    return (year.astype(np.int64) + 1970) + (dt - year_start) / (year_end - year_start)
+
+
+def required_grid_files(config: Mapping[str, Any] | None = None) -> list[str]:
+    """Get the names of the grid files that a transformer configuration needs.
+
+    Args:
+        config: `CSRSTransformer` arguments, such as `CSRSTransformer.config`. Only
+            `s_vd`, `t_vd` and `epoch_shift_grid` are used. Defaults to every grid
+            that csrspy can use with the default epoch shift grid.
+
+    Returns:
+        list[str]: The epoch shift grid followed by the vertical datum grids.
+
+    """
+    if config is None:
+        datums = list(VerticalDatum)
+        epoch_shift_grid = DEFAULT_EPOCH_SHIFT_GRID
+    else:
+        datums = [config.get("s_vd"), config.get("t_vd")]
+        epoch_shift_grid = config.get("epoch_shift_grid", DEFAULT_EPOCH_SHIFT_GRID)
+
+    grids = [epoch_shift_grid]
+    for vd in datums:
+        if vd is None or VerticalDatum(vd) in _ELLIPSOIDAL_DATUMS:
+            continue
+        name = VerticalGridShiftFactory(VerticalDatum(vd)).grid_shift_file
+        if name not in grids:
+            grids.append(name)
+    return grids
+
+
+@contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive lock on a file, shared between processes."""
+    with path.open("a+b") as f:
+        if sys.platform == "win32":
+            import msvcrt  # noqa: PLC0415
+
+            # msvcrt.locking gives up after 10 seconds, so retry with a backoff
+            deadline = time.monotonic() + _LOCK_TIMEOUT
+            backoff = 0.1
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    if time.monotonic() >= deadline:
+                        msg = f"Timed out waiting for the lock {path}."
+                        raise TimeoutError(msg) from None
+                    time.sleep(backoff)
+                    backoff = min(backoff * 2, _LOCK_MAX_BACKOFF)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl  # noqa: PLC0415
+
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _grid_checksums(endpoint: str, timeout: float) -> dict[str, str]:
+    """Get the SHA-256 checksum of each grid file listed in the catalog of a mirror."""
+    url = f"{endpoint.rstrip('/')}/{GRID_CATALOG}"
+    with urlopen(url, timeout=timeout) as response:  # noqa: S310
+        catalog = json.load(response)
+    return {
+        feature["properties"]["name"]: feature["properties"]["sha256sum"]
+        for feature in catalog["features"]
+        if "sha256sum" in feature["properties"]
+    }
+
+
+def _download_grid(
+    name: str,
+    endpoint: str,
+    directory: Path,
+    timeout: float,
+    sha256: str | None,
+) -> bool:
+    """Download a grid file, unless another process downloaded it first.
+
+    The file is downloaded to a temporary file, which is renamed into place only if
+    its checksum matches `sha256`.
+
+    Returns:
+        bool: True if the file was downloaded.
+
+    Raises:
+        RuntimeError: If the checksum of the downloaded file does not match.
 
-    This function checks for missing grid files and downloads them from the PROJ
-    endpoint if necessary. It uses the pyproj library to manage the synchronization.
     """
-    target_directory = pyproj.sync.get_user_data_dir(create=True)
-    endpoint = pyproj.sync.get_proj_endpoint()
-    grids = pyproj.sync.get_transform_grid_list(area_of_use="Canada")
-
-    if len(grids):
-        logger.info("Syncing PROJ grid files.")
-
-    for grid in grids:
-        filename = grid["properties"]["name"]
-        pyproj.sync._download_resource_file(  # noqa: SLF001
-            file_url=f"{endpoint}/{filename}",
-            short_name=filename,
-            directory=target_directory,
-            sha256=grid["properties"]["sha256sum"],
+    target = directory / name
+    with _file_lock(directory / f"{name}.lock"):
+        # Another process may have downloaded the file while we waited for the lock
+        if target.is_file():
+            return False
+
+        logger.info("Downloading PROJ grid file %s.", name)
+        part = directory / f"{name}.part"
+        try:
+            url = f"{endpoint.rstrip('/')}/{name}"
+            digest = hashlib.sha256()
+            with urlopen(url, timeout=timeout) as response, part.open("wb") as f:  # noqa: S310
+                while block := response.read(_DOWNLOAD_BLOCK_SIZE):
+                    digest.update(block)
+                    f.write(block)
+            if sha256 is not None and digest.hexdigest() != sha256:
+                msg = f"SHA256 mismatch: {name}"
+                raise RuntimeError(msg)
+            part.replace(target)
+        finally:
+            part.unlink(missing_ok=True)
+    return True
+
+
+def sync_missing_grid_files(
+    config: Mapping[str, Any] | None = None,
+    *,
+    endpoint: str | None = None,
+    directory: str | os.PathLike | None = None,
+    workers: int = 4,
+    timeout: float = 60,
+    verify: bool = True,
+) -> list[Path]:
+    """Download the PROJ grid files that a transformer configuration needs.
+
+    Only grids that are missing are downloaded, concurrently. Each download holds a
+    lock file next to the grid, so when several processes sync at once each grid is
+    downloaded by only one of them while the others wait for it. Each grid is
+    checked against the SHA-256 checksum listed in the `files.geojson` catalog of
+    the endpoint before it is moved into place, so a corrupt or truncated download
+    is never installed.
+
+    Args:
+        config: `CSRSTransformer` arguments, such as `CSRSTransformer.config`. See
+            `required_grid_files`. Defaults to every grid that csrspy can use.
+        endpoint: The URL to download the grids from, e.g. a local mirror. Defaults
+            to the PROJ endpoint configured for pyproj, normally the PROJ CDN.
+        directory: The directory to download the grids into. Defaults to the pyproj
+            user data directory. Grids found in the other PROJ data directories
+            are then not downloaded again.
+        workers: The number of concurrent downloads.
+        timeout: The timeout of each connection in seconds.
+        verify: If False, the checksums of the grids are not checked, e.g. for a
+            mirror without a catalog.
+
+    Returns:
+        list[Path]: The paths of the downloaded grid files.
+
+    Raises:
+        RuntimeError: If a grid is not listed in the catalog of the endpoint, or
+            the checksum of a downloaded grid does not match.
+
+    """
+    import pyproj.datadir  # noqa: PLC0415
+    import pyproj.sync  # noqa: PLC0415
+
+    names = required_grid_files(config)
+    if directory is None:
+        directory = Path(pyproj.datadir.get_user_data_dir(create=True))
+        missing = [name for name in names if not _grid_file_exists(name)]
+    else:
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        missing = [name for name in names if not (directory / name).is_file()]
+    if not missing:
+        return []
+
+    endpoint = endpoint if endpoint is not None else pyproj.sync.get_proj_endpoint()
+    checksums = {}
+    if verify:
+        checksums = _grid_checksums(endpoint, timeout)
+        unlisted = [name for name in missing if name not in checksums]
+        if unlisted:
+            msg = (
+                f"No checksum of {', '.join(unlisted)} in the {GRID_CATALOG} catalog "
+                f"of {endpoint}. Pass verify=False to download without checking it."
+            )
+            raise RuntimeError(msg)
+
+    logger.info("Syncing PROJ grid files.")
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(missing)))) as pool:
+        downloaded = list(
+            pool.map(
+                lambda name: _download_grid(
+                    name, endpoint, directory, timeout, checksums.get(name)
+                ),
+                missing,
+            )
         )
+    return [directory / name for name, new in zip(missing, downloaded) if new]
+
+
+def _grid_file_exists(name: str) -> bool:
+    from csrspy.grids import find_grid_file  # noqa: PLC0415
+
+    try:
+        find_grid_file(name)
+    except FileNotFoundError:
+        return False
+    return True
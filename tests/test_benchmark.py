@@ -0,0 +1,95 @@
+import json
+
+import pytest
+
+from csrspy.benchmark import (
+    check_import_budget,
+    compare,
+    default_cases,
+    import_time,
+    main,
+    run_benchmarks,
+    to_json,
+)
+from csrspy.enums import VerticalDatum
+from csrspy.main import CSRSTransformer
+
+
+def test_default_cases_cover_branches_and_datums():
+    cases = default_cases()
+    assert len({c.name for c in cases}) == len(cases)
+    assert {c.branch for c in cases} == {
+        "itrf_to_nad83",
+        "nad83_to_itrf",
+        "itrf_to_itrf",
+        "nad83_to_nad83",
+    }
+    datums = {vd for c in cases for vd in (c.config["s_vd"], c.config["t_vd"])}
+    assert datums == set(VerticalDatum)
+    for case in cases:
+        CSRSTransformer(**case.config)
+
+
+def test_run_benchmarks():
+    cases = [c for c in default_cases() if c.name == "itrf_to_nad83-grs80"]
+    results = run_benchmarks(cases, sizes=(1, 10), repeats=2)
+
+    assert [(r.benchmark, r.n_points) for r in results] == [
+        ("construct", 0),
+        ("point", 1),
+        ("throughput", 1),
+        ("throughput", 10),
+    ]
+    assert all(r.repeats == 2 and 0 < r.best <= r.median for r in results)
+    assert results[-1].points_per_second == pytest.approx(10 / results[-1].best)
+
+    document = json.loads(json.dumps(to_json(results, grid_engine="proj")))
+    assert document["metadata"]["grid_engine"] == "proj"
+    assert len(document["results"]) == 4
+
+
+def test_compare():
+    def document(best) -> dict:
+        return {
+            "results": [
+                {"case": "a", "benchmark": "throughput", "n_points": 10, "best": best}
+            ]
+        }
+
+    assert compare(document(1.0), document(1.2)) == []
+    assert len(compare(document(1.0), document(1.5))) == 1
+    assert compare(document(1.0), document(1.5), threshold=0.6) == []
+    assert compare({"results": []}, document(1.5)) == []
+
+
+def test_main(tmp_path):
+    output = tmp_path / "results.json"
+    args = ["--cases", "itrf_to_nad83-grs80", "--sizes", "10", "--repeats", "1"]
+
+    assert main([*args, "-o", str(output)]) == 0
+    results = json.loads(output.read_text())["results"]
+    assert len(results) == 3
+
+    for r in results:
+        r["best"] /= 100
+    output.write_text(json.dumps({"results": results}))
+    assert (
+        main([*args, "-o", str(tmp_path / "new.json"), "--baseline", str(output)]) == 1
+    )
+
+
+def test_import_is_lazy():
+    _, loaded = import_time(repeats=1)
+    assert loaded == []
+
+    _, loaded = import_time("csrspy.main", repeats=1)
+    assert "numpy" in loaded
+
+
+def test_import_budget_violations():
+    result, violations = check_import_budget("csrspy.main", repeats=1, budget=0)
+
+    assert result.case == "import-csrspy.main"
+    assert result.repeats == 1
+    assert "import csrspy.main loaded numpy" in violations
+    assert any("budget 0 s" in v for v in violations)
@@ -0,0 +1,129 @@
+import gzip
+
+import numpy as np
+import pytest
+
+from csrspy import CSRSTransformer
+from csrspy.cli import main
+from csrspy.enums import CoordType, Reference, VerticalDatum
+
+ARGS = [
+    "--s-ref-frame",
+    "itrf14",
+    "--t-ref-frame",
+    "nad83csrs",
+    "--s-coords",
+    "geog",
+    "--t-coords",
+    "utm10",
+    "--s-epoch",
+    "2010",
+]
+
+
+@pytest.fixture
+def coords():
+    rng = np.random.default_rng(2)
+    return np.column_stack(
+        [
+            rng.uniform(-126, -120, 25),
+            rng.uniform(46, 52, 25),
+            rng.uniform(-10, 100, 25),
+        ]
+    )
+
+
+@pytest.fixture
+def expected(coords):
+    trans = CSRSTransformer(
+        s_ref_frame=Reference.ITRF14,
+        t_ref_frame=Reference.NAD83CSRS,
+        s_coords=CoordType.GEOG,
+        t_coords=CoordType.UTM10,
+        s_epoch=2010,
+        s_vd=VerticalDatum.GRS80,
+        t_vd=VerticalDatum.GRS80,
+    )
+    return np.column_stack(trans.transform_arrays(*coords.T))
+
+
+def test_cli_csv(tmp_path, coords, expected, capsys):
+    src = tmp_path / "in.csv"
+    dst = tmp_path / "out.csv"
+    np.savetxt(src, coords, delimiter=",", header="x,y,z", comments="")
+
+    assert (
+        main(
+            [
+                *ARGS,
+                "--skip-header",
+                "1",
+                "--chunk-size",
+                "10",
+                str(src),
+                "-o",
+                str(dst),
+            ]
+        )
+        == 0
+    )
+
+    lines = dst.read_text().splitlines()
+    assert lines[0] == "x,y,z"
+    out = np.loadtxt(lines[1:], delimiter=",")
+    np.testing.assert_allclose(out, expected, atol=1e-6)
+    assert "rows/s" in capsys.readouterr().err
+
+
+def test_cli_gzip_whitespace(tmp_path, coords, expected):
+    src = tmp_path / "in.txt.gz"
+    dst = tmp_path / "out.txt.gz"
+    with gzip.open(src, "wt") as f:
+        np.savetxt(f, coords)
+
+    assert main([*ARGS, "-q", "--workers", "2", str(src), "-o", str(dst)]) == 0
+
+    with gzip.open(dst, "rt") as f:
+        out = np.loadtxt(f)
+    np.testing.assert_allclose(out, expected, atol=1e-6)
+
+
+def test_cli_columns(tmp_path, coords, expected):
+    src = tmp_path / "in.tsv"
+    dst = tmp_path / "out.tsv"
+    np.savetxt(src, np.column_stack([np.arange(25), coords]), delimiter="\t")
+
+    assert (
+        main([*ARGS, "-q", "--columns", "1", "2", "3", str(src), "-o", str(dst)]) == 0
+    )
+
+    out = np.loadtxt(dst, delimiter="\t")
+    np.testing.assert_array_equal(out[:, 0], np.arange(25))
+    np.testing.assert_allclose(out[:, 1:], expected, atol=1e-6)
+
+
+def test_cli_copies_other_columns(tmp_path, coords, expected):
+    src = tmp_path / "in.csv"
+    dst = tmp_path / "out.csv"
+    rows = [
+        f"{i},{x!r},pt{i},{y!r},{z!r}" for i, (x, y, z) in enumerate(coords.tolist())
+    ]
+    src.write_text("\n".join(["id,x,name,y,z", *rows[:10], "", *rows[10:]]) + "\n")
+
+    args = ["-q", "--skip-header", "1", "--columns", "1", "3", "4", "--chunk-size"]
+    assert main([*ARGS, *args, "7", str(src), "-o", str(dst)]) == 0
+
+    lines = dst.read_text().splitlines()
+    assert lines[0] == "id,x,name,y,z"
+    fields = [line.split(",") for line in lines[1:]]
+    assert [f[0] for f in fields] == [str(i) for i in range(25)]
+    assert [f[2] for f in fields] == [f"pt{i}" for i in range(25)]
+    out = np.array([[float(f[1]), float(f[3]), float(f[4])] for f in fields])
+    np.testing.assert_allclose(out, expected, atol=1e-6)
+
+
+@pytest.mark.parametrize("value", ["0", "-1"])
+def test_cli_rejects_invalid_chunk_size(value, capsys):
+    with pytest.raises(SystemExit):
+        main([*ARGS, "--chunk-size", value])
+    assert "positive integer" in capsys.readouterr().err
@@ -1,5 +1,39 @@
-from csrspy.factories import HelmertFactory
+import numpy as np
+
+from csrspy.enums import Reference, VerticalDatum
+from csrspy.factories import HelmertFactory, VerticalGridShiftFactory
 
 
 def test_helmert_from_ref_string():
     assert isinstance(HelmertFactory.from_ref_frame("itrf14"), HelmertFactory)
+
+
+def test_helmert_from_ref_frame_is_shared():
+    assert HelmertFactory.from_ref_frame(
+        Reference.ITRF14
+    ) is HelmertFactory.from_ref_frame(Reference.ITRF14)
+
+
+def test_factory_transformer_is_shared():
+    helmert = HelmertFactory.from_ref_frame(Reference.ITRF08)
+    assert helmert.transformer is helmert.transformer
+    assert (
+        VerticalGridShiftFactory(VerticalDatum.GRS80).transformer
+        is VerticalGridShiftFactory(VerticalDatum.GRS80).transformer
+    )
+
+
+def test_helmert_between_matches_chained_transforms():
+    to_nad83 = HelmertFactory.from_ref_frame(Reference.ITRF08).transformer
+    from_nad83 = HelmertFactory.from_ref_frame(Reference.ITRF20).transformer
+    composed = HelmertFactory.between(Reference.ITRF08, Reference.ITRF20).transformer
+
+    coords = (-2332023.027, -3541319.459, 4748619.680, 2023.5)
+    expected = from_nad83.transform(*to_nad83.transform(*coords), direction="INVERSE")
+
+    np.testing.assert_allclose(composed.transform(*coords), expected, atol=1e-6)
+
+
+def test_helmert_between_same_frame_is_identity():
+    helmert = HelmertFactory.between(Reference.ITRF14, Reference.ITRF14)
+    assert helmert == HelmertFactory(*[0] * 14)
@@ -0,0 +1,129 @@
+import numpy as np
+import pytest
+
+from csrspy import CSRSTransformer
+from csrspy.enums import CoordType, Reference, VerticalDatum
+from csrspy.files import transform_file, transform_parquet
+
+
+@pytest.fixture(scope="module")
+def transformer():
+    return CSRSTransformer(
+        s_ref_frame=Reference.ITRF14,
+        t_ref_frame=Reference.NAD83CSRS,
+        s_coords=CoordType.GEOG,
+        t_coords=CoordType.UTM10,
+        s_epoch=2010,
+        s_vd=VerticalDatum.GRS80,
+        t_vd=VerticalDatum.GRS80,
+    )
+
+
+@pytest.fixture
+def points():
+    rng = np.random.default_rng(3)
+    return np.column_stack(
+        [
+            rng.uniform(-126, -120, 50),
+            rng.uniform(46, 52, 50),
+            rng.uniform(-10, 100, 50),
+            np.arange(50),
+        ]
+    )
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_transform_npy_file(tmp_path, transformer, points, workers):
+    src = tmp_path / "in.npy"
+    dst = tmp_path / "out.npy"
+    np.save(src, points)
+
+    transform_file(transformer, src, dst, chunk_size=16, workers=workers)
+
+    out = np.load(dst)
+    expected = transformer.transform_arrays(*points[:, :3].T)
+    np.testing.assert_allclose(out[:, :3], np.column_stack(expected), atol=1e-9)
+    np.testing.assert_array_equal(out[:, 3], points[:, 3])
+    np.testing.assert_array_equal(np.load(src), points)
+
+
+def test_transform_raw_file_inplace(tmp_path, transformer, points):
+    src = tmp_path / "points.f64"
+    points[:, [3, 0, 1, 2]].tofile(src)
+
+    transform_file(
+        transformer, src, inplace=True, columns=(1, 2, 3), n_columns=4, chunk_size=7
+    )
+
+    out = np.fromfile(src).reshape(-1, 4)
+    expected = transformer.transform_arrays(*points[:, :3].T)
+    np.testing.assert_allclose(out[:, 1:], np.column_stack(expected), atol=1e-9)
+    np.testing.assert_array_equal(out[:, 0], points[:, 3])
+
+
+def test_transform_file_requires_one_output(tmp_path, transformer, points):
+    src = tmp_path / "in.npy"
+    np.save(src, points)
+    with pytest.raises(ValueError, match="Exactly one"):
+        transform_file(transformer, src)
+    with pytest.raises(ValueError, match="Exactly one"):
+        transform_file(transformer, src, tmp_path / "out.npy", inplace=True)
+
+
+@pytest.mark.parametrize(("workers", "prefetch"), [(None, 1), (2, 3)])
+def test_transform_parquet(tmp_path, transformer, points, workers, prefetch):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    table = pa.table(
+        {"x": points[:, 0], "y": points[:, 1], "z": points[:, 2], "id": points[:, 3]}
+    ).replace_schema_metadata({"geo": "{}"})
+    pq.write_table(table, tmp_path / "in.parquet", row_group_size=16)
+
+    rows = transform_parquet(
+        transformer,
+        tmp_path / "in.parquet",
+        tmp_path / "out.parquet",
+        workers=workers,
+        prefetch=prefetch,
+    )
+
+    assert rows == 50
+    out_file = pq.ParquetFile(tmp_path / "out.parquet")
+    assert out_file.num_row_groups == 4
+    out = out_file.read()
+    assert out.schema.metadata == {b"geo": b"{}"}
+    expected = transformer.transform_arrays(*points[:, :3].T)
+    for name, values in zip("xyz", expected):
+        np.testing.assert_allclose(out.column(name).to_numpy(), values, atol=1e-9)
+    np.testing.assert_array_equal(out.column("id").to_numpy(), points[:, 3])
+
+
+def test_transform_parquet_invalid(tmp_path, transformer):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    pq.write_table(pa.table({"x": [0.0], "y": [0.0]}), tmp_path / "in.parquet")
+
+    with pytest.raises(KeyError, match="no columns named z"):
+        transform_parquet(
+            transformer, tmp_path / "in.parquet", tmp_path / "out.parquet"
+        )
+    with pytest.raises(ValueError, match="must not be the source"):
+        transform_parquet(transformer, tmp_path / "in.parquet", tmp_path / "in.parquet")
+    with pytest.raises(ValueError, match="prefetch"):
+        transform_parquet(
+            transformer, tmp_path / "in.parquet", tmp_path / "out.parquet", prefetch=0
+        )
+
+
+def test_transform_file_invalid(tmp_path, transformer, points):
+    src = tmp_path / "in.npy"
+    np.save(src, points)
+
+    with pytest.raises(ValueError, match="chunk_size"):
+        transform_file(transformer, src, tmp_path / "out.npy", chunk_size=0)
+    with pytest.raises(ValueError, match="must not be the source"):
+        transform_file(transformer, src, src)
+    (tmp_path / "link.npy").symlink_to(src)
+    with pytest.raises(ValueError, match="must not be the source"):
+        transform_file(transformer, src, tmp_path / "link.npy")
+    np.testing.assert_array_equal(np.load(src), points)
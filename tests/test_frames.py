@@ -0,0 +1,125 @@
+import numpy as np
+import pytest
+
+from csrspy.enums import CoordType, Reference, VerticalDatum
+from csrspy.frames import transform_arrow, transform_dataframe
+from csrspy.main import CSRSTransformer
+
+pd = pytest.importorskip("pandas")
+pa = pytest.importorskip("pyarrow")
+
+LON = [-123.365646, -123.0, -122.5, -124.0]
+LAT = [48.428421, 49.0, 50.0, 49.5]
+HEIGHT = [0.0, 10.0, 100.0, 5.0]
+
+
+@pytest.fixture
+def transformer():
+    return CSRSTransformer(
+        s_ref_frame=Reference.ITRF14,
+        t_ref_frame=Reference.NAD83CSRS,
+        s_coords=CoordType.GEOG,
+        t_coords=CoordType.UTM10,
+        s_epoch=2010,
+        s_vd=VerticalDatum.GRS80,
+        t_vd=VerticalDatum.GRS80,
+    )
+
+
+@pytest.fixture
+def expected(transformer):
+    return np.stack(transformer.transform_arrays(LON, LAT, HEIGHT))
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_transform_dataframe(transformer, expected, workers):
+    df = pd.DataFrame({"lon": LON, "lat": LAT, "h": HEIGHT, "id": range(4)})
+
+    out = transform_dataframe(transformer, df, ("lon", "lat", "h"), workers=workers)
+
+    assert out is not df
+    np.testing.assert_allclose(out[["lon", "lat", "h"]].T, expected, atol=1e-9)
+    assert out["id"].tolist() == [0, 1, 2, 3]
+    assert df["lon"].tolist() == LON
+
+
+def test_transform_dataframe_inplace_and_epochs(transformer):
+    dates = pd.to_datetime(["2010-01-01", "2020-07-02", "2010-01-01", "2010-01-01"])
+    df = pd.DataFrame({"x": LON, "y": LAT, "z": HEIGHT, "time": dates})
+    expected = transformer.transform_arrays(
+        LON, LAT, HEIGHT, epoch=[2010.0, 2020.5, 2010.0, 2010.0]
+    )
+
+    out = transform_dataframe(transformer, df, epoch_column="time", inplace=True)
+
+    assert out is df
+    np.testing.assert_allclose(df[["x", "y", "z"]].T, np.stack(expected), atol=1e-9)
+
+
+def test_transform_dataframe_invalid(transformer):
+    df = pd.DataFrame({"x": LON, "y": LAT, "z": HEIGHT})
+    with pytest.raises(ValueError, match="x, y, and z"):
+        transform_dataframe(transformer, df, ("x", "y"))
+    with pytest.raises(KeyError):
+        transform_dataframe(transformer, df, ("x", "y", "h"))
+
+
+def test_transform_arrow_table_keeps_chunks(transformer, expected):
+    table = pa.Table.from_batches(
+        [
+            pa.record_batch(
+                {"x": LON[:3], "y": LAT[:3], "z": HEIGHT[:3], "id": [0, 1, 2]}
+            ),
+            pa.record_batch({"x": LON[3:], "y": LAT[3:], "z": HEIGHT[3:], "id": [3]}),
+        ]
+    )
+
+    out = transform_arrow(transformer, table)
+
+    assert out.schema.names == ["x", "y", "z", "id"]
+    assert out.column("x").num_chunks == 2
+    coords = np.stack([out.column(name).to_numpy() for name in ("x", "y", "z")])
+    np.testing.assert_allclose(coords, expected, atol=1e-9)
+    assert out.column("id").to_pylist() == [0, 1, 2, 3]
+    assert table.column("x").to_pylist() == LON
+
+
+def test_transform_arrow_record_batch_nulls(transformer):
+    lat = np.array(LAT, dtype=np.float32)
+    expected = np.stack(transformer.transform_arrays(LON, lat, HEIGHT))
+    batch = pa.record_batch(
+        {
+            "x": pa.array([*LON[:3], None]),
+            "y": lat,
+            "z": HEIGHT,
+        }
+    )
+
+    out = transform_arrow(transformer, batch)
+
+    assert isinstance(out, pa.RecordBatch)
+    assert out.schema.field("y").type == pa.float64()
+    assert out.column("x").null_count == 1
+    coords = np.stack(
+        [out.column(name).to_numpy(zero_copy_only=False) for name in "xyz"]
+    )
+    np.testing.assert_allclose(coords[:, :3], expected[:, :3], atol=1e-9)
+
+
+def test_transform_arrow_epochs(transformer):
+    times = pa.array(np.array(["2010-01-01", "2020-07-02"] * 2, dtype="datetime64[ms]"))
+    table = pa.table({"x": LON, "y": LAT, "z": HEIGHT, "t": times})
+    expected = transformer.transform_arrays(
+        LON, LAT, HEIGHT, epoch=[2010.0, 2020.5, 2010.0, 2020.5]
+    )
+
+    out = transform_arrow(transformer, table, epoch_column="t")
+
+    coords = np.stack([out.column(name).to_numpy() for name in ("x", "y", "z")])
+    np.testing.assert_allclose(coords, np.stack(expected), atol=1e-9)
+
+
+def test_transform_arrow_missing_column(transformer):
+    table = pa.table({"x": LON, "y": LAT, "z": HEIGHT})
+    with pytest.raises(KeyError, match="no columns named t"):
+        transform_arrow(transformer, table, epoch_column="t")
@@ -0,0 +1,308 @@
+from collections.abc import Iterator
+
+import numpy as np
+import pytest
+from pyproj import Transformer
+
+from csrspy import CSRSTransformer
+from csrspy.enums import CoordType, GridEngine, Reference, VerticalDatum
+from csrspy.grids import (
+    Cartesian,
+    Deformation,
+    GridPipeline,
+    Helmert,
+    VerticalGridShift,
+    find_grid_file,
+    itransform_chunks,
+    load_grids,
+)
+
+tifffile = pytest.importorskip("tifffile")
+
+NODATA = -32768.0
+
+
+def write_grid(path, pages, descriptions, units, *, pixel_is_area=False):
+    """Write a GeoTIFF grid, with one (bands, lon0, lat1, res) tuple per subgrid."""
+    items = []
+    for i, (description, unit) in enumerate(zip(descriptions, units)):
+        items.append(
+            f'<Item name="DESCRIPTION" sample="{i}" role="description">'
+            f"{description}</Item>"
+        )
+        items.append(
+            f'<Item name="UNITTYPE" sample="{i}" role="unittype">{unit}</Item>'
+        )
+    metadata = f"<GDALMetadata>{''.join(items)}</GDALMetadata>"
+    geo_keys = [1, 1, 0, 4, 1024, 0, 1, 2, 1025, 0, 1, 1 if pixel_is_area else 2]
+    geo_keys += [2048, 0, 1, 4617, 2054, 0, 1, 9102]
+
+    with tifffile.TiffWriter(path) as tif:
+        for bands, lon0, lat1, res in pages:
+            data = np.stack(bands).astype(np.float32)
+            tif.write(
+                data if len(bands) > 1 else data[0],
+                planarconfig="separate" if len(bands) > 1 else None,
+                photometric="minisblack",
+                extratags=[
+                    (33550, "d", 3, (res, res, 0.0), False),
+                    (33922, "d", 6, (0.0, 0.0, 0.0, lon0, lat1, 0.0), False),
+                    (34735, "H", len(geo_keys), geo_keys, False),
+                    (42112, "s", 0, metadata, False),
+                    (42113, "s", 0, str(NODATA), False),
+                ],
+            )
+
+
+@pytest.fixture(scope="module")
+def geoid_grid(tmp_path_factory):
+    path = tmp_path_factory.mktemp("grids") / "geoid.tif"
+    lon, lat = np.meshgrid(-130 + 0.5 * np.arange(41), 60 - 0.5 * np.arange(31))
+    geoid = -18 + 0.3 * np.sin(lon / 3) + 0.2 * np.cos(lat / 2)
+    geoid[10, 10:12] = NODATA
+    geoid[20:22, 30:32] = NODATA
+    # A finer subgrid nested within the grid
+    sub_lon, sub_lat = np.meshgrid(-125 + 0.1 * np.arange(21), 50 - 0.1 * np.arange(21))
+    sub_geoid = -17 + 0.1 * np.sin(sub_lon) + 0.1 * np.cos(sub_lat)
+    write_grid(
+        path,
+        [([geoid], -130.0, 60.0, 0.5), ([sub_geoid], -125.0, 50.0, 0.1)],
+        ["geoid_undulation"],
+        ["metre"],
+    )
+    return path
+
+
+@pytest.fixture(scope="module")
+def velocity_grid(tmp_path_factory):
+    path = tmp_path_factory.mktemp("grids") / "velocity.tif"
+    lon, lat = np.meshgrid(-130 + 0.5 * np.arange(41), 60 - 0.5 * np.arange(31))
+    bands = [1.5 + 0.01 * lon, -3.0 + 0.02 * lat, -1.0 + 0.01 * (lat + lon)]
+    write_grid(
+        path,
+        [(bands, -130.0, 60.0, 0.5)],
+        ["east_velocity", "north_velocity", "up_velocity"],
+        ["millimetres per year"] * 3,
+        pixel_is_area=True,
+    )
+    return path
+
+
+@pytest.fixture
+def points():
+    rng = np.random.default_rng(0)
+    lon = rng.uniform(-132, -108, 500)
+    lat = rng.uniform(43, 62, 500)
+    # Nodes, edges, corners and points around nodata values and the subgrid
+    lon[:8] = [-130, -110, -130, -110, -120, -125, -123, -114.75]
+    lat[:8] = [60, 45, 45, 60, 52.5, 48, 50, 49.75]
+    h = rng.uniform(-10, 100, 500)
+    return lon, lat, h
+
+
+def assert_matches_proj(proj, numpy, atol):
+    proj, numpy = np.asarray(proj), np.asarray(numpy)
+    np.testing.assert_array_equal(np.isinf(proj), np.isinf(numpy))
+    finite = np.isfinite(proj)
+    np.testing.assert_allclose(numpy[finite], proj[finite], rtol=0, atol=atol)
+
+
+def test_find_grid_file(geoid_grid):
+    assert find_grid_file(str(geoid_grid)) == geoid_grid
+    with pytest.raises(FileNotFoundError, match="sync_missing_grid_files"):
+        find_grid_file("missing_grid.tif")
+
+
+def test_load_grids_nests_subgrids(geoid_grid):
+    grids = load_grids(str(geoid_grid))
+    assert load_grids(str(geoid_grid)) is grids
+    assert len(grids) == 1
+    assert len(grids[0].children) == 1
+    assert grids[0].values.shape == (1, 31, 41)
+    assert grids[0].descriptions == ("geoid_undulation",)
+    assert grids[0].nodata.sum() == 6
+
+
+@pytest.mark.parametrize("inverse", [False, True])
+def test_vertical_grid_shift_matches_proj(geoid_grid, points, inverse):
+    step = f"+proj=vgridshift +grids={geoid_grid} +multiplier=1"
+    if inverse:
+        step = f"+inv {step}"
+    lon, lat, h = points
+    t = np.full(lon.shape, 2010.0)
+    expected = Transformer.from_pipeline(step).transform(lon, lat, h, t)
+
+    coords = (*np.radians([lon, lat]), h.copy(), t.copy())
+    VerticalGridShift(step)(*coords)
+
+    assert_matches_proj(expected[2:], coords[2:], atol=1e-9)
+    np.testing.assert_array_equal(np.isinf(expected[0]), np.isinf(coords[0]))
+
+
+@pytest.mark.parametrize("inverse", [False, True])
+@pytest.mark.parametrize("epoch", [2002.5, 2010.0, 2023.5])
+def test_deformation_matches_proj(velocity_grid, points, inverse, epoch):
+    step = f"+proj=deformation +t_epoch=2010 +grids={velocity_grid}"
+    if inverse:
+        step = f"+inv {step}"
+    cart = Transformer.from_pipeline("+proj=cart +ellps=GRS80")
+    x, y, z = cart.transform(*points)
+    t = np.full(x.shape, epoch)
+    expected = Transformer.from_pipeline(step).transform(x, y, z, t)
+
+    coords = tuple(np.array(c) for c in (x, y, z, t))
+    Deformation(step)(*coords)
+
+    assert_matches_proj(np.array(expected)[:3], coords[:3], atol=1e-9)
+
+
+def test_grid_pipeline_matches_proj(geoid_grid, velocity_grid, points):
+    proj_str = (
+        "+proj=pipeline +step +inv +proj=longlat +ellps=GRS80 "
+        "+step +proj=cart +ellps=GRS80 "
+        f"+step +inv +proj=deformation +t_epoch=2020 +grids={velocity_grid} "
+        "+step +inv +proj=cart +ellps=GRS80 "
+        f"+step +inv +proj=vgridshift +grids={geoid_grid} +multiplier=1 "
+        "+step +proj=utm +zone=10 +ellps=GRS80"
+    )
+    lon, lat, h = points
+    t = np.full(lon.shape, 2012.0)
+    expected = Transformer.from_pipeline(proj_str).transform(lon, lat, h, t)
+
+    pipeline = GridPipeline(proj_str)
+    assert len(pipeline.steps) == 6
+    assert_matches_proj(expected, pipeline.transform(lon, lat, h, t), atol=1e-8)
+
+    out = list(pipeline.itransform(zip(lon[:3], lat[:3], h[:3], t[:3])))
+    assert_matches_proj(np.array(expected)[:, :3].T, out, atol=1e-8)
+
+
+def test_grid_pipeline_itransform_streams():
+    pipeline = GridPipeline("+proj=cart +ellps=GRS80")
+    expected = pipeline.transform([-123.0], [49.0], [10.0], [2010.0])
+    read = []
+
+    def points() -> Iterator[tuple[float, ...]]:
+        while True:
+            read.append(1)
+            yield (-123.0, 49.0, 10.0, 2010.0)
+
+    out = pipeline.itransform(points())
+    first = next(out)
+
+    assert len(read) == 65_536
+    np.testing.assert_allclose(first, np.ravel(expected), atol=1e-9)
+
+
+def test_itransform_chunks():
+    calls = []
+
+    def transform(x, y, z, t, *, inplace) -> None:
+        assert inplace
+        assert len(x) == len(y) == len(z) == len(t)
+        calls.append(len(x))
+        x += 1
+
+    points = [(i, 0.0, 0.0, 2010.0) for i in range(5)]
+    out = list(itransform_chunks(transform, points, chunk_size=2))
+
+    assert calls == [2, 2, 1]
+    assert [p[0] for p in out] == [1.0, 2.0, 3.0, 4.0, 5.0]
+
+
+@pytest.mark.parametrize("inverse", [False, True])
+def test_cartesian_matches_proj(points, inverse):
+    step = "+proj=cart +ellps=GRS80"
+    lon, lat, h = points
+    t = np.full(lon.shape, 2010.0)
+    if inverse:
+        lon, lat, h = Transformer.from_pipeline(step).transform(lon, lat, h)
+        step = f"+inv {step}"
+    expected = Transformer.from_pipeline(step).transform(lon, lat, h, t)
+
+    coords = [np.array(c) for c in (lon, lat, h, t)]
+    if not inverse:
+        coords[:2] = np.radians(coords[:2])
+    Cartesian(step)(*coords)
+    if inverse:
+        coords[:2] = np.degrees(coords[:2])
+
+    assert_matches_proj(expected, coords, atol=1e-8)
+
+
+@pytest.mark.parametrize("inverse", [False, True])
+@pytest.mark.parametrize("per_point", [False, True])
+def test_helmert_matches_proj(points, inverse, per_point):
+    step = (
+        "proj=helmert convention=position_vector t_epoch=2010.000 "
+        "x=1.00530000 dx=0.00079000 y=-1.90921000 dy=-0.00060000 "
+        "z=-0.54157000 dz=-0.00144000 rx=-0.02678138 drx=-0.00006667 "
+        "ry=0.00042027 dry=0.00075744 rz=-0.01093206 drz=0.00005133 "
+        "s=0.00036891 ds=-0.00007201"
+    )
+    if inverse:
+        step = f"+inv {step}"
+    x, y, z = Transformer.from_pipeline("+proj=cart +ellps=GRS80").transform(*points)
+    t = np.linspace(1997, 2025, x.size) if per_point else np.full(x.size, 2023.5)
+    expected = Transformer.from_pipeline(step).transform(x, y, z, t)
+
+    coords = [np.array(c) for c in (x, y, z, t)]
+    Helmert(step)(*coords)
+
+    assert_matches_proj(expected, coords, atol=1e-8)
+
+
+def test_helmert_affine_ignores_concurrent_updates():
+    step = "proj=helmert t_epoch=2010 x=1 dx=0.1 s=0.1 ds=0.01"
+    expected = Helmert(step).affine(2020.0)
+    other = (2000.0, *Helmert(step).affine(2000.0))
+
+    class RacingHelmert(Helmert):
+        @property
+        def _affine(self) -> object:
+            return self.__dict__["cache"]
+
+        @_affine.setter
+        def _affine(self, value: object) -> None:
+            # Another thread caches the parameters of another epoch right after
+            self.__dict__["cache"] = value if value is None else other
+
+    for actual, value in zip(RacingHelmert(step).affine(2020.0), expected):
+        np.testing.assert_array_equal(actual, value)
+
+
+def test_grid_pipeline_inplace(geoid_grid, points):
+    pipeline = GridPipeline(f"+inv +proj=vgridshift +grids={geoid_grid} +multiplier=1")
+    lon, lat, h = (c.copy() for c in points)
+    t = np.full(lon.shape, 2010.0)
+    expected = pipeline.transform(lon, lat, h, t)
+
+    out = pipeline.transform(lon, lat, h, t, inplace=True)
+
+    assert out[2] is h
+    assert_matches_proj(expected[2], h, atol=0)
+
+
+def test_csrs_transformer_numpy_engine(velocity_grid, points):
+    config = {
+        "s_ref_frame": Reference.ITRF14,
+        "t_ref_frame": Reference.NAD83CSRS,
+        "s_coords": CoordType.GEOG,
+        "t_coords": CoordType.UTM10,
+        "s_epoch": 2023.5,
+        "t_epoch": 2010,
+        "s_vd": VerticalDatum.GRS80,
+        "t_vd": VerticalDatum.GRS80,
+        "epoch_shift_grid": str(velocity_grid),
+    }
+    trans = CSRSTransformer(**config, grid_engine="numpy")
+    expected = CSRSTransformer(**config).transform_arrays(*points)
+
+    assert trans.grid_engine == GridEngine.NUMPY
+    assert isinstance(trans.pipeline, GridPipeline)
+    assert_matches_proj(expected, trans.transform_arrays(*points), atol=1e-8)
+    assert_matches_proj(
+        expected,
+        trans.transform_arrays(*points, epoch=np.full(points[0].shape, 2023.5)),
+        atol=1e-8,
+    )
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from pyproj import Transformer
+
+from csrspy.kernels import (
+    cartesian_to_geodetic,
+    geodetic_to_cartesian,
+    helmert_affine,
+    helmert_rotation,
+    helmert_transform,
+)
+
+
+@pytest.fixture
+def geodetic():
+    rng = np.random.default_rng(0)
+    lon = rng.uniform(-180, 180, 1000)
+    lat = rng.uniform(-90, 90, 1000)
+    lat[:3] = [90, -90, 0]
+    h = rng.uniform(-100, 9000, 1000)
+    return lon, lat, h
+
+
+@pytest.mark.parametrize("ellps", ["GRS80", "WGS84"])
+def test_cartesian_conversions_match_proj(geodetic, ellps):
+    lon, lat, h = geodetic
+    cart = Transformer.from_pipeline(f"+proj=cart +ellps={ellps}")
+    expected = np.array(cart.transform(lon, lat, h))
+
+    xyz = np.array(geodetic_to_cartesian(np.radians(lon), np.radians(lat), h, ellps))
+    np.testing.assert_allclose(xyz, expected, rtol=0, atol=1e-8)
+
+    lon, lat, h = cart.transform(*expected, direction="INVERSE")
+    lam, phi, height = cartesian_to_geodetic(*expected, ellps)
+    np.testing.assert_allclose(np.degrees(lam), lon, rtol=0, atol=1e-12)
+    np.testing.assert_allclose(np.degrees(phi), lat, rtol=0, atol=1e-12)
+    np.testing.assert_allclose(height, h, rtol=0, atol=1e-8)
+
+
+def test_unknown_ellipsoid():
+    with pytest.raises(ValueError, match="Unsupported ellipsoid"):
+        geodetic_to_cartesian(0, 0, 0, "bessel")
+
+
+@pytest.mark.parametrize("inverse", [False, True])
+def test_helmert_affine_matches_helmert_transform(geodetic, inverse):
+    xyz = np.array(geodetic_to_cartesian(*np.radians(geodetic[:2]), geodetic[2]))
+    translation, rotations, scale = (1.0, -1.9, -0.5), (-0.027, 0.0004, -0.011), 0.4
+
+    matrix, offset = helmert_affine(
+        translation, helmert_rotation(*rotations), scale, inverse=inverse
+    )
+    n = xyz.shape[1]
+    expected = helmert_transform(
+        xyz,
+        np.repeat(np.reshape(translation, (3, 1)), n, axis=1),
+        helmert_rotation(*(np.full(n, r) for r in rotations)),
+        np.full(n, scale),
+        inverse=inverse,
+    )
+
+    assert matrix.shape == (3, 3)
+    np.testing.assert_allclose(matrix @ xyz + offset, expected, rtol=0, atol=1e-8)
+
+
+def test_helmert_round_trip(geodetic):
+    xyz = np.array(geodetic_to_cartesian(*np.radians(geodetic[:2]), geodetic[2]))
+    rotation = helmert_rotation(-0.027, 0.0004, -0.011, position_vector=False)
+
+    forward = helmert_transform(xyz, np.array([[1.0], [-1.9], [-0.5]]), rotation, 0.4)
+    back = helmert_transform(
+        forward, np.array([[1.0], [-1.9], [-0.5]]), rotation, 0.4, inverse=True
+    )
+
+    # The linearized rotation is not exactly orthogonal, as in PROJ
+    np.testing.assert_allclose(back, xyz, rtol=0, atol=1e-6)
@@ -0,0 +1,136 @@
+import numpy as np
+import pytest
+
+from csrspy import CSRSTransformer
+from csrspy.enums import CoordType, Reference, RoundingMode, VerticalDatum
+from csrspy.las import transform_scaled
+
+SCALE = (1e-7, 1e-7, 0.001)
+OFFSET = (-123.0, 49.0, 0.0)
+OUT_SCALE = 0.01
+OUT_OFFSET = (500_000.0, 5_400_000.0, 0.0)
+
+
+@pytest.fixture
+def transformer():
+    return CSRSTransformer(
+        s_ref_frame=Reference.ITRF14,
+        t_ref_frame=Reference.NAD83CSRS,
+        s_coords=CoordType.GEOG,
+        t_coords=CoordType.UTM10,
+        s_epoch=2010,
+        s_vd=VerticalDatum.GRS80,
+        t_vd=VerticalDatum.GRS80,
+    )
+
+
+@pytest.fixture
+def scaled():
+    rng = np.random.default_rng(3)
+    return tuple(
+        rng.integers(-5_000_000, 5_000_000, 100, dtype=np.int32) for _ in "xyz"
+    )
+
+
+def expected_output(transformer, scaled, rounding=np.rint):
+    coords = [c * s + o for c, s, o in zip(scaled, SCALE, OFFSET)]
+    x, y, z = transformer.transform_arrays(*coords)
+    return [
+        rounding((c - o) / OUT_SCALE).astype(np.int32)
+        for c, o in zip((x, y, z), OUT_OFFSET)
+    ]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1000])
+def test_transform_scaled(transformer, scaled, chunk_size):
+    out = transform_scaled(
+        transformer,
+        *scaled,
+        SCALE,
+        OFFSET,
+        out_scale=OUT_SCALE,
+        out_offset=OUT_OFFSET,
+        chunk_size=chunk_size,
+    )
+    assert all(o.dtype == np.int32 for o in out)
+    for o, e in zip(out, expected_output(transformer, scaled)):
+        np.testing.assert_array_equal(o, e)
+
+
+@pytest.mark.parametrize(
+    ("rounding", "func"),
+    [
+        (RoundingMode.NEAREST_EVEN, np.rint),
+        (RoundingMode.FLOOR, np.floor),
+        (RoundingMode.CEIL, np.ceil),
+        ("trunc", np.trunc),
+    ],
+)
+def test_transform_scaled_rounding(transformer, scaled, rounding, func):
+    out = transform_scaled(
+        transformer,
+        *scaled,
+        SCALE,
+        OFFSET,
+        out_scale=OUT_SCALE,
+        out_offset=OUT_OFFSET,
+        rounding=rounding,
+    )
+    for o, e in zip(out, expected_output(transformer, scaled, func)):
+        np.testing.assert_array_equal(o, e)
+
+
+def test_transform_scaled_nearest_rounds_halves_away_from_zero():
+    class Identity:
+        def transform_arrays(self, x, y, z, *, epoch, inplace) -> None:
+            pass
+
+    values = np.array([-3, -1, 1, 3, 4], dtype=np.int32)
+    out = transform_scaled(Identity(), values, values, values, 0.5, 0, out_scale=1)
+    np.testing.assert_array_equal(out[0], [-2, -1, 1, 2, 2])
+
+
+def test_transform_scaled_inplace_and_out(transformer, scaled):
+    expected = transform_scaled(
+        transformer, *scaled, SCALE, OFFSET, out_scale=OUT_SCALE, out_offset=OUT_OFFSET
+    )
+
+    buffers = tuple(np.empty(100, dtype=np.int32) for _ in range(3))
+    out = transform_scaled(
+        transformer,
+        *scaled,
+        SCALE,
+        OFFSET,
+        out_scale=OUT_SCALE,
+        out_offset=OUT_OFFSET,
+        out=buffers,
+    )
+    assert all(a is b for a, b in zip(out, buffers))
+
+    coords = tuple(c.copy() for c in scaled)
+    out = transform_scaled(
+        transformer,
+        *coords,
+        SCALE,
+        OFFSET,
+        out_scale=OUT_SCALE,
+        out_offset=OUT_OFFSET,
+        inplace=True,
+    )
+    assert all(a is b for a, b in zip(out, coords))
+    for a, b, c in zip(expected, buffers, coords):
+        np.testing.assert_array_equal(a, b)
+        np.testing.assert_array_equal(a, c)
+
+
+def test_transform_scaled_errors(transformer, scaled):
+    with pytest.raises(ValueError, match="do not fit in an int32"):
+        transform_scaled(transformer, *scaled, SCALE, OFFSET, out_scale=1e-9)
+    with pytest.raises(ValueError, match="one value per axis"):
+        transform_scaled(transformer, *scaled, (1, 2), OFFSET)
+    with pytest.raises(ValueError, match="int32 NumPy arrays"):
+        transform_scaled(
+            transformer, *scaled, SCALE, OFFSET, out=tuple(np.empty(100) for _ in "xyz")
+        )
+    with pytest.raises(ValueError, match="same shape"):
+        transform_scaled(transformer, scaled[0][:2], *scaled[1:], SCALE, OFFSET)
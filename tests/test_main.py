@@ -1,9 +1,27 @@
+import asyncio
+import threading
+from collections.abc import AsyncIterator
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
 import pytest
 
-from csrspy import CSRSTransformer
+import csrspy
+from csrspy import (
+    CSRSTransformer,
+    clear_transformer_cache,
+    get_transformer,
+    transformer_cache_info,
+)
 from csrspy.enums import CoordType, Reference, VerticalDatum
 
 
+def _same_cases(test) -> pytest.MarkDecorator:
+    """Parametrize a test with the cases of an existing parametrized test."""
+    (mark,) = test.pytestmark
+    return pytest.mark.parametrize(*mark.args, **mark.kwargs)
+
+
 @pytest.mark.parametrize(
     ("transform_config", "test_input", "expected", "xy_err", "h_err"),
     [
@@ -436,6 +454,18 @@ def test_csrs_transformer_itrf_to_nad83(
     assert pytest.approx(out[2], abs=h_err) == expected[2]
 
 
+@_same_cases(test_csrs_transformer_itrf_to_nad83)
+def test_transform_arrays_itrf_to_nad83(
+    transform_config, test_input, expected, xy_err, h_err
+):
+    trans = CSRSTransformer(**transform_config)
+    x, y, z = trans.transform_arrays(*np.array([test_input]).T)
+
+    assert pytest.approx(x[0], abs=xy_err) == expected[0]
+    assert pytest.approx(y[0], abs=xy_err) == expected[1]
+    assert pytest.approx(z[0], abs=h_err) == expected[2]
+
+
 @pytest.mark.parametrize(
     ("transform_config", "test_input", "expected", "xy_err", "h_err"),
     [
@@ -868,6 +898,18 @@ def test_csrs_transformer_nad83_to_itrf(
     assert pytest.approx(out[2], abs=h_err) == expected[2]
 
 
+@_same_cases(test_csrs_transformer_nad83_to_itrf)
+def test_transform_arrays_nad83_to_itrf(
+    transform_config, test_input, expected, xy_err, h_err
+):
+    trans = CSRSTransformer(**transform_config)
+    x, y, z = trans.transform_arrays(*np.array([test_input]).T)
+
+    assert pytest.approx(x[0], abs=xy_err) == expected[0]
+    assert pytest.approx(y[0], abs=xy_err) == expected[1]
+    assert pytest.approx(z[0], abs=h_err) == expected[2]
+
+
 def test_csrs_transformer_nad83_ortho_to_ortho_transform():
     trans = CSRSTransformer(
         s_ref_frame=Reference.NAD83CSRS,
@@ -1134,3 +1176,655 @@ def test_ecef_epoch_transformations(ref_frame, epoch, test_input, expected, err)
     assert pytest.approx(out[0], abs=err) == expected[0]
     assert pytest.approx(out[1], abs=err) == expected[1]
     assert pytest.approx(out[2], abs=err) == expected[2]
+
+
+def test_transform_arrays_matches_call():
+    trans = CSRSTransformer(
+        s_ref_frame=Reference.ITRF14,
+        t_ref_frame=Reference.NAD83CSRS,
+        s_coords=CoordType.GEOG,
+        t_coords=CoordType.UTM10,
+        s_epoch=2010,
+        t_epoch=2010,
+        s_vd=VerticalDatum.GRS80,
+        t_vd=VerticalDatum.GRS80,
+    )
+    rng = np.random.default_rng(42)
+    lon = rng.uniform(-126, -120, 100)
+    lat = rng.uniform(46, 52, 100)
+    h = rng.uniform(-10, 100, 100)
+
+    x, y, z = trans.transform_arrays(lon, lat, h)
+    expected = np.array(list(trans(zip(lon, lat, h))))
+
+    np.testing.assert_allclose(x, expected[:, 0], atol=0.001)
+    np.testing.assert_allclose(y, expected[:, 1], atol=0.001)
+    np.testing.assert_allclose(z, expected[:, 2], atol=0.001)
+
+
+def test_transform_arrays_shape_mismatch():
+    trans = CSRSTransformer(
+        s_ref_frame=Reference.ITRF14,
+        t_ref_frame=Reference.NAD83CSRS,
+        s_coords=CoordType.GEOG,
+        s_epoch=2010,
+        s_vd=VerticalDatum.GRS80,
+        t_vd=VerticalDatum.GRS80,
+    )
+    with pytest.raises(ValueError, match="same shape"):
+        trans.transform_arrays([0, 1], [0, 1], [0])
+
+
+def test_fused_pipeline_matches_stages():
+    trans = CSRSTransformer(
+        s_ref_frame=Reference.ITRF14,
+        t_ref_frame=Reference.ITRF00,
+        s_coords=CoordType.GEOG,
+        t_coords=CoordType.UTM10,
+        s_epoch=2010,
+        t_epoch=2010,
+        s_vd=VerticalDatum.GRS80,
+        t_vd=VerticalDatum.GRS80,
+    )
+    assert trans.proj_str.startswith("+proj=pipeline")
+
+    coords = [(-123.365646, 48.428421, 0)]
+    for transformer in trans.transformers:
+        coords = transformer(coords)
+    expected = next(iter(coords))
+    out = next(iter(trans([(-123.365646, 48.428421, 0)])))
+
+    assert pytest.approx(out[0], abs=1e-6) == expected[0]
+    assert pytest.approx(out[1], abs=1e-6) == expected[1]
+    assert pytest.approx(out[2], abs=1e-6) == expected[2]
+
+
+@pytest.mark.parametrize(
+    ("s_ref_frame", "t_ref_frame"),
+    [
+        (Reference.ITRF14, Reference.NAD83CSRS),
+        (Reference.NAD83CSRS, Reference.ITRF14),
+        (Reference.ITRF14, Reference.ITRF00),
+    ],
+)
+def test_fused_pipeline_skips_inverted_noops(s_ref_frame, t_ref_frame):
+    trans = CSRSTransformer(
+        s_ref_frame=s_ref_frame,
+        t_ref_frame=t_ref_frame,
+        s_coords=CoordType.GEOG,
+        t_coords=CoordType.UTM10,
+        s_epoch=2010,
+        t_epoch=2010,
+        s_vd=VerticalDatum.GRS80,
+        t_vd=VerticalDatum.GRS80,
+    )
+    assert "noop" not in trans.proj_str
+
+
+def test_get_transformer_cache():
+    clear_transformer_cache()
+    config = {
+        "s_ref_frame": Reference.ITRF14,
+        "t_ref_frame": Reference.NAD83CSRS,
+        "s_coords": CoordType.GEOG,
+        "t_coords": CoordType.UTM10,
+        "s_epoch": 2010,
+        "s_vd": VerticalDatum.GRS80,
+        "t_vd": VerticalDatum.GRS80,
+    }
+    trans = get_transformer(**config)
+    assert isinstance(trans, CSRSTransformer)
+    assert get_transformer(**config) is trans
+    assert get_transformer(**{**config, "s_ref_frame": "itrf14"}) is trans
+
+    info = transformer_cache_info()
+    assert info.misses == 1
+    assert info.hits == 2
+
+    clear_transformer_cache()
+    assert transformer_cache_info().currsize == 0
+    assert get_transformer(**config) is not trans
+
+
+@pytest.mark.parametrize(("workers", "chunk_size"), [(1, None), (4, None), (3, 7)])
+def test_transform_parallel_matches_arrays(workers, chunk_size):
+    trans = CSRSTransformer(
+        s_ref_frame=Reference.ITRF14,
+        t_ref_frame=Reference.ITRF00,
+        s_coords=CoordType.GEOG,
+        t_coords=CoordType.UTM10,
+        s_epoch=2010,
+        s_vd=VerticalDatum.GRS80,
+        t_vd=VerticalDatum.GRS80,
+    )
+    rng = np.random.default_rng(0)
+    lon = rng.uniform(-126, -120, (10, 10))
+    lat = rng.uniform(46, 52, (10, 10))
+    h = rng.uniform(-10, 100, (10, 10))
+
+    expected = trans.transform_arrays(lon, lat, h)
+    out = trans.transform_parallel(lon, lat, h, workers=workers, chunk_size=chunk_size)
+
+    for a, b in zip(out, expected):
+        assert a.shape == (10, 10)
+        np.testing.assert_allclose(a, b, atol=1e-9)
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_transform_chunks(workers):
+    trans = CSRSTransformer(
+        s_ref_frame=Reference.ITRF14,
+        t_ref_frame=Reference.NAD83CSRS,
+        s_coords=CoordType.GEOG,
+        t_coords=CoordType.UTM10,
+        s_epoch=2010,
+        s_vd=VerticalDatum.GRS80,
+        t_vd=VerticalDatum.GRS80,
+    )
+    rng = np.random.default_rng(1)
+    coords = np.column_stack(
+        [
+            rng.uniform(-126, -120, 95),
+            rng.uniform(46, 52, 95),
+            rng.uniform(-10, 100, 95),
+        ]
+    )
+    blocks = (block.T for block in np.array_split(coords, 4))
+
+    out = list(trans.transform_chunks(blocks, workers=workers))
+    expected = trans.transform_arrays(*coords.T)
+
+    assert [len(x) for x, _, _ in out] == [24, 24, 24, 23]
+    for a, b in zip(zip(*out), expected):
+        np.testing.assert_allclose(np.concatenate(a), b, atol=1e-9)
+
+
+def test_transform_chunks_splits_large_blocks():
+    trans = CSRSTransformer(
+        s_ref_frame=Reference.ITRF14,
+        t_ref_frame=Reference.NAD83CSRS,
+        s_coords=CoordType.GEOG,
+        t_coords=CoordType.UTM10,
+        s_epoch=2010,
+        s_vd=VerticalDatum.GRS80,
+        t_vd=VerticalDatum.GRS80,
+    )
+    rng = np.random.default_rng(2)
+    coords = np.stack(
+        [
+            rng.uniform(-126, -120, (5, 5)),
+            rng.uniform(46, 52, (5, 5)),
+            rng.uniform(-10, 100, (5, 5)),
+        ]
+    )
+    blocks = [tuple(coords), tuple(coords[:, 0, :3])]
+
+    out = list(trans.transform_chunks(blocks, max_block=10))
+    expected = trans.transform_arrays(*coords)
+
+    assert [len(x) for x, _, _ in out] == [10, 10, 5, 3]
+    for a, b in zip(zip(*out[:3]), expected):
+        np.testing.assert_allclose(np.concatenate(a), b.reshape(-1), atol=1e-9)
+
+    with pytest.raises(ValueError, match="max_block"):
+        list(trans.transform_chunks(blocks, max_block=0))
+
+
+@pytest.fixture
+def geog_to_utm():
+    return CSRSTransformer(
+        s_ref_frame=Reference.ITRF14,
+        t_ref_frame=Reference.NAD83CSRS,
+        s_coords=CoordType.GEOG,
+        t_coords=CoordType.UTM10,
+        s_epoch=2010,
+        s_vd=VerticalDatum.GRS80,
+        t_vd=VerticalDatum.GRS80,
+    )
+
+
+@pytest.mark.parametrize("method", ["transform_arrays", "transform_parallel"])
+def test_transform_arrays_inplace(geog_to_utm, method):
+    coords = np.array([[-123.365646, -123.0], [48.428421, 49.0], [0.0, 10.0]])
+    expected = geog_to_utm.transform_arrays(*coords)
+
+    x, y, z = coords.copy()
+    out = getattr(geog_to_utm, method)(x, y, z, inplace=True)
+
+    assert out[0] is x
+    assert out[1] is y
+    assert out[2] is z
+    np.testing.assert_allclose(np.stack(out), np.stack(expected), atol=1e-9)
+
+
+@pytest.mark.parametrize("method", ["transform_arrays", "transform_parallel"])
+def test_transform_arrays_out(geog_to_utm, method):
+    coords = np.array([[-123.365646, -123.0], [48.428421, 49.0], [0.0, 10.0]])
+    expected = geog_to_utm.transform_arrays(*coords)
+
+    buffers = tuple(np.empty(2) for _ in range(3))
+    out = getattr(geog_to_utm, method)(*coords, out=buffers)
+
+    assert all(a is b for a, b in zip(out, buffers))
+    np.testing.assert_allclose(np.stack(out), np.stack(expected), atol=1e-9)
+    np.testing.assert_array_equal(
+        coords, [[-123.365646, -123.0], [48.428421, 49.0], [0.0, 10.0]]
+    )
+
+
+def test_transform_arrays_invalid_buffers(geog_to_utm):
+    coords = np.ones((3, 4))
+    with pytest.raises(ValueError, match="C-contiguous float64"):
+        geog_to_utm.transform_arrays(*coords[:, ::2], inplace=True)
+    with pytest.raises(ValueError, match="C-contiguous float64"):
+        geog_to_utm.transform_arrays(
+            *coords, out=tuple(np.empty(4, "f4") for _ in range(3))
+        )
+    with pytest.raises(ValueError, match="same shape"):
+        geog_to_utm.transform_arrays(*coords, out=tuple(np.empty(3) for _ in range(3)))
+    with pytest.raises(ValueError, match="cannot be used together"):
+        geog_to_utm.transform_arrays(*coords, inplace=True, out=tuple(coords))
+
+
+@pytest.mark.parametrize(
+    ("s_ref_frame", "t_ref_frame"),
+    [
+        (Reference.ITRF14, Reference.NAD83CSRS),
+        (Reference.NAD83CSRS, Reference.ITRF14),
+        (Reference.ITRF14, Reference.ITRF08),
+        (Reference.NAD83CSRS, Reference.NAD83CSRS),
+    ],
+)
+def test_transform_arrays_per_point_epochs(s_ref_frame, t_ref_frame):
+    config = {
+        "s_ref_frame": s_ref_frame,
+        "t_ref_frame": t_ref_frame,
+        "s_coords": CoordType.GEOG,
+        "t_coords": CoordType.GEOG,
+        "t_epoch": 2010,
+        "s_vd": VerticalDatum.GRS80,
+        "t_vd": VerticalDatum.GRS80,
+    }
+    lon = np.array([-123.365646, -124.0, -122.5])
+    lat = np.array([48.428421, 49.5, 50.0])
+    h = np.array([0.0, 10.0, 100.0])
+    epochs = np.array([2002.0, 2010.0, 2023.5])
+
+    trans = CSRSTransformer(**config, s_epoch=2015)
+    out = np.stack(trans.transform_arrays(lon, lat, h, epoch=epochs))
+
+    for i, epoch in enumerate(epochs):
+        expected = CSRSTransformer(**config, s_epoch=epoch).transform_arrays(
+            lon[i], lat[i], h[i]
+        )
+        np.testing.assert_allclose(out[:, i], expected, atol=1e-9)
+
+
+def test_transform_arrays_datetime64_epochs(geog_to_utm):
+    coords = np.array([[-123.365646, -123.0], [48.428421, 49.0], [0.0, 10.0]])
+    dates = np.array(["2010-01-01", "2020-07-02"], dtype="datetime64[D]")
+
+    out = geog_to_utm.transform_arrays(*coords, epoch=dates)
+    expected = geog_to_utm.transform_arrays(*coords, epoch=[2010.0, 2020.5])
+    parallel = geog_to_utm.transform_parallel(*coords, epoch=dates, workers=2)
+    chunks = list(geog_to_utm.transform_chunks([(*coords, dates)]))
+
+    np.testing.assert_allclose(np.stack(out), np.stack(expected), atol=1e-9)
+    np.testing.assert_allclose(np.stack(parallel), np.stack(expected), atol=1e-9)
+    np.testing.assert_allclose(np.stack(chunks[0]), np.stack(expected), atol=1e-9)
+
+
+def test_transform_chunks_splits_epochs(geog_to_utm):
+    coords = np.array([[-123.365646, -123.0, -122.5], [48.428421, 49.0, 50.0]])
+    coords = np.vstack([coords, np.zeros(3)])
+    epochs = np.array([2010.0, 2015.0, 2020.5])
+
+    out = list(geog_to_utm.transform_chunks([(*coords, epochs)], max_block=2))
+    expected = geog_to_utm.transform_arrays(*coords, epoch=epochs)
+
+    for a, b in zip(zip(*out), expected):
+        np.testing.assert_allclose(np.concatenate(a), b, atol=1e-9)
+
+
+def test_transform_arrays_scalar_epoch_matches_s_epoch(geog_to_utm):
+    coords = np.array([[-123.365646, -123.0], [48.428421, 49.0], [0.0, 10.0]])
+
+    out = geog_to_utm.transform_arrays(*coords, epoch=2010)
+    expected = geog_to_utm.transform_arrays(*coords)
+
+    np.testing.assert_allclose(np.stack(out), np.stack(expected), atol=1e-9)
+
+
+def test_transform_arrays_epoch_shape_mismatch(geog_to_utm):
+    with pytest.raises(ValueError, match="broadcastable"):
+        geog_to_utm.transform_arrays([0, 1], [0, 1], [0, 1], epoch=[2010, 2011, 2012])
+
+
+@pytest.fixture
+def structured_points():
+    points = np.zeros(
+        5,
+        dtype=[
+            ("x", "f8"),
+            ("y", "f8"),
+            ("z", "f4"),
+            ("gps_time", "f8"),
+            ("intensity", "u2"),
+        ],
+    )
+    points["x"] = np.linspace(-124.0, -122.0, 5)
+    points["y"] = np.linspace(48.0, 50.0, 5)
+    points["z"] = np.linspace(0.0, 100.0, 5)
+    points["gps_time"] = np.linspace(2002.0, 2023.5, 5)
+    points["intensity"] = np.arange(5)
+    return points
+
+
+@pytest.mark.parametrize("chunk_size", [2, 65_536])
+def test_transform_structured(geog_to_utm, structured_points, chunk_size):
+    expected = geog_to_utm.transform_arrays(
+        structured_points["x"], structured_points["y"], structured_points["z"]
+    )
+    original = structured_points.copy()
+
+    out = geog_to_utm.transform_structured(structured_points, chunk_size=chunk_size)
+
+    assert out is structured_points
+    np.testing.assert_allclose(out["x"], expected[0], atol=1e-9)
+    np.testing.assert_allclose(out["y"], expected[1], atol=1e-9)
+    np.testing.assert_allclose(out["z"], expected[2].astype("f4"))
+    np.testing.assert_array_equal(out["gps_time"], original["gps_time"])
+    np.testing.assert_array_equal(out["intensity"], original["intensity"])
+
+
+@pytest.mark.parametrize(
+    ("s_ref_frame", "t_ref_frame"),
+    [
+        (Reference.NAD83CSRS, Reference.ITRF14),
+        (Reference.ITRF14, Reference.ITRF08),
+    ],
+)
+def test_transform_structured_epoch_change(s_ref_frame, t_ref_frame, structured_points):
+    trans = CSRSTransformer(
+        s_ref_frame=s_ref_frame,
+        t_ref_frame=t_ref_frame,
+        s_coords=CoordType.GEOG,
+        t_coords=CoordType.GEOG,
+        s_epoch=2002,
+        t_epoch=2020,
+        s_vd=VerticalDatum.GRS80,
+        t_vd=VerticalDatum.GRS80,
+    )
+    expected = trans.transform_arrays(
+        structured_points["x"], structured_points["y"], structured_points["z"]
+    )
+
+    trans.transform_structured(structured_points, chunk_size=2)
+
+    np.testing.assert_allclose(structured_points["x"], expected[0], atol=1e-9)
+    np.testing.assert_allclose(structured_points["y"], expected[1], atol=1e-9)
+    np.testing.assert_allclose(structured_points["z"], expected[2].astype("f4"))
+
+
+def test_transform_structured_record_array_fields(geog_to_utm, structured_points):
+    points = np.rec.fromarrays(
+        [structured_points[name] for name in ("x", "y", "z")],
+        names=["lon", "lat", "height"],
+    )
+    expected = geog_to_utm.transform_arrays(points.lon, points.lat, points.height)
+
+    geog_to_utm.transform_structured(points, ("lon", "lat", "height"))
+
+    np.testing.assert_allclose(points.lon, expected[0], atol=1e-9)
+    np.testing.assert_allclose(points.lat, expected[1], atol=1e-9)
+
+
+def test_transform_structured_time_field(geog_to_utm, structured_points):
+    expected = geog_to_utm.transform_arrays(
+        structured_points["x"],
+        structured_points["y"],
+        structured_points["z"],
+        epoch=structured_points["gps_time"],
+    )
+
+    geog_to_utm.transform_structured(
+        structured_points, time_field="gps_time", chunk_size=3
+    )
+
+    np.testing.assert_allclose(structured_points["x"], expected[0], atol=1e-9)
+    np.testing.assert_allclose(structured_points["y"], expected[1], atol=1e-9)
+    np.testing.assert_array_equal(
+        structured_points["gps_time"], np.linspace(2002.0, 2023.5, 5)
+    )
+
+
+def test_transform_structured_invalid(geog_to_utm, structured_points):
+    with pytest.raises(ValueError, match="structured array"):
+        geog_to_utm.transform_structured(np.zeros(3))
+    with pytest.raises(ValueError, match="no fields named lon"):
+        geog_to_utm.transform_structured(structured_points, ("lon", "y", "z"))
+    with pytest.raises(ValueError, match="floating point"):
+        geog_to_utm.transform_structured(structured_points, ("x", "y", "intensity"))
+    with pytest.raises(ValueError, match="x, y, and z"):
+        geog_to_utm.transform_structured(structured_points, ("x", "y"))
+
+    structured_points.flags.writeable = False
+    with pytest.raises(ValueError, match="writeable"):
+        geog_to_utm.transform_structured(structured_points)
+
+
+def test_nad83_to_nad83_skips_itrf_round_trip():
+    config = {
+        "s_ref_frame": Reference.NAD83CSRS,
+        "t_ref_frame": Reference.NAD83CSRS,
+        "s_coords": CoordType.GEOG,
+        "t_coords": CoordType.UTM10,
+        "s_epoch": 2010,
+        "s_vd": VerticalDatum.CGG2013A,
+    }
+    trans = CSRSTransformer(**config, t_epoch=2010, t_vd=VerticalDatum.CGG2013A)
+    assert "helmert" not in trans.proj_str
+    assert "cart" not in trans.proj_str
+    assert "vgridshift" not in trans.proj_str
+
+    trans = CSRSTransformer(**config, t_epoch=2020, t_vd=VerticalDatum.HT2_2010v70)
+    assert "helmert" not in trans.proj_str
+    assert "deformation" in trans.proj_str
+    assert trans.proj_str.count("vgridshift") == 2
+
+
+def test_itrf_to_itrf_composes_helmert():
+    config = {
+        "s_ref_frame": Reference.ITRF08,
+        "t_ref_frame": Reference.ITRF20,
+        "s_coords": CoordType.GEOG,
+        "t_coords": CoordType.UTM10,
+        "s_epoch": 2010,
+        "s_vd": VerticalDatum.GRS80,
+        "t_vd": VerticalDatum.GRS80,
+    }
+    trans = CSRSTransformer(**config)
+    assert len(trans.transformers) == 1
+    assert trans.proj_str.count("helmert") == 1
+    assert "deformation" not in trans.proj_str
+
+    trans = CSRSTransformer(**config, t_epoch=2020)
+    assert trans.proj_str.count("helmert") == 2
+    assert "deformation" in trans.proj_str
+
+
+@pytest.mark.parametrize("epoch", [None, [2002.0, 2023.5]])
+def test_profile_records_stages(geog_to_utm, epoch):
+    coords = np.array([[-123.365646, -123.0], [48.428421, 49.0], [0.0, 10.0]])
+    expected = geog_to_utm.transform_arrays(*coords, epoch=epoch)
+
+    geog_to_utm.profile = True
+    out = geog_to_utm.transform_arrays(*coords, epoch=epoch)
+    np.testing.assert_allclose(np.stack(out), np.stack(expected), atol=1e-8)
+
+    stats = geog_to_utm.stage_stats(variable_epochs=epoch is not None)
+    if epoch is None:
+        assert len(stats) == sum(len(t.stages) for t in geog_to_utm.transformers)
+    assert all(s.calls == 1 and s.points == 2 and s.seconds > 0 for s in stats)
+
+    geog_to_utm.reset_profile()
+    assert all(s.calls == s.points == 0 for s in stats)
+
+
+def test_profile_matches_call():
+    trans = CSRSTransformer(
+        s_ref_frame=Reference.ITRF14,
+        t_ref_frame=Reference.ITRF00,
+        s_coords=CoordType.GEOG,
+        t_coords=CoordType.UTM10,
+        s_epoch=2010,
+        t_epoch=2020,
+        s_vd=VerticalDatum.GRS80,
+        t_vd=VerticalDatum.GRS80,
+        profile=True,
+    )
+    coords = [(-123.365646, 48.428421, 0)]
+    out = next(iter(trans(coords)))
+    trans.profile = False
+    expected = next(iter(trans(coords)))
+
+    assert out == pytest.approx(expected, abs=1e-6)
+    stats = trans.stage_stats()
+    assert [s.transformer for s in stats] == [0] * 6 + [1] * 5
+    assert stats[6].proj_str.startswith("+proj=pipeline +step +proj=set +v_4=")
+
+
+def test_explain(geog_to_utm, capsys):
+    geog_to_utm.explain()
+    before = capsys.readouterr().out
+    assert "profile: False" in before
+    assert "not profiled" in before
+    assert "+proj=helmert" in before or "proj=helmert" in before
+
+    geog_to_utm.profile = True
+    geog_to_utm.transform_arrays([-123.0], [49.0], [0.0])
+    geog_to_utm.explain()
+    after = capsys.readouterr().out
+    assert "1 calls, 1 points" in after
+    assert "Total:" in after
+
+
+def test_lazy_package_attributes():
+    assert csrspy.CSRSTransformer is CSRSTransformer
+    assert "get_transformer" in dir(csrspy)
+    with pytest.raises(AttributeError, match="no attribute 'missing'"):
+        _ = csrspy.missing
+
+
+def test_atransform_matches_arrays(geog_to_utm):
+    rng = np.random.default_rng(0)
+    coords = (rng.uniform(-126, -120, 10), rng.uniform(46, 52, 10), np.zeros(10))
+    epochs = np.linspace(2002, 2020, 10)
+
+    out = asyncio.run(geog_to_utm.atransform(*coords, epoch=epochs, chunk_size=3))
+    expected = geog_to_utm.transform_arrays(*coords, epoch=epochs)
+
+    np.testing.assert_allclose(np.stack(out), np.stack(expected), atol=1e-9)
+    with pytest.raises(ValueError, match="chunk_size"):
+        asyncio.run(geog_to_utm.atransform(*coords, chunk_size=0))
+
+
+def test_atransform_chunks(geog_to_utm):
+    blocks = [
+        (np.full(n, -123.0), np.full(n, 49.0), np.arange(n, dtype=float))
+        for n in (5, 1, 3)
+    ]
+
+    async def source() -> AsyncIterator[tuple]:
+        for block in blocks:
+            await asyncio.sleep(0)
+            yield block
+
+    async def collect(chunks, prefetch=2) -> list:
+        return [
+            c async for c in geog_to_utm.atransform_chunks(chunks, prefetch=prefetch)
+        ]
+
+    expected = list(geog_to_utm.transform_chunks(blocks))
+    for out in (
+        asyncio.run(collect(blocks)),
+        asyncio.run(collect(source(), prefetch=1)),
+    ):
+        assert len(out) == len(expected)
+        for a, b in zip(out, expected):
+            np.testing.assert_allclose(np.stack(a), np.stack(b), atol=1e-9)
+
+
+def test_atransform_cancellation(geog_to_utm):
+    class BlockingExecutor(ThreadPoolExecutor):
+        def __init__(self) -> None:
+            super().__init__(max_workers=1)
+            self.release = threading.Event()
+            self.futures = []
+            super().submit(self.release.wait)
+
+        def submit(self, fn, /, *args: object) -> Future:
+            future = super().submit(fn, *args)
+            self.futures.append(future)
+            return future
+
+    async def cancel(executor) -> None:
+        task = asyncio.create_task(
+            geog_to_utm.atransform(
+                np.zeros(10),
+                np.zeros(10),
+                np.zeros(10),
+                chunk_size=2,
+                executor=executor,
+            )
+        )
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    with BlockingExecutor() as executor:
+        asyncio.run(cancel(executor))
+        executor.release.set()
+        assert len(executor.futures) == 5
+        assert all(f.cancelled() for f in executor.futures)
+
+
+def test_warmup_without_grids(geog_to_utm):
+    report = geog_to_utm.warmup()
+    assert geog_to_utm.grid_files() == []
+    assert report.grids == {}
+    assert report.probe_points > 0
+    assert report.total == report.probe > 0
+    assert "probe" in str(report)
+
+
+@pytest.mark.parametrize("variable_epochs", [False, True])
+def test_warmup_loads_grids(variable_epochs):
+    trans = CSRSTransformer(
+        s_ref_frame=Reference.ITRF14,
+        t_ref_frame=Reference.NAD83CSRS,
+        s_coords=CoordType.GEOG,
+        s_epoch=2010,
+        t_epoch=2010,
+        s_vd=VerticalDatum.GRS80,
+        t_vd=VerticalDatum.CGG2013A,
+        warmup=True,
+    )
+    expected = ["ca_nrc_CGG2013an83.tif"]
+    if variable_epochs:
+        expected.insert(0, "ca_nrc_NAD83v70VG.tif")
+
+    report = trans.warmup(variable_epochs=variable_epochs)
+    assert trans.grid_files(variable_epochs=variable_epochs) == expected
+    assert list(report.grids) == expected
+
+
+def test_warmup_missing_grid(geog_to_utm, monkeypatch):
+    def find_grid_file(name) -> None:
+        raise FileNotFoundError(name)
+
+    monkeypatch.setattr("csrspy.main.find_grid_file", find_grid_file)
+    monkeypatch.setattr(geog_to_utm, "_grid_steps", lambda **_: {"a.tif": "x"})
+    with pytest.raises(FileNotFoundError, match=r"a\.tif"):
+        geog_to_utm.warmup()
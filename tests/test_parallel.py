@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from csrspy import CSRSTransformer
+from csrspy.enums import CoordType, Reference, VerticalDatum
+from csrspy.parallel import ProcessPoolTransformer
+
+
+@pytest.fixture(scope="module")
+def transformer():
+    return CSRSTransformer(
+        s_ref_frame=Reference.ITRF14,
+        t_ref_frame=Reference.ITRF00,
+        s_coords=CoordType.GEOG,
+        t_coords=CoordType.UTM10,
+        s_epoch=2010,
+        s_vd=VerticalDatum.GRS80,
+        t_vd=VerticalDatum.GRS80,
+    )
+
+
+@pytest.mark.parametrize("chunk_size", [None, 7])
+def test_process_pool_matches_arrays(transformer, chunk_size):
+    rng = np.random.default_rng(0)
+    lon = rng.uniform(-126, -120, (10, 10))
+    lat = rng.uniform(46, 52, (10, 10))
+    h = rng.uniform(-10, 100, (10, 10))
+
+    expected = transformer.transform_arrays(lon, lat, h)
+    with ProcessPoolTransformer(transformer, workers=2) as pool:
+        out = pool.transform_arrays(lon, lat, h, chunk_size=chunk_size)
+        # The pool is reused between calls
+        again = pool.transform_arrays(lon, lat, h, chunk_size=chunk_size)
+
+    for a, b, c in zip(out, again, expected):
+        assert a.shape == (10, 10)
+        np.testing.assert_allclose(a, c, atol=1e-9)
+        np.testing.assert_allclose(b, c, atol=1e-9)
+
+
+def test_process_pool_empty(transformer):
+    with ProcessPoolTransformer(transformer, workers=1) as pool:
+        x, y, z = pool.transform_arrays([], [], [])
+    assert x.size == y.size == z.size == 0
+
+
+def test_process_pool_per_point_epochs(transformer):
+    lon = np.array([-123.365646, -124.0, -122.5])
+    lat = np.array([48.428421, 49.5, 50.0])
+    h = np.array([0.0, 10.0, 100.0])
+    epochs = np.array(["2002-01-01", "2010-07-02", "2023-07-02"], "datetime64[D]")
+
+    expected = transformer.transform_arrays(lon, lat, h, epoch=epochs)
+    with ProcessPoolTransformer(transformer, workers=2) as pool:
+        out = pool.transform_arrays(lon, lat, h, epoch=epochs, chunk_size=2)
+
+    for a, b in zip(out, expected):
+        np.testing.assert_allclose(a, b, atol=1e-9)
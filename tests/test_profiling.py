@@ -0,0 +1,54 @@
+from functools import partial
+
+import numpy as np
+from pyproj import Transformer
+
+from csrspy.grids import itransform_chunks
+from csrspy.profiling import ProfiledPipeline, StageStats, format_stages, stage_name
+
+
+def test_stage_name():
+    steps = ["+inv +proj=longlat +ellps=GRS80", "+proj=cart +ellps=GRS80"]
+    assert stage_name(steps) == "inv longlat, cart"
+    assert stage_name(["proj=helmert x=1"]) == "helmert"
+
+
+def test_profiled_pipeline():
+    steps = ["+proj=unitconvert +xy_in=deg +xy_out=rad", "+proj=cart +ellps=GRS80"]
+    stages = [
+        (StageStats(0, i, stage_name([s]), s), Transformer.from_pipeline(s))
+        for i, s in enumerate(steps)
+    ]
+    pipeline = ProfiledPipeline(stages)
+    fused = Transformer.from_pipeline("+proj=pipeline +step " + " +step ".join(steps))
+
+    coords = (np.array([-123.0, -75.0]), np.array([49.0, 45.0]), np.zeros(2))
+    out = pipeline.transform(*coords, np.full(2, 2010.0))
+    np.testing.assert_allclose(out[:3], fused.transform(*coords), atol=1e-8)
+    point = next(pipeline.itransform([(-123.0, 49.0, 0.0, 2010.0)]))
+    assert point == tuple(o[0] for o in out)
+    assert [(s.calls, s.points) for s in pipeline.stats] == [(2, 3), (2, 3)]
+
+    table = format_stages(pipeline.stats, ["ToNAD83"])
+    assert table.splitlines()[0].startswith("[0.0] ToNAD83: unitconvert: 2 calls")
+    assert table.splitlines()[-1].startswith("Total:")
+
+    pipeline.reset()
+    assert "not profiled" in format_stages(pipeline.stats, ["ToNAD83"])
+
+
+def test_profiled_pipeline_itransform_accumulates_chunks(monkeypatch):
+    step = "+proj=cart +ellps=GRS80"
+    stats = StageStats(0, 0, stage_name([step]), step)
+    pipeline = ProfiledPipeline([(stats, Transformer.from_pipeline(step))])
+    monkeypatch.setattr(
+        "csrspy.profiling.itransform_chunks",
+        partial(itransform_chunks, chunk_size=2),
+    )
+
+    points = [(-123.0, 49.0 + i, 0.0, 2010.0) for i in range(5)]
+    out = list(pipeline.itransform(iter(points)))
+
+    assert len(out) == 5
+    assert (stats.calls, stats.points) == (3, 5)
+    assert stats.seconds > 0
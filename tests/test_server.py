@@ -0,0 +1,143 @@
+import json
+import threading
+from http.client import HTTPConnection
+from urllib.parse import urlencode
+
+import numpy as np
+import pytest
+
+from csrspy import CSRSTransformer
+from csrspy.cli import main
+from csrspy.server import (
+    MAX_BODY_SIZE,
+    TransformerPool,
+    TransformServer,
+    parse_config,
+)
+
+CONFIG = {
+    "s_ref_frame": "itrf14",
+    "s_coords": "geog",
+    "s_epoch": 2010,
+    "t_ref_frame": "nad83csrs",
+    "t_coords": "utm10",
+    "s_vd": "grs80",
+    "t_vd": "grs80",
+}
+COORDS = [[-123.365646, 48.428421, 0.0], [-123.0, 49.0, 10.0]]
+
+
+@pytest.fixture
+def server():
+    server = TransformServer(("127.0.0.1", 0), TransformerPool(maxsize=2), quiet=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def connection(server):
+    connection = HTTPConnection(*server.server_address[:2], timeout=10)
+    yield connection
+    connection.close()
+
+
+def request(connection, method, path, body=None):
+    connection.request(method, path, body=body)
+    response = connection.getresponse()
+    return response.status, response.read()
+
+
+def expected():
+    trans = CSRSTransformer(**parse_config(CONFIG))
+    return np.column_stack(trans.transform_arrays(*np.array(COORDS).T))
+
+
+def test_parse_config():
+    config = parse_config({**CONFIG, "s_epoch": "2010", "t_epoch": None})
+    assert config["s_ref_frame"] == "itrf14"
+    assert config["s_epoch"] == 2010.0
+    assert "t_epoch" not in config
+    with pytest.raises(ValueError, match="Unknown config parameters: foo"):
+        parse_config({**CONFIG, "foo": 1})
+    with pytest.raises(ValueError, match="Missing config parameters: s_epoch"):
+        parse_config({k: v for k, v in CONFIG.items() if k != "s_epoch"})
+
+
+def test_transformer_pool():
+    pool = TransformerPool(maxsize=2)
+    first = pool.get(CONFIG)
+    assert pool.get({**CONFIG, "s_epoch": "2010.0"}) is first
+
+    pool.get({**CONFIG, "t_coords": "utm11"})
+    pool.get(CONFIG)
+    pool.get({**CONFIG, "t_coords": "utm12"})
+    assert len(pool) == 2
+    assert pool.get(CONFIG) is first
+    assert pool.get({**CONFIG, "t_coords": "utm11"}) is not first
+
+
+def test_json_and_binary_endpoints(connection):
+    body = json.dumps({"config": CONFIG, "coords": COORDS})
+    status, data = request(connection, "POST", "/transform", body)
+    assert status == 200
+    np.testing.assert_allclose(json.loads(data)["coords"], expected(), atol=1e-9)
+    sock = connection.sock
+
+    path = f"/transform/binary?{urlencode(CONFIG)}"
+    status, data = request(connection, "POST", path, np.array(COORDS).tobytes())
+    assert status == 200
+    np.testing.assert_allclose(
+        np.frombuffer(data, "<f8").reshape(-1, 3), expected(), atol=1e-9
+    )
+
+    status, data = request(connection, "GET", "/health")
+    assert json.loads(data) == {"status": "ok", "transformers": 1}
+    # The connection is kept alive between requests
+    assert connection.sock is sock
+
+
+@pytest.mark.parametrize(
+    ("path", "body", "status", "error"),
+    [
+        ("/transform", "not json", 400, "Invalid JSON"),
+        ("/transform", json.dumps({"config": {}}), 400, "Missing config"),
+        (
+            "/transform",
+            json.dumps({"config": CONFIG, "coords": [[1, 2]]}),
+            400,
+            "coords must be",
+        ),
+        (f"/transform/binary?{urlencode(CONFIG)}", b"\0" * 12, 400, "float64"),
+        ("/missing", "", 404, "Not found"),
+    ],
+)
+def test_errors(connection, path, body, status, error):
+    response_status, data = request(connection, "POST", path, body)
+    assert response_status == status
+    assert error in json.loads(data)["error"]
+    # Errors do not close the connection
+    assert request(connection, "GET", "/health")[0] == 200
+
+
+@pytest.mark.parametrize(
+    ("length", "status"),
+    [("-1", 400), ("abc", 400), (str(MAX_BODY_SIZE + 1), 413)],
+)
+def test_invalid_content_length(connection, length, status):
+    connection.putrequest("POST", "/transform")
+    connection.putheader("Content-Length", length)
+    connection.endheaders()
+    response = connection.getresponse()
+
+    assert response.status == status
+    assert "error" in json.loads(response.read())
+
+
+def test_cli_dispatches_serve(monkeypatch):
+    calls = []
+    monkeypatch.setattr("csrspy.server.main", calls.append)
+    main(["serve", "--port", "0"])
+    assert calls == [["--port", "0"]]
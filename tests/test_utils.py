@@ -0,0 +1,147 @@
+import hashlib
+import json
+import threading
+import time
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pytest
+
+from csrspy.utils import (
+    date_to_decimal_year,
+    datetime64_to_decimal_year,
+    required_grid_files,
+    sync_missing_grid_files,
+)
+
+
+@pytest.mark.parametrize(
+    "d", [date(2010, 1, 1), date(2020, 7, 2), date(1999, 12, 31), date(1960, 3, 1)]
+)
+def test_datetime64_to_decimal_year_matches_date(d):
+    assert datetime64_to_decimal_year(np.datetime64(d)) == pytest.approx(
+        date_to_decimal_year(d), abs=1e-12
+    )
+
+
+def test_datetime64_to_decimal_year_array():
+    dt = np.array(
+        ["2021-01-01T12:00", "2024-12-31T00:00", "2023-07-02T12:00"],
+        dtype="datetime64[m]",
+    )
+    np.testing.assert_allclose(
+        datetime64_to_decimal_year(dt),
+        [2021 + 0.5 / 365, 2024 + 365 / 366, 2023.5],
+        atol=1e-12,
+    )
+
+
+def test_required_grid_files():
+    config = {"s_vd": "cgg2013a", "t_vd": "grs80"}
+    assert required_grid_files(config) == [
+        "ca_nrc_NAD83v70VG.tif",
+        "ca_nrc_CGG2013an83.tif",
+    ]
+    config = {"s_vd": "ht2_2010v70", "t_vd": "ht2_2010v70", "epoch_shift_grid": "a"}
+    assert required_grid_files(config) == ["a", "ca_nrc_HT2_2010v70.tif"]
+    assert len(required_grid_files()) == 4
+
+
+def checksum(name):
+    return hashlib.sha256(f"/{name}".encode()).hexdigest()
+
+
+@pytest.fixture
+def mirror():
+    requests = []
+    names = [*required_grid_files(), "missing.tif"]
+    catalog = {
+        "features": [
+            *({"properties": {"name": n, "sha256sum": checksum(n)}} for n in names),
+            {"properties": {"name": "corrupt.tif", "sha256sum": "0" * 64}},
+        ]
+    }
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path == "/files.geojson":
+                body = json.dumps(catalog).encode()
+            else:
+                requests.append(self.path)
+                # Slow enough that concurrent syncs overlap
+                time.sleep(0.05)
+                body = self.path.encode()
+            if self.path == "/missing.tif":
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", requests
+    server.shutdown()
+    server.server_close()
+
+
+def test_sync_missing_grid_files(tmp_path, mirror):
+    endpoint, requests = mirror
+    config = {"s_vd": "cgg2013a", "t_vd": "grs80"}
+    (tmp_path / "ca_nrc_NAD83v70VG.tif").write_bytes(b"existing")
+
+    paths = sync_missing_grid_files(config, endpoint=endpoint, directory=tmp_path)
+
+    assert paths == [tmp_path / "ca_nrc_CGG2013an83.tif"]
+    assert paths[0].read_bytes() == b"/ca_nrc_CGG2013an83.tif"
+    assert requests == ["/ca_nrc_CGG2013an83.tif"]
+    assert sync_missing_grid_files(config, endpoint=endpoint, directory=tmp_path) == []
+
+
+def test_sync_missing_grid_files_downloads_each_grid_once(tmp_path, mirror):
+    endpoint, requests = mirror
+    results = []
+
+    def sync() -> None:
+        results.append(sync_missing_grid_files(endpoint=endpoint, directory=tmp_path))
+
+    threads = [threading.Thread(target=sync) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(requests) == sorted(f"/{name}" for name in required_grid_files())
+    assert sum(len(paths) for paths in results) == len(requests)
+    assert not list(tmp_path.glob("*.part"))
+
+
+def test_sync_missing_grid_files_error(tmp_path, mirror):
+    endpoint, _ = mirror
+    config = {"epoch_shift_grid": "missing.tif"}
+    with pytest.raises(OSError, match="404"):
+        sync_missing_grid_files(config, endpoint=endpoint, directory=tmp_path)
+    assert not (tmp_path / "missing.tif").exists()
+    assert not (tmp_path / "missing.tif.part").exists()
+
+
+@pytest.mark.parametrize(
+    ("name", "error"), [("corrupt.tif", "SHA256 mismatch"), ("other.tif", "checksum")]
+)
+def test_sync_missing_grid_files_verifies_checksums(tmp_path, mirror, name, error):
+    endpoint, _ = mirror
+    config = {"epoch_shift_grid": name}
+    with pytest.raises(RuntimeError, match=error):
+        sync_missing_grid_files(config, endpoint=endpoint, directory=tmp_path)
+    assert not (tmp_path / name).exists()
+    assert not (tmp_path / f"{name}.part").exists()
+
+    paths = sync_missing_grid_files(
+        config, endpoint=endpoint, directory=tmp_path, verify=False
+    )
+    assert paths == [tmp_path / name]